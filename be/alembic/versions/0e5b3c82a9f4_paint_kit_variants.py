@@ -0,0 +1,48 @@
+"""Paint kit variants
+
+Revision ID: 0e5b3c82a9f4
+Revises: 71d9f0c3b8e2
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0e5b3c82a9f4'
+down_revision: Union[str, Sequence[str], None] = '71d9f0c3b8e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'paint_kit_variants',
+        sa.Column('variant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('skin_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skins.skin_id'), nullable=False),
+        sa.Column('paint_index', sa.Integer(), nullable=False),
+        sa.Column('paint_kit', sa.String(), nullable=False),
+        sa.Column('phase', sa.String(), nullable=True),
+        sa.Column('float_min', sa.Float(), nullable=False),
+        sa.Column('float_max', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('variant_id'),
+        sa.UniqueConstraint('skin_id', 'paint_index', name='uq_variant_skin_paint_index'),
+    )
+    op.create_index(op.f('ix_paint_kit_variants_skin_id'), 'paint_kit_variants', ['skin_id'])
+    op.create_index(op.f('ix_paint_kit_variants_paint_index'), 'paint_kit_variants', ['paint_index'])
+    op.add_column('user_skins', sa.Column(
+        'variant_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('paint_kit_variants.variant_id'), nullable=True,
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_skins', 'variant_id')
+    op.drop_index(op.f('ix_paint_kit_variants_paint_index'), table_name='paint_kit_variants')
+    op.drop_index(op.f('ix_paint_kit_variants_skin_id'), table_name='paint_kit_variants')
+    op.drop_table('paint_kit_variants')
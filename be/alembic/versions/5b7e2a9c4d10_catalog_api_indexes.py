@@ -0,0 +1,35 @@
+"""Catalog API keyset indexes
+
+Revision ID: 5b7e2a9c4d10
+Revises: 3f1c6d2b9a47
+Create Date: 2026-10-18 17:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2a9c4d10'
+down_revision: Union[str, Sequence[str], None] = '3f1c6d2b9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_skins_name_id', 'skins', ['name', 'skin_id'])
+    op.create_index('ix_skins_weapon_name_id', 'skins', ['weapon_id', 'name', 'skin_id'])
+    op.create_index('ix_skins_rarity_name_id', 'skins', ['rarity_id', 'name', 'skin_id'])
+    op.create_index('ix_skins_collection_name_id', 'skins', ['collection_id', 'name', 'skin_id'])
+    op.create_index(op.f('ix_cases_collection_id'), 'cases', ['collection_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cases_collection_id'), table_name='cases')
+    op.drop_index('ix_skins_collection_name_id', table_name='skins')
+    op.drop_index('ix_skins_rarity_name_id', table_name='skins')
+    op.drop_index('ix_skins_weapon_name_id', table_name='skins')
+    op.drop_index('ix_skins_name_id', table_name='skins')
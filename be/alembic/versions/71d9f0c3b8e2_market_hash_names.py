@@ -0,0 +1,37 @@
+"""Market hash name lookup table
+
+Revision ID: 71d9f0c3b8e2
+Revises: c4a81e37f2d5
+Create Date: 2026-10-18 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '71d9f0c3b8e2'
+down_revision: Union[str, Sequence[str], None] = 'c4a81e37f2d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'market_hash_names',
+        sa.Column('market_hash_name', sa.String(), nullable=False),
+        sa.Column('skin_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skins.skin_id'), nullable=False),
+        sa.Column('wear_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('wear_types.wear_id'), nullable=False),
+        sa.Column('stattrack', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('market_hash_name'),
+        sa.UniqueConstraint('skin_id', 'wear_id', 'stattrack', name='uq_market_hash_name_variant'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('market_hash_names')
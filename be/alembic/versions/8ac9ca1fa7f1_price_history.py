@@ -0,0 +1,104 @@
+"""Price history partitioning and OHLC rollups
+
+Revision ID: 8ac9ca1fa7f1
+Revises: e618c8d4aa92
+Create Date: 2026-10-18 16:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8ac9ca1fa7f1'
+down_revision: Union[str, Sequence[str], None] = 'e618c8d4aa92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_COLUMNS = "price_id, skin_id, wear_id, stattrack, price, currency, updated_at"
+
+
+def _rollup_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column('skin_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skins.skin_id'), nullable=False),
+        sa.Column('wear_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('wear_types.wear_id'), nullable=False),
+        sa.Column('stattrack', sa.Boolean(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('open', sa.Float(), nullable=False),
+        sa.Column('high', sa.Float(), nullable=False),
+        sa.Column('low', sa.Float(), nullable=False),
+        sa.Column('close', sa.Float(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.Column('first_at', sa.DateTime(), nullable=False),
+        sa.Column('last_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('skin_id', 'wear_id', 'stattrack', 'currency', 'bucket_start'),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('skin_prices', 'skin_prices_legacy')
+    op.execute("ALTER INDEX IF EXISTS skin_prices_pkey RENAME TO skin_prices_legacy_pkey")
+
+    op.create_table(
+        'skin_prices',
+        sa.Column('price_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('skin_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skins.skin_id'), nullable=False),
+        sa.Column('wear_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('wear_types.wear_id'), nullable=False),
+        sa.Column('stattrack', sa.Boolean(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('price_id', 'updated_at'),
+        postgresql_partition_by='RANGE (updated_at)',
+    )
+    op.create_index('ix_skin_prices_series', 'skin_prices', ['skin_id', 'wear_id', 'stattrack', 'updated_at'])
+    op.execute("CREATE TABLE skin_prices_default PARTITION OF skin_prices DEFAULT")
+
+    # Monthly partitions depend on when the migration runs, so they are left to
+    # ensure_partitions, which moves the copied rows of each month it creates out
+    # of the default partition.
+    op.execute(
+        f"INSERT INTO skin_prices ({PRICE_COLUMNS}) "
+        f"SELECT {PRICE_COLUMNS} FROM skin_prices_legacy"
+    )
+    op.drop_table('skin_prices_legacy')
+
+    _rollup_table('skin_prices_hourly')
+    _rollup_table('skin_prices_daily')
+    op.create_table(
+        'price_rollup_state',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('processed_until', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('price_rollup_state')
+    op.drop_table('skin_prices_daily')
+    op.drop_table('skin_prices_hourly')
+
+    op.rename_table('skin_prices', 'skin_prices_partitioned')
+    op.create_table(
+        'skin_prices',
+        sa.Column('price_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('skin_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skins.skin_id'), nullable=False),
+        sa.Column('wear_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('wear_types.wear_id'), nullable=False),
+        sa.Column('stattrack', sa.Boolean(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('price_id'),
+    )
+    op.execute(
+        f"INSERT INTO skin_prices ({PRICE_COLUMNS}) "
+        f"SELECT {PRICE_COLUMNS} FROM skin_prices_partitioned"
+    )
+    op.drop_table('skin_prices_partitioned')
@@ -0,0 +1,28 @@
+"""Rarity tiers
+
+Revision ID: 9d27e4f1c6a3
+Revises: 0e5b3c82a9f4
+Create Date: 2026-10-18 20:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d27e4f1c6a3'
+down_revision: Union[str, Sequence[str], None] = '0e5b3c82a9f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rarities', sa.Column('tier', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rarities', 'tier')
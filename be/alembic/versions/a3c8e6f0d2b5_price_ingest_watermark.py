@@ -0,0 +1,40 @@
+"""Watermark the price rollups on ingest time
+
+Revision ID: a3c8e6f0d2b5
+Revises: f1a9c3e5d7b2
+Create Date: 2026-10-18 23:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8e6f0d2b5'
+down_revision: Union[str, Sequence[str], None] = 'f1a9c3e5d7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default fills existing rows without rewriting the table; they count as
+    # ingested at the epoch, i.e. already rolled up.
+    op.add_column('skin_prices', sa.Column(
+        'ingested_at', sa.DateTime(), nullable=False, server_default=sa.text("'1970-01-01'"),
+    ))
+    # Except the rows past the quote-time watermark, which the rollups have not seen yet.
+    op.execute(
+        "UPDATE skin_prices SET ingested_at = least(updated_at, now() AT TIME ZONE 'utc') "
+        "WHERE updated_at > coalesce((SELECT min(processed_until) FROM price_rollup_state), '1970-01-01')"
+    )
+    op.alter_column('skin_prices', 'ingested_at', server_default=sa.text("(clock_timestamp() AT TIME ZONE 'utc')"))
+    op.create_index('ix_skin_prices_ingested', 'skin_prices', ['ingested_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_skin_prices_ingested', table_name='skin_prices')
+    op.drop_column('skin_prices', 'ingested_at')
@@ -0,0 +1,66 @@
+"""Price alerts and notification outbox
+
+Revision ID: b6f3a1d8e5c2
+Revises: 9d27e4f1c6a3
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f3a1d8e5c2'
+down_revision: Union[str, Sequence[str], None] = '9d27e4f1c6a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'price_alerts',
+        sa.Column('alert_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.user_id'), nullable=False),
+        sa.Column('skin_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skins.skin_id'), nullable=False),
+        sa.Column('wear_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('wear_types.wear_id'), nullable=False),
+        sa.Column('stattrack', sa.Boolean(), nullable=False),
+        sa.Column('direction', sa.String(length=5), nullable=False),
+        sa.Column('threshold', sa.Float(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('triggered_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('alert_id'),
+    )
+    op.create_index(op.f('ix_price_alerts_user_id'), 'price_alerts', ['user_id'])
+    op.create_index('ix_price_alerts_active_key', 'price_alerts', ['skin_id', 'wear_id', 'stattrack'],
+                    postgresql_where=sa.text('active'))
+
+    op.create_table(
+        'alert_outbox',
+        sa.Column('notification_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('alert_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('price_alerts.alert_id'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.user_id'), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('delivered_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('notification_id'),
+    )
+    op.create_index(op.f('ix_alert_outbox_alert_id'), 'alert_outbox', ['alert_id'])
+    op.create_index('ix_alert_outbox_pending', 'alert_outbox', ['created_at'],
+                    postgresql_where=sa.text('delivered_at IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_alert_outbox_pending', table_name='alert_outbox')
+    op.drop_index(op.f('ix_alert_outbox_alert_id'), table_name='alert_outbox')
+    op.drop_table('alert_outbox')
+    op.drop_index('ix_price_alerts_active_key', table_name='price_alerts')
+    op.drop_index(op.f('ix_price_alerts_user_id'), table_name='price_alerts')
+    op.drop_table('price_alerts')
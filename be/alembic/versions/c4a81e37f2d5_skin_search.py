@@ -0,0 +1,45 @@
+"""Skin search documents
+
+Revision ID: c4a81e37f2d5
+Revises: 5b7e2a9c4d10
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a81e37f2d5'
+down_revision: Union[str, Sequence[str], None] = '5b7e2a9c4d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table(
+        'skin_search_documents',
+        sa.Column('skin_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skins.skin_id'), nullable=False),
+        sa.Column('wear_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('wear_types.wear_id'), nullable=False),
+        sa.Column('market_hash_name', sa.String(), nullable=False),
+        sa.Column('document', sa.String(), nullable=False),
+        sa.Column('search_vector', postgresql.TSVECTOR(),
+                  sa.Computed("to_tsvector('simple', document)", persisted=True)),
+        sa.PrimaryKeyConstraint('skin_id', 'wear_id'),
+    )
+    op.create_index('ix_skin_search_documents_vector', 'skin_search_documents', ['search_vector'],
+                    postgresql_using='gin')
+    op.create_index('ix_skin_search_documents_trgm', 'skin_search_documents', ['document'],
+                    postgresql_using='gin', postgresql_ops={'document': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_skin_search_documents_trgm', table_name='skin_search_documents')
+    op.drop_index('ix_skin_search_documents_vector', table_name='skin_search_documents')
+    op.drop_table('skin_search_documents')
@@ -0,0 +1,65 @@
+"""Latest price table and rolling price statistics
+
+Revision ID: d2e8b7a4f6c1
+Revises: b6f3a1d8e5c2
+Create Date: 2026-10-18 21:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e8b7a4f6c1'
+down_revision: Union[str, Sequence[str], None] = 'b6f3a1d8e5c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _key_columns():
+    return [
+        sa.Column('skin_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skins.skin_id'), nullable=False),
+        sa.Column('wear_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('wear_types.wear_id'), nullable=False),
+        sa.Column('stattrack', sa.Boolean(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'skin_prices_latest',
+        *_key_columns(),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('skin_id', 'wear_id', 'stattrack', 'currency'),
+    )
+    op.create_table(
+        'skin_price_stats',
+        *_key_columns(),
+        sa.Column('period', sa.String(length=3), nullable=False),
+        sa.Column('min_price', sa.Float(), nullable=False),
+        sa.Column('max_price', sa.Float(), nullable=False),
+        sa.Column('median_price', sa.Float(), nullable=False),
+        sa.Column('volatility', sa.Float(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('skin_id', 'wear_id', 'stattrack', 'currency', 'period'),
+    )
+    # Statistics fill in on the next ingest; the latest prices are needed right away.
+    op.execute("""
+        INSERT INTO skin_prices_latest (skin_id, wear_id, stattrack, currency, price, updated_at)
+        SELECT DISTINCT ON (skin_id, wear_id, stattrack, currency)
+            skin_id, wear_id, stattrack, currency, price, updated_at
+        FROM skin_prices
+        ORDER BY skin_id, wear_id, stattrack, currency, updated_at DESC
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('skin_price_stats')
+    op.drop_table('skin_prices_latest')
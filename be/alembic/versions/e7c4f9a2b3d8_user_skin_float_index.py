@@ -0,0 +1,27 @@
+"""Index user skins by float within a skin
+
+Revision ID: e7c4f9a2b3d8
+Revises: d2e8b7a4f6c1
+Create Date: 2026-10-18 22:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c4f9a2b3d8'
+down_revision: Union[str, Sequence[str], None] = 'd2e8b7a4f6c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_user_skins_skin_float', 'user_skins', ['skin_id', 'float_value'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_skins_skin_float', table_name='user_skins')
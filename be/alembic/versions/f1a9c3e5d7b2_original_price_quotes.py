@@ -0,0 +1,31 @@
+"""Keep the original quote of normalized prices
+
+Revision ID: f1a9c3e5d7b2
+Revises: e7c4f9a2b3d8
+Create Date: 2026-10-18 22:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a9c3e5d7b2'
+down_revision: Union[str, Sequence[str], None] = 'e7c4f9a2b3d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Added to the partitioned parent, so every partition gets the columns; existing rows stay NULL.
+    op.add_column('skin_prices', sa.Column('original_price', sa.Float(), nullable=True))
+    op.add_column('skin_prices', sa.Column('original_currency', sa.String(length=3), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('skin_prices', 'original_currency')
+    op.drop_column('skin_prices', 'original_price')
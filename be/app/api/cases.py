@@ -0,0 +1,41 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import RootModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.catalog import cached_json, check_not_modified
+from app.db.session import get_db
+from app.schemas.schemas import CaseEvRead
+from app.services.case_ev_service import CaseEv, case_ev_cache
+
+router = APIRouter(prefix="/cases", tags=["cases"])
+
+CaseEvList = RootModel[list[CaseEvRead]]
+
+
+async def case_ev_etag(request: Request, db: AsyncSession = Depends(get_db)) -> str:
+    """Expected values change with the catalog or the prices; both versions make up the ETag."""
+    await case_ev_cache.ensure_fresh(db)
+    catalog_version, prices_version = case_ev_cache.version
+    etag = f'W/"ev-{catalog_version}-{prices_version}-{request.url.path}"'
+    check_not_modified(request, etag)
+    return etag
+
+
+def case_ev_read(value: CaseEv) -> CaseEvRead:
+    return CaseEvRead(case_id=value.case_id, name=value.name, expected_value=value.expected_value,
+                      priced_odds=value.priced_odds, currency=case_ev_cache.currency)
+
+
+@router.get("/ev", response_model=list[CaseEvRead])
+async def list_case_evs(etag: str = Depends(case_ev_etag)):
+    return cached_json(CaseEvList([case_ev_read(value) for value in case_ev_cache.ranked]), etag)
+
+
+@router.get("/{case_id}/ev", response_model=CaseEvRead)
+async def get_case_ev(case_id: uuid.UUID, etag: str = Depends(case_ev_etag)):
+    value = case_ev_cache.by_case.get(case_id)
+    if value is None:
+        raise HTTPException(404, "Case not found")
+    return cached_json(case_ev_read(value), etag)
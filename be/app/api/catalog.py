@@ -0,0 +1,137 @@
+import uuid
+import hashlib
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.schemas.schemas import (
+    CaseRead, CollectionRead, Page, PaintKitVariantRead, SkinDetailRead, SkinRead, WeaponRead,
+)
+from app.services import catalog_service
+from app.services.catalog_cache import catalog_cache, get_catalog_version
+from app.services.catalog_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor
+
+CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+router = APIRouter(tags=["catalog"])
+
+
+def parse_if_none_match(header: str) -> list[str]:
+    """``W/"1-ab", "2-cd"`` -> ``['W/"1-ab"', 'W/"2-cd"']``; ``*`` is kept as is."""
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def check_not_modified(request: Request, etag: str):
+    """Short-circuits with a 304 when ``If-None-Match`` lists ``etag`` (or ``*``)."""
+    tags = parse_if_none_match(request.headers.get("if-none-match", ""))
+    if etag in tags or "*" in tags:
+        raise HTTPException(304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+async def catalog_etag(request: Request, db: AsyncSession = Depends(get_db)) -> str:
+    """
+    Catalog responses only change when seeding bumps the catalog version, so the
+    version plus the request URL identifies a representation without running the
+    query. Matching ``If-None-Match`` requests short-circuit with a 304.
+    """
+    return versioned_etag(request, await get_catalog_version(db))
+
+
+async def catalog_cache_etag(request: Request, db: AsyncSession = Depends(get_db)) -> str:
+    """``catalog_etag`` for responses built from ``catalog_cache``, stamped with the version of its snapshot."""
+    await catalog_cache.ensure_fresh(db)
+    return versioned_etag(request, catalog_cache.version)
+
+
+def versioned_etag(request: Request, version: int) -> str:
+    digest = hashlib.blake2b(str(request.url).encode(), digest_size=8).hexdigest()
+    etag = f'W/"{version}-{digest}"'
+    check_not_modified(request, etag)
+    return etag
+
+
+def cached_json(model: BaseModel, etag: str) -> Response:
+    return Response(
+        content=model.model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+async def paged(call, schema, etag: str, **kwargs) -> Response:
+    try:
+        rows, next_cursor = await call(**kwargs)
+    except InvalidCursor as e:
+        raise HTTPException(400, "Invalid cursor") from e
+    page = Page[schema](items=[schema.model_validate(row) for row in rows], next_cursor=next_cursor)
+    return cached_json(page, etag)
+
+
+Limit = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+
+
+@router.get("/skins", response_model=Page[SkinRead])
+async def list_skins(
+    cursor: str | None = None,
+    limit: int = Limit,
+    sort: Literal['name', 'id'] = 'name',
+    weapon_id: uuid.UUID | None = None,
+    rarity_id: uuid.UUID | None = None,
+    collection_id: uuid.UUID | None = None,
+    db: AsyncSession = Depends(get_db),
+    etag: str = Depends(catalog_etag),
+):
+    return await paged(
+        catalog_service.list_skins, SkinRead, etag, db=db, cursor=cursor, limit=limit, sort=sort,
+        weapon_id=weapon_id, rarity_id=rarity_id, collection_id=collection_id,
+    )
+
+
+@router.get("/skins/{skin_id}", response_model=SkinDetailRead)
+async def get_skin(skin_id: uuid.UUID, db: AsyncSession = Depends(get_db), etag: str = Depends(catalog_cache_etag)):
+    # The skin and its weapon, rarity and collection come from the catalog cache; only the variants are queried.
+    skin = catalog_cache.get('skins', skin_id)
+    if skin is None:
+        raise HTTPException(404, "Skin not found")
+    variants = await catalog_service.list_variants(db, skin_id)
+    detail = SkinDetailRead(
+        **dict(SkinRead.model_validate(skin)),
+        variants=[PaintKitVariantRead.model_validate(variant) for variant in variants],
+    )
+    return cached_json(detail, etag)
+
+
+@router.get("/cases", response_model=Page[CaseRead])
+async def list_cases(
+    cursor: str | None = None,
+    limit: int = Limit,
+    collection_id: uuid.UUID | None = None,
+    db: AsyncSession = Depends(get_db),
+    etag: str = Depends(catalog_etag),
+):
+    return await paged(
+        catalog_service.list_cases, CaseRead, etag, db=db, cursor=cursor, limit=limit, collection_id=collection_id,
+    )
+
+
+@router.get("/collections", response_model=Page[CollectionRead])
+async def list_collections(
+    cursor: str | None = None,
+    limit: int = Limit,
+    db: AsyncSession = Depends(get_db),
+    etag: str = Depends(catalog_etag),
+):
+    return await paged(catalog_service.list_collections, CollectionRead, etag, db=db, cursor=cursor, limit=limit)
+
+
+@router.get("/weapons", response_model=Page[WeaponRead])
+async def list_weapons(
+    cursor: str | None = None,
+    limit: int = Limit,
+    db: AsyncSession = Depends(get_db),
+    etag: str = Depends(catalog_etag),
+):
+    return await paged(catalog_service.list_weapons, WeaponRead, etag, db=db, cursor=cursor, limit=limit)
@@ -0,0 +1,49 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.schemas.schemas import FloatHistogramRead, FloatItemRead, FloatRankRead
+from app.services.float_analytics import HISTOGRAM_BUCKETS, FloatIndex, FloatItem, float_index
+
+router = APIRouter(prefix="/floats", tags=["floats"])
+
+Limit = Query(10, ge=1, le=100)
+FloatValue = Query(..., ge=0.0, le=1.0)
+
+
+async def loaded_float_index(db: AsyncSession = Depends(get_db)) -> FloatIndex:
+    return await float_index.ensure_loaded(db)
+
+
+def float_item_read(item: FloatItem) -> FloatItemRead:
+    return FloatItemRead(user_skin_id=item.row_id, skin_id=item.skin_id, float_value=item.float_value)
+
+
+@router.get("/skins/{skin_id}/rank", response_model=FloatRankRead)
+async def float_rank(skin_id: uuid.UUID, value: float = FloatValue, index: FloatIndex = Depends(loaded_float_index)):
+    rank, total, percentile = index.rank(skin_id, value)
+    return FloatRankRead(skin_id=skin_id, float_value=value, rank=rank, total=total, percentile=percentile)
+
+
+@router.get("/skins/{skin_id}/histogram", response_model=FloatHistogramRead)
+async def float_histogram(skin_id: uuid.UUID, index: FloatIndex = Depends(loaded_float_index)):
+    counts = index.histogram(skin_id)
+    return FloatHistogramRead(skin_id=skin_id, total=sum(counts), bucket_width=1 / HISTOGRAM_BUCKETS, counts=counts)
+
+
+@router.get("/skins/{skin_id}/lowest", response_model=list[FloatItemRead])
+async def lowest_floats_of_skin(skin_id: uuid.UUID, limit: int = Limit,
+                                index: FloatIndex = Depends(loaded_float_index)):
+    return [float_item_read(item) for item in index.lowest(skin_id, limit)]
+
+
+@router.get("/lowest", response_model=list[FloatItemRead])
+async def lowest_floats(
+    limit: int = Limit,
+    below: float = Query(1.0, gt=0.0, le=1.0),
+    skin_id: list[uuid.UUID] | None = Query(None),
+    index: FloatIndex = Depends(loaded_float_index),
+):
+    return [float_item_read(item) for item in index.lowest_overall(limit, below, skin_id)]
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.schemas.schemas import SyncResultRead
+from app.services.float_analytics import float_index
+from app.services.http_client import HttpClient
+from app.services.inventory_service import UNKNOWN_USER, InventorySync, SteamInventorySource
+
+router = APIRouter(prefix="/inventory", tags=["inventory"])
+
+
+def get_http_client(request: Request) -> HttpClient:
+    """The process-wide client opened in the app lifespan, so syncs share its keep-alive pool."""
+    return request.app.state.http_client
+
+
+@router.post("/{steam_id}/sync", response_model=SyncResultRead)
+async def sync_inventory(steam_id: str, db: AsyncSession = Depends(get_db),
+                         client: HttpClient = Depends(get_http_client)):
+    """Syncs one user's inventory from Steam; the float index hears about the changed rows."""
+    # Loaded before the sync, so the listener applies the changes instead of a later load reading them.
+    await float_index.ensure_loaded(db)
+    sync = InventorySync(SteamInventorySource(client), listeners=[float_index])
+    result, = await sync.run([steam_id])
+    if result.error == UNKNOWN_USER:
+        raise HTTPException(404, "User not found")
+    if result.error:
+        raise HTTPException(502, f"Inventory sync failed: {result.error}")
+    return result
@@ -0,0 +1,20 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.schemas.schemas import PriceSummaryRead
+from app.services.price_history_service import get_price_summaries
+
+router = APIRouter(prefix="/prices", tags=["prices"])
+
+
+@router.get("/skins/{skin_id}", response_model=list[PriceSummaryRead])
+async def skin_prices(
+    skin_id: uuid.UUID,
+    currency: str = Query(settings.CANONICAL_CURRENCY, min_length=3, max_length=3),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_price_summaries(db, skin_id, currency.upper())
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.schemas.schemas import SearchResultRead
+from app.services.search_service import DEFAULT_LIMIT, autocomplete_index, search_skins
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+Limit = Query(DEFAULT_LIMIT, ge=1, le=100)
+
+
+@router.get("", response_model=list[SearchResultRead])
+async def search(q: str = Query(..., min_length=1), limit: int = Limit, db: AsyncSession = Depends(get_db)):
+    return await search_skins(db, q, limit)
+
+
+@router.get("/autocomplete", response_model=list[SearchResultRead])
+async def autocomplete(q: str = Query(..., min_length=1), limit: int = Limit, db: AsyncSession = Depends(get_db)):
+    await autocomplete_index.ensure_fresh(db)
+    return [
+        SearchResultRead(skin_id=skin_id, wear_id=wear_id, market_hash_name=name)
+        for skin_id, wear_id, name in autocomplete_index.index.complete(q, limit)
+    ]
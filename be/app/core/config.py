@@ -9,6 +9,28 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int
     POSTGRES_DB: str
 
+    # Connection pool of the API process ("api") and of seeding/ingestion scripts ("seed").
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_SEED_POOL_SIZE: int = 4
+    DB_SEED_MAX_OVERFLOW: int = 0
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_INSTRUMENT: bool = True
+    DB_SLOW_QUERY_MS: float = 250.0
+    # Statements per API request: over the budget, or N+1 patterns, are logged, and fail the request when strict.
+    DB_REQUEST_QUERY_BUDGET: int | None = None
+    DB_QUERY_BUDGET_STRICT: bool = False
+    # A SELECT of the same shape run this many times in one unit of work is reported as an N+1.
+    DB_N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Prices are stored in CANONICAL_CURRENCY; quotes are converted at ingest with rates from FX_RATES_PATH.
+    CANONICAL_CURRENCY: str = "PLN"
+    FX_RATES_PATH: str = "data/fx_rates.json"
+    FX_RATES_TTL: float = 3600.0
+
     @computed_field
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         return str(PostgresDsn.build(
@@ -0,0 +1,229 @@
+import re
+import time
+import logging
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.db.slow_queries")
+query_logger = logging.getLogger("app.db.queries")
+
+# Upper bounds in seconds, Prometheus' default buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_STATEMENT_LABELS = 500
+OTHER_STATEMENTS = "other"
+
+_PARAMETER = re.compile(r'\$\d+(?:::[A-Z]+(?: WITH(?:OUT)? TIME ZONE)?(?:\[\])?)?')
+_PARAMETER_LIST = re.compile(r'\?(?:\s*,\s*\?)+')
+_VALUES_ROWS = re.compile(r'\(\?\)(?:\s*,\s*\(\?\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def statement_label(statement: str, length: int = 200) -> str:
+    """
+    Collapses a statement into a bounded label: parameters and their casts become
+    ``?``, and parameter lists and multi-row ``VALUES`` one ``?``, so an ``IN``
+    over 10 or 10,000 ids is the same statement.
+    """
+    label = _WHITESPACE.sub(' ', statement).strip()
+    label = _PARAMETER.sub('?', label)
+    label = _PARAMETER_LIST.sub('?', label)
+    label = _VALUES_ROWS.sub('(?)', label)
+    return label[:length]
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = array('q', bytes(8 * (len(buckets) + 1)))
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total:.6f}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class PoolMetrics:
+    """
+    Checkout wait and per-statement query latency of one engine, recorded through
+    SQLAlchemy events. Statements slower than ``slow_query_seconds`` are logged
+    to ``app.db.slow_queries``.
+    """
+
+    def __init__(self, name: str, slow_query_seconds: float):
+        self.name = name
+        self.slow_query_seconds = slow_query_seconds
+        self.checkout_wait = Histogram()
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.queries: dict[str, Histogram] = {}
+        self.slow_queries = 0
+        self.engine: Engine | None = None
+
+    def pool_class(self) -> type[AsyncAdaptedQueuePool]:
+        """
+        A pool that times ``connect()``: waiting for a free connection, or opening
+        one, plus pre-ping. The metrics live on the class because the engine
+        rebuilds its pool from the class on ``dispose()``.
+        """
+        metrics = self
+
+        class InstrumentedPool(AsyncAdaptedQueuePool):
+            def connect(self):
+                start = time.perf_counter()
+                try:
+                    return super().connect()
+                except exc.TimeoutError:
+                    metrics.checkout_timeouts += 1
+                    raise
+                finally:
+                    metrics.checkout_wait.observe(time.perf_counter() - start)
+
+        return InstrumentedPool
+
+    def attach(self, engine: Engine):
+        self.engine = engine
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "connect", self._on_connect)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context.metrics_start = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context.metrics_start
+        label = statement_label(statement)
+        histogram = self.queries.get(label)
+        if histogram is None:
+            if len(self.queries) >= MAX_STATEMENT_LABELS:
+                label = OTHER_STATEMENTS
+            histogram = self.queries.setdefault(label, Histogram())
+        histogram.observe(elapsed)
+        if elapsed >= self.slow_query_seconds:
+            self.slow_queries += 1
+            logger.warning("slow query (%.1f ms): %s", elapsed * 1000, label)
+
+    def render(self) -> str:
+        """Prometheus text exposition of the pool state and the recorded timings."""
+        pool_label = f'pool="{_escape(self.name)}"'
+        lines = []
+        pool = self.engine.pool if self.engine is not None else None
+        if pool is not None:
+            for name, value, help_text in (
+                ('db_pool_size', pool.size(), 'Configured pool size'),
+                ('db_pool_checked_out', pool.checkedout(), 'Connections currently checked out'),
+                ('db_pool_overflow', pool.overflow(), 'Connections opened beyond the pool size'),
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge', f'{name}{{{pool_label}}} {value}']
+        for name, value, help_text in (
+            ('db_pool_connects_total', self.connects, 'Database connections opened'),
+            ('db_pool_checkout_timeouts_total', self.checkout_timeouts, 'Checkouts that timed out'),
+            ('db_slow_queries_total', self.slow_queries, 'Statements slower than the slow query threshold'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter', f'{name}{{{pool_label}}} {value}']
+
+        lines += ['# HELP db_pool_checkout_wait_seconds Time to check a connection out of the pool',
+                  '# TYPE db_pool_checkout_wait_seconds histogram']
+        lines += self.checkout_wait.render('db_pool_checkout_wait_seconds', pool_label)
+        lines += ['# HELP db_query_duration_seconds Statement execution time',
+                  '# TYPE db_query_duration_seconds histogram']
+        for label, histogram in sorted(self.queries.items()):
+            lines += histogram.render('db_query_duration_seconds', f'{pool_label},statement="{_escape(label)}"')
+        return '\n'.join(lines) + '\n'
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    """
+    Statements executed within one unit of work (a request, a seed stage, a
+    sync job), by statement shape. A ``SELECT`` shape repeated ``threshold``
+    times (``DB_N_PLUS_ONE_THRESHOLD`` by default) is an N+1 pattern: a lazy
+    load or a query issued per row of a loop.
+    """
+
+    def __init__(self, name: str, budget: int | None = None, threshold: int | None = None):
+        self.name = name
+        self.budget = budget
+        self.threshold = settings.DB_N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+        self.statements: Counter[str] = Counter()
+
+    @property
+    def total(self) -> int:
+        return sum(self.statements.values())
+
+    def n_plus_one(self) -> list[tuple[str, int]]:
+        return [
+            (label, count) for label, count in self.statements.most_common()
+            if count >= self.threshold and label.startswith('SELECT')
+        ]
+
+    def problems(self) -> list[str]:
+        problems = []
+        if self.budget is not None and self.total > self.budget:
+            problems.append(f"{self.total} queries over a budget of {self.budget}")
+        problems += [f"N+1: {count}x {label}" for label, count in self.n_plus_one()]
+        return problems
+
+
+_active_counters: ContextVar[tuple[QueryCounter, ...]] = ContextVar('query_counters', default=())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counters = _active_counters.get()
+    if counters:
+        label = statement_label(statement)
+        for counter in counters:
+            counter.statements[label] += 1
+
+
+@contextmanager
+def count_queries(name: str, budget: int | None = None, strict: bool = True,
+                  threshold: int | None = None):
+    """
+    Counts the statements run inside the block, on any engine, including those
+    of tasks started inside it. Exceeding ``budget`` or repeating a ``SELECT``
+    shape ``threshold`` times is logged to ``app.db.queries`` and, when
+    ``strict``, raises ``QueryBudgetExceeded`` at the end of the block, which
+    fails a test like any assertion. Counters nest; each sees its whole block.
+    """
+    counter = QueryCounter(name, budget, threshold)
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
+    problems = counter.problems()
+    for problem in problems:
+        query_logger.warning("%s: %s", counter.name, problem)
+    if strict and problems:
+        raise QueryBudgetExceeded(f"{counter.name}: " + "; ".join(problems))
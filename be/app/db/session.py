@@ -1,17 +1,58 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from typing import AsyncGenerator
 from app.core.config import settings
+from app.db.instrumentation import PoolMetrics
 
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True
-)
+POOL_PROFILES = ('api', 'seed')
+
+
+def create_engine(profile: str = 'api') -> tuple[AsyncEngine, PoolMetrics | None]:
+    """
+    Engine sized for ``profile``: the API serves many short requests, seeding runs
+    a few long transactions. Stale connections are replaced after
+    ``DB_POOL_RECYCLE`` seconds; pre-ping (one extra round trip per checkout) is
+    opt-in.
+    """
+    seed = profile == 'seed'
+    options = dict(
+        pool_size=settings.DB_SEED_POOL_SIZE if seed else settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_SEED_MAX_OVERFLOW if seed else settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={'prepared_statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE},
+    )
+    metrics = PoolMetrics(profile, settings.DB_SLOW_QUERY_MS / 1000) if settings.DB_INSTRUMENT else None
+    if metrics is not None:
+        options['poolclass'] = metrics.pool_class()
+    new_engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, **options)
+    if metrics is not None:
+        metrics.attach(new_engine.sync_engine)
+    return new_engine, metrics
+
+
+engine, pool_metrics = create_engine('api')
 
 SessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+async def use_pool_profile(profile: str):
+    """Rebinds ``SessionLocal`` to an engine sized for ``profile``; call before opening sessions."""
+    global engine, pool_metrics
+    if profile not in POOL_PROFILES:
+        raise ValueError(f"unknown pool profile '{profile}'")
+    await engine.dispose()
+    engine, pool_metrics = create_engine(profile)
+    SessionLocal.configure(bind=engine)
+
+
+def render_metrics() -> str:
+    return pool_metrics.render() if pool_metrics is not None else ""
+
+
 async def get_db() -> AsyncGenerator:
     async with SessionLocal() as db:
         try:
             yield db
         finally:
-            await db.close()
\ No newline at end of file
+            await db.close()
@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+
+from sqlalchemy import literal_column, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    ids: dict = field(default_factory=dict)
+
+    def __str__(self):
+        return f"{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged"
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model,
+    rows: list[dict],
+    conflict_columns: list[str],
+    update_columns: list[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> UpsertResult:
+    """
+    Writes ``rows`` with ``INSERT ... ON CONFLICT`` in chunks of ``chunk_size``.
+
+    Rows are de-duplicated on ``conflict_columns`` (last one wins), conflicting rows
+    are only rewritten when one of ``update_columns`` actually differs, and
+    ``result.ids`` maps every conflict key tuple to its primary key.
+    """
+    table = model.__table__
+    pk = list(table.primary_key.columns)[0]
+    key_columns = [table.c[c] for c in conflict_columns]
+    result = UpsertResult()
+
+    unique_rows = {tuple(row[c] for c in conflict_columns): row for row in rows}
+    if not unique_rows:
+        return result
+
+    for chunk in _chunks(list(unique_rows.values()), chunk_size):
+        stmt = insert(table).values(chunk)
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_={c: stmt.excluded[c] for c in update_columns},
+                where=or_(*(table.c[c].is_distinct_from(stmt.excluded[c]) for c in update_columns)),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        stmt = stmt.returning(pk, *key_columns, literal_column("xmax = 0").label("was_inserted"))
+
+        for row in await db.execute(stmt):
+            result.ids[tuple(row[1:-1])] = row[0]
+            if row.was_inserted:
+                result.inserted += 1
+            else:
+                result.updated += 1
+
+    missing = [key for key in unique_rows if key not in result.ids]
+    for chunk in _chunks(missing, chunk_size):
+        stmt = select(pk, *key_columns).where(tuple_(*key_columns).in_(chunk))
+        for row in await db.execute(stmt):
+            result.ids[tuple(row[1:])] = row[0]
+    result.unchanged = len(missing)
+
+    return result
@@ -0,0 +1,53 @@
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from app.api.cases import router as cases_router
+from app.api.catalog import router as catalog_router
+from app.api.floats import router as floats_router
+from app.api.inventory import router as inventory_router
+from app.api.prices import router as prices_router
+from app.api.search import router as search_router
+from app.core.config import settings
+from app.db.instrumentation import count_queries
+from app.db.session import render_metrics
+from app.services.http_client import HttpClient
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One outbound client per process; its pooled connections are closed on shutdown.
+    async with HttpClient() as client:
+        app.state.http_client = client
+        yield
+
+
+app = FastAPI(title="CS2 Skin Tracker", lifespan=lifespan)
+app.include_router(catalog_router)
+app.include_router(cases_router)
+app.include_router(prices_router)
+app.include_router(search_router)
+app.include_router(floats_router)
+app.include_router(inventory_router)
+
+
+@app.middleware("http")
+async def query_budget(request: Request, call_next):
+    with count_queries(
+        f"{request.method} {request.url.path}",
+        budget=settings.DB_REQUEST_QUERY_BUDGET,
+        strict=settings.DB_QUERY_BUDGET_STRICT,
+        threshold=settings.DB_N_PLUS_ONE_THRESHOLD,
+    ) as counter:
+        response = await call_next(request)
+        # Report per route rather than per URL once routing has matched one.
+        route = request.scope.get("route")
+        if route is not None:
+            counter.name = f"{request.method} {route.path}"
+        return response
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
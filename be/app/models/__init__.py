@@ -1 +1 @@
-from .models import User, Skin, WearType, UserSkin, Rarity, Collection, Case, Weapon, SkinPrice
\ No newline at end of file
+from .models import User, Skin, WearType, UserSkin, Rarity, Collection, Case, Weapon, PaintKitVariant, MarketHashName, SkinSearchDocument, SkinPrice, SkinPriceHourly, SkinPriceDaily, SkinPriceLatest, SkinPriceStats, PriceRollupState, CatalogVersion, PriceAlert, AlertOutbox
\ No newline at end of file
@@ -1,9 +1,10 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, Boolean, Float, ForeignKey, DateTime, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, Boolean, Float, Integer, ForeignKey, DateTime, UniqueConstraint, Index, Computed, text
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.config import settings
 from app.db.base import Base
 
 
@@ -18,6 +19,8 @@ class Rarity(Base):
     rarity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String, unique=True, index=True)
     color_hex: Mapped[str] = mapped_column(String(7))
+    # items_game.txt rarity value: 1 (Consumer Grade) to 6 (Covert); None for items outside trade-ups.
+    tier: Mapped[int | None] = mapped_column(Integer)
 
 
 class Weapon(Base):
@@ -35,7 +38,7 @@ class Collection(Base):
 class Case(Base):
     __tablename__ = 'cases'
     case_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    collection_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("collections.collection_id"))
+    collection_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("collections.collection_id"), index=True)
     name: Mapped[str] = mapped_column(String, unique=True, index=True)
     collection: Mapped["Collection"] = relationship()
 
@@ -55,9 +58,59 @@ class Skin(Base):
     weapon: Mapped["Weapon"] = relationship()
     rarity: Mapped["Rarity"] = relationship()
     collection: Mapped["Collection"] = relationship()
+    variants: Mapped[list["PaintKitVariant"]] = relationship(back_populates="skin")
 
     __table_args__ = (
         UniqueConstraint('name', 'weapon_id', name='uq_skin_weapon'),
+        # Keyset pagination walks (name, skin_id), optionally under one of the filters.
+        Index('ix_skins_name_id', 'name', 'skin_id'),
+        Index('ix_skins_weapon_name_id', 'weapon_id', 'name', 'skin_id'),
+        Index('ix_skins_rarity_name_id', 'rarity_id', 'name', 'skin_id'),
+        Index('ix_skins_collection_name_id', 'collection_id', 'name', 'skin_id'),
+    )
+
+
+class PaintKitVariant(Base):
+    __tablename__ = 'paint_kit_variants'
+    variant_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"), index=True)
+    paint_index: Mapped[int] = mapped_column(Integer, index=True)
+    paint_kit: Mapped[str] = mapped_column(String)
+    phase: Mapped[str | None] = mapped_column(String)
+    float_min: Mapped[float] = mapped_column(Float, default=0.0)
+    float_max: Mapped[float] = mapped_column(Float, default=1.0)
+
+    skin: Mapped["Skin"] = relationship(back_populates="variants")
+
+    __table_args__ = (
+        UniqueConstraint('skin_id', 'paint_index', name='uq_variant_skin_paint_index'),
+    )
+
+
+class MarketHashName(Base):
+    __tablename__ = 'market_hash_names'
+    market_hash_name: Mapped[str] = mapped_column(String, primary_key=True)
+    skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"))
+    wear_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("wear_types.wear_id"))
+    stattrack: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    __table_args__ = (
+        UniqueConstraint('skin_id', 'wear_id', 'stattrack', name='uq_market_hash_name_variant'),
+    )
+
+
+class SkinSearchDocument(Base):
+    __tablename__ = 'skin_search_documents'
+    skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"), primary_key=True)
+    wear_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("wear_types.wear_id"), primary_key=True)
+    market_hash_name: Mapped[str] = mapped_column(String)
+    document: Mapped[str] = mapped_column(String)
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, Computed("to_tsvector('simple', document)", persisted=True))
+
+    __table_args__ = (
+        Index('ix_skin_search_documents_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_skin_search_documents_trgm', 'document', postgresql_using='gin',
+              postgresql_ops={'document': 'gin_trgm_ops'}),
     )
 
 
@@ -67,13 +120,103 @@ class SkinPrice(Base):
     skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"))
     wear_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("wear_types.wear_id"))
     stattrack: Mapped[bool] = mapped_column(Boolean, default=False)
+    # In the canonical currency; the quote as the market gave it is kept in original_*
+    # (NULL on rows ingested before prices were normalized).
     price: Mapped[float] = mapped_column(Float)
-    currency: Mapped[str] = mapped_column(String(3), default="PLN")
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    currency: Mapped[str] = mapped_column(String(3), default=settings.CANONICAL_CURRENCY)
+    original_price: Mapped[float | None] = mapped_column(Float)
+    original_currency: Mapped[str | None] = mapped_column(String(3))
+    # Part of the primary key because Postgres requires the partition key in every unique constraint.
+    updated_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=datetime.utcnow)
+    # When the row was written, as opposed to when it was quoted: the rollup watermark, so
+    # late and backdated quotes still reach the rollups. Set by the database because the
+    # ingest COPYs rows past the ORM.
+    ingested_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=text("(clock_timestamp() AT TIME ZONE 'utc')"),
+    )
 
     skin: Mapped["Skin"] = relationship()
     wear: Mapped["WearType"] = relationship()
 
+    __table_args__ = (
+        Index('ix_skin_prices_series', 'skin_id', 'wear_id', 'stattrack', 'updated_at'),
+        Index('ix_skin_prices_ingested', 'ingested_at'),
+        {'postgresql_partition_by': 'RANGE (updated_at)'},
+    )
+
+
+class SkinPriceHourly(Base):
+    __tablename__ = 'skin_prices_hourly'
+    skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"), primary_key=True)
+    wear_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("wear_types.wear_id"), primary_key=True)
+    stattrack: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    open: Mapped[float] = mapped_column(Float)
+    high: Mapped[float] = mapped_column(Float)
+    low: Mapped[float] = mapped_column(Float)
+    close: Mapped[float] = mapped_column(Float)
+    samples: Mapped[int] = mapped_column(Integer)
+    first_at: Mapped[datetime] = mapped_column(DateTime)
+    last_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class SkinPriceDaily(Base):
+    __tablename__ = 'skin_prices_daily'
+    skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"), primary_key=True)
+    wear_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("wear_types.wear_id"), primary_key=True)
+    stattrack: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    open: Mapped[float] = mapped_column(Float)
+    high: Mapped[float] = mapped_column(Float)
+    low: Mapped[float] = mapped_column(Float)
+    close: Mapped[float] = mapped_column(Float)
+    samples: Mapped[int] = mapped_column(Integer)
+    first_at: Mapped[datetime] = mapped_column(DateTime)
+    last_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class SkinPriceLatest(Base):
+    """The newest ``skin_prices`` row per key, upserted in the same transaction as the ingest."""
+    __tablename__ = 'skin_prices_latest'
+    skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"), primary_key=True)
+    wear_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("wear_types.wear_id"), primary_key=True)
+    stattrack: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    price: Mapped[float] = mapped_column(Float)
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class SkinPriceStats(Base):
+    __tablename__ = 'skin_price_stats'
+    skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"), primary_key=True)
+    wear_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("wear_types.wear_id"), primary_key=True)
+    stattrack: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    # "24h", "7d" or "30d"
+    period: Mapped[str] = mapped_column(String(3), primary_key=True)
+    min_price: Mapped[float] = mapped_column(Float)
+    max_price: Mapped[float] = mapped_column(Float)
+    median_price: Mapped[float] = mapped_column(Float)
+    # Standard deviation of log returns between consecutive rollup buckets.
+    volatility: Mapped[float] = mapped_column(Float)
+    samples: Mapped[int] = mapped_column(Integer)
+    computed_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class PriceRollupState(Base):
+    __tablename__ = 'price_rollup_state'
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    processed_until: Mapped[datetime] = mapped_column(DateTime)
+
+
+class CatalogVersion(Base):
+    __tablename__ = 'catalog_versions'
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=1)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
 
 class User(Base):
     __tablename__ = 'users'
@@ -92,6 +235,7 @@ class UserSkin(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.user_id"))
     skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"))
     wear_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("wear_types.wear_id"))
+    variant_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("paint_kit_variants.variant_id"))
 
     stattrack: Mapped[bool] = mapped_column(Boolean, default=False)
     float_value: Mapped[float | None] = mapped_column(Float)
@@ -99,4 +243,44 @@ class UserSkin(Base):
 
     user: Mapped["User"] = relationship(back_populates="inventory")
     skin: Mapped["Skin"] = relationship()
-    wear: Mapped["WearType"] = relationship()
\ No newline at end of file
+    wear: Mapped["WearType"] = relationship()
+    variant: Mapped["PaintKitVariant"] = relationship()
+
+    __table_args__ = (
+        Index('ix_user_skins_skin_float', 'skin_id', 'float_value'),
+    )
+
+
+class PriceAlert(Base):
+    __tablename__ = 'price_alerts'
+    alert_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.user_id"), index=True)
+    skin_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("skins.skin_id"))
+    wear_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("wear_types.wear_id"))
+    stattrack: Mapped[bool] = mapped_column(Boolean, default=False)
+    # "below": fires when the price drops to the threshold or under it; "above": rises to it or over it.
+    direction: Mapped[str] = mapped_column(String(5))
+    threshold: Mapped[float] = mapped_column(Float)
+    currency: Mapped[str] = mapped_column(String(3), default=settings.CANONICAL_CURRENCY)
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    triggered_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    __table_args__ = (
+        Index('ix_price_alerts_active_key', 'skin_id', 'wear_id', 'stattrack', postgresql_where=active),
+    )
+
+
+class AlertOutbox(Base):
+    __tablename__ = 'alert_outbox'
+    notification_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    alert_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("price_alerts.alert_id"), index=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.user_id"))
+    price: Mapped[float] = mapped_column(Float)
+    currency: Mapped[str] = mapped_column(String(3))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    delivered_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    __table_args__ = (
+        Index('ix_alert_outbox_pending', 'created_at', postgresql_where=delivered_at.is_(None)),
+    )
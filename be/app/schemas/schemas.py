@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
-from typing import Optional
+from typing import Generic, Optional, TypeVar
+from datetime import datetime
 
 class BaseRead(BaseModel):
     model_config = ConfigDict(from_attributes = True)
@@ -13,6 +14,7 @@ class RarityRead(BaseRead):
     rarity_id: UUID
     name: str
     color_hex: str
+    tier: Optional[int] = None
 
 class CollectionRead(BaseRead):
     collection_id: UUID
@@ -37,6 +39,97 @@ class SkinRead(BaseRead):
     weapon: WeaponRead
     rarity: RarityRead
 
+T = TypeVar("T")
 
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None
 
+class SearchResultRead(BaseRead):
+    skin_id: UUID
+    wear_id: UUID
+    market_hash_name: str
+    rank: Optional[float] = None
+
+class PaintKitVariantRead(BaseRead):
+    variant_id: UUID
+    paint_index: int
+    paint_kit: str
+    phase: Optional[str] = None
+    float_min: float
+    float_max: float
+
+class SkinDetailRead(SkinRead):
+    variants: list[PaintKitVariantRead] = []
+
+class CaseEvRead(BaseModel):
+    case_id: UUID
+    name: str
+    expected_value: float
+    priced_odds: float
+    currency: str
+
+class PriceCandleRead(BaseRead):
+    bucket_start: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    samples: int
+
+class PriceStatsRead(BaseRead):
+    min_price: float
+    max_price: float
+    median_price: float
+    volatility: float
+    samples: int
+    computed_at: datetime
+
+class PriceSummaryRead(BaseModel):
+    wear_id: UUID
+    stattrack: bool
+    currency: str
+    price: float
+    updated_at: datetime
+    stats: dict[str, PriceStatsRead] = {}
+
+class InventoryItemValueRead(BaseModel):
+    user_skin_id: UUID
+    skin_id: UUID
+    wear_id: Optional[UUID] = None
+    stattrack: bool
+    price: Optional[float] = None
+
+class PortfolioValueRead(BaseModel):
+    user_id: UUID
+    currency: str
+    total: float
+    priced_items: int
+    unpriced_items: int
+    items: list[InventoryItemValueRead] = []
+
+class FloatRankRead(BaseModel):
+    skin_id: UUID
+    float_value: float
+    rank: int
+    total: int
+    percentile: float
+
+class FloatItemRead(BaseModel):
+    user_skin_id: UUID
+    skin_id: UUID
+    float_value: float
+
+class FloatHistogramRead(BaseModel):
+    skin_id: UUID
+    total: int
+    bucket_width: float
+    counts: list[int]
 
+class SyncResultRead(BaseRead):
+    steam_id: str
+    inserted: int
+    deleted: int
+    unchanged: int
+    unmatched: list[str] = []
+    queries: int
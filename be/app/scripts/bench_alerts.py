@@ -0,0 +1,151 @@
+import os
+import sys
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from datetime import datetime
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import delete, select
+
+import app.models as models
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.alert_service import ALERT_ABOVE, ALERT_BELOW, AlertEngine, AlertIndex
+
+BENCH_STEAM_ID = "76500000000000000"
+ALERT_COLUMNS = ['alert_id', 'user_id', 'skin_id', 'wear_id', 'stattrack', 'direction', 'threshold',
+                 'currency', 'active', 'created_at']
+
+
+def synthetic_alerts(keys: list, base_prices: dict, count: int) -> list:
+    """Thresholds within +-50% of each key's base price, half of them "below" alerts."""
+    alerts = []
+    for _ in range(count):
+        key = random.choice(keys)
+        direction = ALERT_BELOW if random.random() < 0.5 else ALERT_ABOVE
+        alerts.append((uuid.uuid4(), key, direction, round(base_prices[key] * random.uniform(0.5, 1.5), 2)))
+    return alerts
+
+
+def synthetic_updates(keys: list, base_prices: dict, count: int) -> list:
+    """Price moves of up to +-30%."""
+    return [(key, round(base_prices[key] * random.uniform(0.7, 1.3), 2)) for key in random.choices(keys, k=count)]
+
+
+def naive_match(alerts: list, updates: list) -> int:
+    """Every alert checked against every price, the O(alerts x prices) baseline."""
+    fired = 0
+    for key, price in updates:
+        for _, alert_key, direction, threshold in alerts:
+            if alert_key == key and (price <= threshold if direction == ALERT_BELOW else price >= threshold):
+                fired += 1
+    return fired
+
+
+def bench_memory(args, keys, base_prices):
+    alerts = synthetic_alerts(keys, base_prices, args.alerts)
+    updates = synthetic_updates(keys, base_prices, args.updates)
+
+    start = time.perf_counter()
+    index = AlertIndex.build(alerts)
+    print(f"Index build: {len(index)} alerts over {len(index.books)} keys in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    fired = 0
+    for i in range(0, len(updates), args.batch_size):
+        matched = index.match(updates[i:i + args.batch_size])
+        index.remove(matched)
+        fired += len(matched)
+    elapsed = time.perf_counter() - start
+    print(f"Indexed match: {len(updates)} updates, {fired} alerts fired in {elapsed * 1000:.0f} ms "
+          f"({elapsed / len(updates) * 1e6:.1f} us per price)")
+
+    sample = updates[:args.naive_sample]
+    start = time.perf_counter()
+    naive_match(alerts, sample)
+    per_price = (time.perf_counter() - start) / len(sample)
+    print(f"Naive scan: {per_price * 1000:.1f} ms per price, ~{per_price * len(updates):.0f}s "
+          f"for {len(updates)} updates (extrapolated from {len(sample)})")
+
+
+async def bench_db(args):
+    async with SessionLocal() as db:
+        keys = [
+            (skin_id, wear_id, stattrack, settings.CANONICAL_CURRENCY)
+            for skin_id, wear_id, stattrack in await db.execute(
+                select(models.MarketHashName.skin_id, models.MarketHashName.wear_id, models.MarketHashName.stattrack)
+            )
+        ]
+        if not keys:
+            raise SystemExit("No market hash names found, seed the catalog first")
+        base_prices = {key: random.uniform(1, 5000) for key in keys}
+        user = models.User(steam_id=BENCH_STEAM_ID, name="bench-alerts")
+        db.add(user)
+        await db.flush()
+        user_id = user.user_id
+
+        start = time.perf_counter()
+        now = datetime.utcnow()
+        records = [
+            (alert_id, user_id, skin_id, wear_id, stattrack, direction, threshold, currency, True, now)
+            for alert_id, (skin_id, wear_id, stattrack, currency), direction, threshold
+            in synthetic_alerts(keys, base_prices, args.alerts)
+        ]
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table('price_alerts', records=records, columns=ALERT_COLUMNS)
+        await db.commit()
+        print(f"Inserted {len(records)} alerts in {time.perf_counter() - start:.2f}s")
+
+    try:
+        async with SessionLocal() as db:
+            start = time.perf_counter()
+            engine = await AlertEngine.load(db)
+            print(f"Engine load: {len(engine.index)} alerts in {time.perf_counter() - start:.2f}s")
+
+        updates = synthetic_updates(keys, base_prices, args.updates)
+        start = time.perf_counter()
+        fired = 0
+        for i in range(0, len(updates), args.batch_size):
+            async with SessionLocal() as db:
+                matched = await engine.process(db, updates[i:i + args.batch_size])
+                await db.commit()
+            engine.forget(matched)
+            fired += len(matched)
+        elapsed = time.perf_counter() - start
+        print(f"Processed {len(updates)} updates in batches of {args.batch_size}: {fired} alerts fired "
+              f"and queued in the outbox in {elapsed:.2f}s")
+    finally:
+        async with SessionLocal() as db:
+            bench_alerts = select(models.PriceAlert.alert_id).where(models.PriceAlert.user_id == user_id)
+            await db.execute(delete(models.AlertOutbox).where(models.AlertOutbox.alert_id.in_(bench_alerts)))
+            await db.execute(delete(models.PriceAlert).where(models.PriceAlert.user_id == user_id))
+            await db.execute(delete(models.User).where(models.User.user_id == user_id))
+            await db.commit()
+
+
+def main(args):
+    random.seed(args.seed)
+    if args.db:
+        asyncio.run(bench_db(args))
+        return
+    keys = [(uuid.uuid4(), uuid.uuid4(), bool(i % 2), settings.CANONICAL_CURRENCY) for i in range(args.keys)]
+    base_prices = {key: random.uniform(1, 5000) for key in keys}
+    bench_memory(args, keys, base_prices)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark price alert matching")
+    parser.add_argument("--alerts", type=int, default=1_000_000)
+    parser.add_argument("--updates", type=int, default=100_000)
+    parser.add_argument("--keys", type=int, default=25_000, help="distinct (skin, wear, stattrack) keys in memory mode")
+    parser.add_argument("--batch-size", type=int, default=5000, help="prices per ingest batch")
+    parser.add_argument("--naive-sample", type=int, default=20, help="prices to time the naive scan on")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db", action="store_true",
+                        help="insert the alerts into price_alerts and fire them through AlertEngine and the outbox")
+    main(parser.parse_args())
@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import random
+import socket
+import asyncio
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+
+sys.path.append(os.getcwd())
+
+from app.services.http_client import HttpClient
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_server(workers: int) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning", "--no-access-log"],
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return process, url
+        except OSError:
+            await asyncio.sleep(0.1)
+    process.terminate()
+    raise SystemExit("API server did not start")
+
+
+async def discover(client: HttpClient, url: str) -> dict[str, list[str]]:
+    """Builds the request mix from real ids: deep skin pages, filtered listings and detail lookups."""
+    paths = defaultdict(list)
+    cursor, pages = None, 0
+    skins = []
+    while pages < 20:
+        page = await client.get_json(f"{url}/skins?limit=200" + (f"&cursor={cursor}" if cursor else ""))
+        skins += page['items']
+        paths['skins page'].append("/skins?limit=50" + (f"&cursor={cursor}" if cursor else ""))
+        cursor, pages = page['next_cursor'], pages + 1
+        if not cursor:
+            break
+    if not skins:
+        raise SystemExit("No skins found, run the seeding first")
+
+    paths['skin detail'] = [f"/skins/{skin['skin_id']}" for skin in random.sample(skins, min(len(skins), 500))]
+    paths['skins by weapon'] = list({f"/skins?weapon_id={skin['weapon']['weapon_id']}" for skin in skins})
+    paths['skins by rarity'] = list({f"/skins?rarity_id={skin['rarity']['rarity_id']}" for skin in skins})
+    paths['cases'] = ["/cases?limit=100"]
+    return paths
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1] if len(values) > 1 else values[0]
+
+
+async def run(client: HttpClient, url: str, paths: dict[str, list[str]], requests: int, concurrency: int,
+              report: bool = True):
+    labels = list(paths)
+    latencies = defaultdict(list)
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            label = random.choice(labels)
+            start = time.perf_counter()
+            status, _ = await client.request("GET", url + random.choice(paths[label]))
+            latencies[label].append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    if not report:
+        return
+
+    print(f"{'endpoint':<18} {'requests':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for label in labels + ['total']:
+        values = sum(latencies.values(), []) if label == 'total' else latencies[label]
+        if values:
+            print(f"{label:<18} {len(values):>9} {percentile(values, 50):>9.2f} {percentile(values, 99):>9.2f}")
+    print(f"{requests / elapsed:.0f} requests/s over {elapsed:.1f} s, {errors} errors")
+
+
+async def main(args):
+    process = None
+    url = args.url
+    if url is None:
+        process, url = await start_server(args.workers)
+    try:
+        async with HttpClient(max_connections_per_host=args.concurrency) as client:
+            paths = await discover(client, url)
+            await run(client, url, paths, args.warmup, args.concurrency, report=False)
+            await run(client, url, paths, args.requests, args.concurrency)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the catalog API")
+    parser.add_argument("--url", help="running API to test; by default uvicorn is started on a free port")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when starting the server")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
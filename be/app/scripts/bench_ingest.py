@@ -0,0 +1,62 @@
+import os
+import sys
+import uuid
+import asyncio
+import argparse
+
+sys.path.append(os.getcwd())
+
+from app.services.fake_market import FakeMarketServer
+from app.services.http_client import HttpClient
+from app.services.skin_price_service import JsonMarketSource, PriceIngestor, PriceTarget
+
+
+def synthetic_targets(count: int) -> list[PriceTarget]:
+    return [
+        PriceTarget(uuid.uuid4(), uuid.uuid4(), bool(i % 2), f"Weapon {i % 97} | Finish {i} (Field-Tested)")
+        for i in range(count)
+    ]
+
+
+async def discard_quotes(quotes) -> int:
+    return len(quotes)
+
+
+async def main(args):
+    if args.db:
+        from app.db.session import SessionLocal
+        from app.services.price_history_service import ensure_partitions
+        from app.services.skin_price_service import copy_quotes, load_price_targets
+
+        async with SessionLocal() as db:
+            targets = await load_price_targets(db)
+            await ensure_partitions(db)
+            await db.commit()
+        sink = copy_quotes
+    else:
+        targets = synthetic_targets(args.targets)
+        sink = discard_quotes
+
+    async with FakeMarketServer(latency=args.latency, failure_rate=args.failure_rate) as server:
+        sources = [
+            JsonMarketSource(server.url, name=f"fake-{i}", requests_per_second=args.rps, batch_size=args.batch_size)
+            for i in range(args.sources)
+        ]
+        async with HttpClient(max_connections_per_host=args.concurrency) as client:
+            ingestor = PriceIngestor(sources, args.concurrency, sink=sink, client=client)
+            stats = await ingestor.run(targets)
+        print(f"Server requests: {server.requests}")
+    print(stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark price ingestion against the local fake market")
+    parser.add_argument("--targets", type=int, default=100_000, help="synthetic targets (ignored with --db)")
+    parser.add_argument("--sources", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rps", type=float, default=1000.0, help="rate limit per source")
+    parser.add_argument("--latency", type=float, default=0.005, help="fake server latency in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.01)
+    parser.add_argument("--db", action="store_true", help="price the seeded catalog and COPY into skin_prices")
+    asyncio.run(main(parser.parse_args()))
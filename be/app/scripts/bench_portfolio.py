@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import delete, desc, select
+
+import app.models as models
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.portfolio_service import PortfolioMatrix, load_latest_prices, value_portfolios
+
+BENCH_STEAM_PREFIX = "7650000"
+
+
+async def create_bench_users(db, users: int, items: int) -> list:
+    prices = (await db.execute(
+        select(models.SkinPrice.skin_id, models.SkinPrice.wear_id, models.SkinPrice.stattrack).distinct()
+    )).all()
+    if not prices:
+        raise SystemExit("No prices found, run the price ingestion first")
+
+    user_rows = [models.User(steam_id=f"{BENCH_STEAM_PREFIX}{i:010d}", name=f"bench-{i}") for i in range(users)]
+    db.add_all(user_rows)
+    await db.flush()
+    user_ids = [user.user_id for user in user_rows]
+    for user_id in user_ids:
+        for skin_id, wear_id, stattrack in random.choices(prices, k=items):
+            db.add(models.UserSkin(user_id=user_id, skin_id=skin_id, wear_id=wear_id,
+                                   stattrack=stattrack, float_value=random.random()))
+    await db.commit()
+    return user_ids
+
+
+async def drop_bench_users(db):
+    bench_users = select(models.User.user_id).where(models.User.steam_id.startswith(BENCH_STEAM_PREFIX))
+    await db.execute(delete(models.UserSkin).where(models.UserSkin.user_id.in_(bench_users)))
+    await db.execute(delete(models.User).where(models.User.steam_id.startswith(BENCH_STEAM_PREFIX)))
+    await db.commit()
+
+
+def _naive_orm_valuation(session, user_ids) -> dict:
+    totals = {}
+    for user_id in user_ids:
+        user = session.get(models.User, user_id)
+        total = 0.0
+        for item in user.inventory:
+            price = session.execute(
+                select(models.SkinPrice.price)
+                .where(models.SkinPrice.skin_id == item.skin.skin_id,
+                       models.SkinPrice.wear_id == item.wear.wear_id,
+                       models.SkinPrice.stattrack == item.stattrack,
+                       models.SkinPrice.currency == settings.CANONICAL_CURRENCY)
+                .order_by(desc(models.SkinPrice.updated_at))
+                .limit(1)
+            ).scalar()
+            total += price or 0.0
+        totals[user_id] = total
+    return totals
+
+
+async def naive_orm_valuation(db, user_ids) -> dict:
+    # Lazy relationship loads only work from sync code, so walk the graph inside run_sync.
+    return await db.run_sync(_naive_orm_valuation, user_ids)
+
+
+async def timed(label, coro):
+    start = time.perf_counter()
+    result = await coro
+    print(f"{label:<36} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+async def main(args):
+    async with SessionLocal() as db:
+        await drop_bench_users(db)
+        user_ids = await create_bench_users(db, args.users, args.items)
+    try:
+        async with SessionLocal() as db:
+            naive = await timed("naive ORM traversal", naive_orm_valuation(db, user_ids))
+        async with SessionLocal() as db:
+            portfolios = await timed("set-based valuation (1 query)", value_portfolios(db, user_ids))
+        async with SessionLocal() as db:
+            matrix = await timed("matrix load", PortfolioMatrix.load(db, user_ids))
+            prices = await timed("latest price load", load_latest_prices(db))
+
+        start = time.perf_counter()
+        for _ in range(args.revalues):
+            totals = matrix.revalue(prices)
+        print(f"{'matrix revalue (per pass)':<36} {(time.perf_counter() - start) * 1000 / args.revalues:10.1f} ms")
+
+        mismatches = sum(
+            1 for user_id in user_ids
+            if abs(naive[user_id] - portfolios[user_id].total) > 1e-6 or abs(naive[user_id] - totals[user_id]) > 1e-6
+        )
+        print(f"{len(user_ids)} users x {args.items} items, {mismatches} mismatching totals")
+    finally:
+        async with SessionLocal() as db:
+            await drop_bench_users(db)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark portfolio valuation against naive ORM traversal")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--revalues", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import func, select
+
+import app.models as models
+from app.db.session import SessionLocal
+from app.services.search_service import WEAR_ABBREVIATIONS, AutocompleteIndex, search_skins, tokenize
+
+
+def user_query(weapon: str, skin: str, wear: str) -> str:
+    """Something a user would type: a weapon prefix, one finish word and sometimes the wear abbreviation."""
+    words = [tokenize(weapon)[0][:random.randint(2, 5)], random.choice(tokenize(skin) or [""])]
+    if random.random() < 0.5 and wear in WEAR_ABBREVIATIONS:
+        words.append(WEAR_ABBREVIATIONS[wear])
+    return " ".join(words)
+
+
+def typo(query: str) -> str:
+    position = random.randrange(len(query))
+    return query[:position] + query[position + 1:]
+
+
+def report(label: str, latencies: list[float]):
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    print(f"{label:<28} p50 {quantiles[49]:7.2f} ms   p99 {quantiles[98]:7.2f} ms   max {max(latencies):7.2f} ms")
+
+
+async def timed_queries(db, queries, call) -> tuple[list[float], int]:
+    latencies, empty = [], 0
+    for query in queries:
+        start = time.perf_counter()
+        results = await call(db, query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        empty += not results
+    return latencies, empty
+
+
+async def ilike_scan(db, query):
+    doc = models.SkinSearchDocument
+    stmt = select(doc.market_hash_name).where(doc.market_hash_name.ilike(f"%{query}%")).limit(20)
+    return (await db.execute(stmt)).all()
+
+
+async def main(args):
+    async with SessionLocal() as db:
+        documents = await db.scalar(select(func.count()).select_from(models.SkinSearchDocument))
+        if not documents:
+            raise SystemExit("No search documents found, run the seeding first")
+        stmt = (
+            select(models.Weapon.name, models.Skin.name, models.WearType.name)
+            .join(models.Weapon, models.Skin.weapon_id == models.Weapon.weapon_id)
+            .join(models.SkinSearchDocument, models.SkinSearchDocument.skin_id == models.Skin.skin_id)
+            .join(models.WearType, models.WearType.wear_id == models.SkinSearchDocument.wear_id)
+        )
+        samples = random.choices((await db.execute(stmt)).all(), k=args.queries)
+        queries = [user_query(*sample) for sample in samples]
+        misspelled = [typo(query) for query in queries]
+        print(f"{documents} search documents, {args.queries} queries per run")
+
+        await timed_queries(db, queries[:50], search_skins)
+        latencies, empty = await timed_queries(db, queries, search_skins)
+        report(f"search ({empty} empty)", latencies)
+        latencies, empty = await timed_queries(db, misspelled, search_skins)
+        report(f"search, typos ({empty} empty)", latencies)
+        latencies, _ = await timed_queries(db, [" ".join(tokenize(s[1])) for s in samples], ilike_scan)
+        report("ILIKE '%...%' baseline", latencies)
+
+        autocomplete = AutocompleteIndex()
+        start = time.perf_counter()
+        await autocomplete.load(db)
+        print(f"{'prefix index build':<28} {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+    prefixes = [query[:random.randint(2, len(query))] for query in queries]
+    latencies = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        autocomplete.index.complete(prefix)
+        latencies.append((time.perf_counter() - start) * 1000)
+    report("prefix index autocomplete", latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark skin search against the full catalog")
+    parser.add_argument("--queries", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
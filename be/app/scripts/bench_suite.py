@@ -0,0 +1,306 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import inspect
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.db.session as session
+import app.models as models
+from app.core.config import settings
+from app.db.base import Base
+from app.db.instrumentation import count_queries
+from app.db.upsert import DEFAULT_CHUNK_SIZE
+from app.scripts.scripts import build_stages
+from app.scripts.synthetic_game_data import write_game_data
+from app.services.fake_market import FakeMarketServer
+from app.services.portfolio_service import PortfolioMatrix, load_latest_prices, value_portfolios
+from app.services.price_history_service import ensure_partitions
+from app.services.skin_price_service import JsonMarketSource, ingest_prices
+
+BENCH_DB_PREFIX = "cs2_bench_"
+# Rows each seed stage leaves behind, for rows/sec.
+STAGE_TABLES = {
+    'rarities': models.Rarity,
+    'wear_types': models.WearType,
+    'weapons': models.Weapon,
+    'collections': models.Collection,
+    'cases': models.Case,
+    'skins': models.Skin,
+    'search': models.SkinSearchDocument,
+    'market_names': models.MarketHashName,
+}
+
+
+@dataclass
+class BenchResult:
+    seconds: float
+    queries: int
+    rows: int
+    rows_per_second: float
+    peak_rss_mb: float
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux; it is the process high-water mark, so it never goes down between steps.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Recorder:
+    def __init__(self):
+        self.results: dict[str, BenchResult] = {}
+
+    async def measure(self, name: str, call, rows=None):
+        """
+        Times ``await call()``. ``rows`` is a row count, or a function of the
+        result returning one (or a coroutine for one), evaluated after the timing
+        so its queries don't count.
+        """
+        with count_queries(name, strict=False) as counter:
+            start = time.perf_counter()
+            result = await call()
+            elapsed = time.perf_counter() - start
+        queries = counter.total
+        if callable(rows):
+            rows = rows(result)
+            if inspect.isawaitable(rows):
+                rows = await rows
+        rows = rows or 0
+        self.results[name] = BenchResult(
+            elapsed, queries, rows, rows / elapsed if elapsed > 0 else 0.0, peak_rss_mb(),
+        )
+        print(f"{name:<28} {elapsed * 1000:10.1f} ms {queries:>8} queries "
+              f"{rows:>9} rows")
+        return result
+
+
+async def count_rows(model) -> int:
+    async with session.SessionLocal() as db:
+        return (await db.execute(select(func.count()).select_from(model))).scalar()
+
+
+def admin_url() -> str:
+    return make_url(settings.SQLALCHEMY_DATABASE_URI).set(database="postgres").render_as_string(hide_password=False)
+
+
+async def create_bench_database(name: str):
+    """Creates ``name`` next to the configured database and points ``SessionLocal`` at it."""
+    admin = create_async_engine(admin_url(), isolation_level="AUTOCOMMIT")
+    async with admin.connect() as connection:
+        await connection.execute(text(f'DROP DATABASE IF EXISTS "{name}"'))
+        await connection.execute(text(f'CREATE DATABASE "{name}"'))
+    await admin.dispose()
+
+    settings.POSTGRES_DB = name
+    await session.use_pool_profile('seed')
+    async with session.engine.begin() as connection:
+        await connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await connection.run_sync(Base.metadata.create_all)
+    async with session.SessionLocal() as db:
+        await ensure_partitions(db)
+        await db.commit()
+
+
+async def drop_bench_database(name: str):
+    await session.engine.dispose()
+    admin = create_async_engine(admin_url(), isolation_level="AUTOCOMMIT")
+    async with admin.connect() as connection:
+        await connection.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+    await admin.dispose()
+
+
+async def bench_seed(recorder: Recorder, game_data, chunk_size: int):
+    """
+    Runs the ``scripts.py`` stages one after another in dependency order, so the
+    wall time and peak memory of each belong to that stage alone.
+    """
+    results = {}
+    for stage in build_stages(game_data, chunk_size):
+        kwargs = {argument: results[dependency] for dependency, argument in stage.depends_on.items()}
+        result = await recorder.measure(
+            f"seed.{stage.name}", lambda: stage.run(**kwargs), lambda _: count_rows(STAGE_TABLES[stage.name]),
+        )
+        if result is None:
+            raise SystemExit(f"Seed stage '{stage.name}' failed")
+        results[stage.name] = result
+
+
+async def bench_ingest(recorder: Recorder, sources: int, batch_size: int, concurrency: int):
+    async with FakeMarketServer() as server:
+        market_sources = [
+            JsonMarketSource(server.url, name=f"fake-{i}", requests_per_second=1e6, batch_size=batch_size)
+            for i in range(sources)
+        ]
+        stats = await recorder.measure(
+            "ingest", lambda: ingest_prices(market_sources, concurrency), lambda stats: stats.written,
+        )
+    if stats.failed_batches or stats.failed_writes:
+        print(f"Warning: ingestion was incomplete: {stats}")
+
+
+async def create_users(users: int, items: int, seed: int) -> list:
+    rng = random.Random(seed)
+    async with session.SessionLocal() as db:
+        keys = (await db.execute(
+            select(models.SkinPriceLatest.skin_id, models.SkinPriceLatest.wear_id, models.SkinPriceLatest.stattrack)
+        )).all()
+        user_rows = [models.User(steam_id=f"7650000{i:010d}", name=f"bench-{i}") for i in range(users)]
+        db.add_all(user_rows)
+        await db.flush()
+        user_ids = [user.user_id for user in user_rows]
+        db.add_all(
+            models.UserSkin(user_id=user_id, skin_id=skin_id, wear_id=wear_id, stattrack=stattrack,
+                            float_value=rng.random())
+            for user_id in user_ids
+            for skin_id, wear_id, stattrack in rng.choices(keys, k=items)
+        )
+        await db.commit()
+        return user_ids
+
+
+async def bench_valuation(recorder: Recorder, users: int, items: int, seed: int):
+    user_ids = await create_users(users, items, seed)
+    async with session.SessionLocal() as db:
+        await recorder.measure("valuation.set_based", lambda: value_portfolios(db, user_ids), users * items)
+    async with session.SessionLocal() as db:
+        matrix = await recorder.measure("valuation.matrix_load", lambda: PortfolioMatrix.load(db, user_ids),
+                                        users * items)
+        prices = await recorder.measure("valuation.latest_prices", lambda: load_latest_prices(db), len)
+
+    async def revalue():
+        return matrix.revalue(prices)
+
+    await recorder.measure("valuation.revalue", revalue, users * items)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_suite(args) -> dict:
+    recorder = Recorder()
+    name = f"{BENCH_DB_PREFIX}{os.getpid()}"
+    with tempfile.TemporaryDirectory(prefix="cs2-bench-") as directory:
+        start = time.perf_counter()
+        game_data = write_game_data(Path(directory), args.paint_kits, args.item_sets, args.seed)
+        print(f"Generated {args.paint_kits} paint kits in {args.item_sets} item sets "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        await create_bench_database(name)
+        try:
+            await recorder.measure("game_data.load", lambda: asyncio.to_thread(game_data.load, True))
+            await bench_seed(recorder, game_data, args.chunk_size)
+            await bench_ingest(recorder, args.sources, args.batch_size, args.concurrency)
+            await bench_valuation(recorder, args.users, args.items, args.seed)
+        finally:
+            if args.keep_db:
+                print(f"Kept database {name}")
+            else:
+                await drop_bench_database(name)
+
+    return {
+        'meta': {
+            'paint_kits': args.paint_kits,
+            'item_sets': args.item_sets,
+            'users': args.users,
+            'items': args.items,
+            'seed': args.seed,
+            'chunk_size': args.chunk_size,
+            'python': platform.python_version(),
+            'commit': git_commit(),
+            'created_at': datetime.utcnow().isoformat(),
+        },
+        'results': {key: asdict(result) for key, result in recorder.results.items()},
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float, min_seconds: float) -> list[str]:
+    """
+    Prints current against baseline and returns the regressions: a step slower
+    (by more than ``tolerance`` and ``min_seconds``), running more queries, or
+    raising peak memory by more than ``tolerance``.
+    """
+    if baseline['meta'].get('paint_kits') != current['meta'].get('paint_kits'):
+        print("Warning: baseline and current runs were generated at different scales")
+    regressions = []
+    print(f"{'step':<28} {'baseline':>11} {'current':>11} {'change':>8} {'queries':>15}")
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"{name:<28} {'-':>11} {now['seconds'] * 1000:9.1f}ms")
+            continue
+        change = now['seconds'] / before['seconds'] - 1 if before['seconds'] > 0 else 0.0
+        print(f"{name:<28} {before['seconds'] * 1000:9.1f}ms {now['seconds'] * 1000:9.1f}ms {change:+8.1%} "
+              f"{before['queries']:>7}->{now['queries']:<7}")
+        if change > tolerance and now['seconds'] - before['seconds'] > min_seconds:
+            regressions.append(f"{name}: {change:+.1%} wall time")
+        if now['queries'] > before['queries']:
+            regressions.append(f"{name}: {before['queries']} -> {now['queries']} queries")
+        if now['peak_rss_mb'] > before['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(f"{name}: peak RSS {before['peak_rss_mb']:.0f} -> {now['peak_rss_mb']:.0f} MiB")
+    return regressions
+
+
+def main(args):
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = asyncio.run(run_suite(args))
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(current, f, indent=2)
+            print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.tolerance, args.min_seconds)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Seed, ingest and value a synthetic catalog in a disposable database and record timings",
+    )
+    parser.add_argument("--paint-kits", type=int, default=10_000)
+    parser.add_argument("--item-sets", type=int, default=1_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--items", type=int, default=50, help="inventory items per user")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per INSERT ... ON CONFLICT statement")
+    parser.add_argument("--sources", type=int, default=2, help="fake market sources to ingest from")
+    parser.add_argument("--batch-size", type=int, default=100, help="market hash names per source request")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--keep-db", action="store_true", help="leave the benchmark database in place")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results in this JSON file; exit 1 on regressions")
+    parser.add_argument("--current", help="with --baseline: compare this results file instead of running")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown / memory growth")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="slowdowns below this many seconds are noise, whatever the ratio")
+    main(parser.parse_args())
@@ -0,0 +1,81 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+sys.path.append(os.getcwd())
+
+import vdf
+
+from app.scripts.game_data import ITEMS_GAME_PATH, ITEMS_GAME_SECTIONS, TOKENS_PATH
+from app.scripts.vdf_stream import load_file
+
+VARIANTS = ('vdf.load', 'stream', 'stream-sections', 'check')
+
+
+def legacy_load(path):
+    """The previous loader: try UTF-16, fall back to re-reading as UTF-8."""
+    try:
+        with open(path, 'r', encoding='utf-16') as f:
+            return vdf.load(f)
+    except UnicodeError:
+        with open(path, 'r', encoding='utf-8') as f:
+            return vdf.load(f)
+
+
+def run_variant(variant: str, path: str) -> dict:
+    if variant == 'check':
+        return {'result': check_equivalence(path)}
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if variant == 'vdf.load':
+        tree = legacy_load(path)
+    elif variant == 'stream':
+        tree = load_file(path)
+    else:
+        tree = load_file(path, ITEMS_GAME_SECTIONS)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {'seconds': elapsed, 'peak_rss_kb': peak, 'delta_rss_kb': peak - baseline, 'keys': len(tree)}
+
+
+def check_equivalence(path) -> str:
+    expected = legacy_load(path)
+    if load_file(path) != expected:
+        return "MISMATCH"
+    if 'items_game' in expected:
+        wanted = {key: value for key, value in expected['items_game'].items() if key in ITEMS_GAME_SECTIONS}
+        if load_file(path, ITEMS_GAME_SECTIONS).get('items_game') != wanted:
+            return "MISMATCH (sections)"
+    return "identical"
+
+
+def main(args):
+    # Every variant runs in a fresh interpreter so peak RSS is not shared between them.
+    def spawn(variant, path) -> dict:
+        output = subprocess.run(
+            [sys.executable, __file__, '--variant', variant, path], capture_output=True, text=True, check=True,
+        ).stdout
+        return json.loads(output)
+
+    for path in args.paths:
+        size = os.path.getsize(path) / 2 ** 20
+        print(f"{path} ({size:.1f} MiB): {spawn('check', path)['result']} to vdf.load")
+        for variant in VARIANTS[:-1]:
+            result = spawn(variant, path)
+            print(f"  {variant:<16} {result['seconds'] * 1000:9.1f} ms   "
+                  f"peak RSS {result['peak_rss_kb'] / 1024:7.1f} MiB (+{result['delta_rss_kb'] / 1024:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the streaming VDF reader with vdf.load")
+    parser.add_argument("paths", nargs="*", default=[str(ITEMS_GAME_PATH), str(TOKENS_PATH)])
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.paths[0])))
+    else:
+        main(args)
@@ -0,0 +1,133 @@
+import os
+import functools
+from pathlib import Path
+
+from app.scripts.parse_cache import load_cached
+from app.scripts.tokens import DEFAULT_LOCALE, TokenIndex, discover_locale_paths, load_locales, normalize_tokens
+from app.scripts.vdf_stream import load_file
+
+BASE_DIR = Path(os.getcwd())
+DATA_DIR = BASE_DIR / "data"
+ITEMS_GAME_PATH = DATA_DIR / "items_game.txt"
+TOKENS_PATH = DATA_DIR / "csgo_english.txt"
+PARSE_CACHE_PATH = DATA_DIR / ".cache" / "game_data.pickle"
+
+# The only items_game.txt sections the seeders read; the rest are never built.
+ITEMS_GAME_SECTIONS = {'rarities', 'colors', 'items', 'prefabs', 'item_sets', 'paint_kits', 'paint_kits_rarity'}
+
+
+def load_vdf(path, sections=None):
+    if not path.exists():
+        return None
+    try:
+        return load_file(path, sections)
+    except Exception as e:
+        print(f"Error: {e}")
+        return None
+
+
+def clean_dictionaries(raw_items, raw_tokens):
+    if not raw_items or not raw_tokens:
+        print("Error: Wrong input data")
+        return None, None
+
+    items_root = raw_items.get('items_game')
+    return items_root, normalize_tokens(raw_tokens) or {}
+
+
+class GameData:
+    """
+    Cleaned ``items_game.txt``/``csgo_english.txt`` contents, loaded (through the
+    parse cache) on first access rather than on construction. Names are looked
+    up through ``token_index``; ``load_locales`` adds the other language files.
+    """
+
+    def __init__(self, items_path=ITEMS_GAME_PATH, tokens_path=TOKENS_PATH, cache_path=PARSE_CACHE_PATH):
+        self.items_path = items_path
+        self.tokens_path = tokens_path
+        self.cache_path = cache_path
+        self._items = None
+        self._tokens = None
+        self._token_index = None
+        self._loaded = False
+
+    def parse(self):
+        return clean_dictionaries(load_vdf(self.items_path, ITEMS_GAME_SECTIONS), load_vdf(self.tokens_path))
+
+    def load(self, rebuild=False):
+        self._items, self._tokens = load_cached(
+            [self.items_path, self.tokens_path], self.cache_path, self.parse, rebuild
+        )
+        self._token_index = None
+        self._loaded = True
+        return self
+
+    def load_locales(self, paths: list[Path] | None = None, processes: int | None = None,
+                     rebuild=False) -> TokenIndex:
+        """
+        Rebuilds ``token_index`` with the given language files, by default every
+        other ``csgo_*.txt`` next to ``csgo_english.txt``.
+        """
+        if paths is None:
+            paths = discover_locale_paths(Path(self.tokens_path).parent)
+        locales = load_locales(paths, Path(self.cache_path).parent, processes, rebuild)
+        self._token_index = TokenIndex({DEFAULT_LOCALE: self.tokens} | locales)
+        return self._token_index
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    @property
+    def available(self) -> bool:
+        self._ensure_loaded()
+        return self._items is not None and self._tokens is not None
+
+    @property
+    def tokens(self) -> dict[str, str]:
+        self._ensure_loaded()
+        return self._tokens or {}
+
+    @property
+    def token_index(self) -> TokenIndex:
+        self._ensure_loaded()
+        if self._token_index is None:
+            self._token_index = TokenIndex({DEFAULT_LOCALE: self.tokens})
+        return self._token_index
+
+    def _section(self, name) -> dict[str, dict]:
+        self._ensure_loaded()
+        return (self._items or {}).get(name, {})
+
+    @property
+    def rarities(self) -> dict[str, dict]:
+        return self._section('rarities')
+
+    @property
+    def colors(self) -> dict[str, dict]:
+        return self._section('colors')
+
+    @property
+    def items(self) -> dict[str, dict]:
+        return self._section('items')
+
+    @property
+    def prefabs(self) -> dict[str, dict]:
+        return self._section('prefabs')
+
+    @property
+    def item_sets(self) -> dict[str, dict]:
+        return self._section('item_sets')
+
+    @property
+    def paint_kits(self) -> dict[str, dict]:
+        return self._section('paint_kits')
+
+    @property
+    def paint_kits_rarity(self) -> dict[str, str]:
+        return self._section('paint_kits_rarity')
+
+
+@functools.cache
+def get_game_data() -> GameData:
+    return GameData()
@@ -0,0 +1,141 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.scripts.game_data import DATA_DIR, GameData
+from app.scripts.pipeline import Stage
+
+STATE_PATH = DATA_DIR / ".cache" / "seed_state.json"
+CHANGELOG_PATH = DATA_DIR / ".cache" / "seed_changelog.json"
+STATE_FORMAT_VERSION = 1
+
+TRACKED_SECTIONS = ('items', 'item_sets', 'paint_kits')
+
+ROW_KEYS = {
+    'rarities': ('name',),
+    'wear_types': ('name',),
+    'weapons': ('name',),
+    'collections': ('name',),
+    'cases': ('name',),
+    'skins': ('weapon', 'name'),
+}
+
+
+def fingerprint(value) -> str:
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=12).hexdigest()
+
+
+def row_key(stage, row) -> str:
+    return " | ".join(str(row[column]) for column in ROW_KEYS[stage])
+
+
+def diff_fingerprints(previous: dict, current: dict) -> dict:
+    return {
+        'added': sorted(key for key in current if key not in previous),
+        'changed': sorted(key for key in current if key in previous and previous[key] != current[key]),
+        'removed': sorted(key for key in previous if key not in current),
+    }
+
+
+def dependents(stages: list[Stage]) -> dict[str, set[str]]:
+    """Every stage that depends on each stage, directly or transitively."""
+    direct = {stage.name: set() for stage in stages}
+    for stage in stages:
+        for dependency in stage.depends_on:
+            direct.setdefault(dependency, set()).add(stage.name)
+
+    def collect(name, seen):
+        for dependent in direct.get(name, ()):
+            if dependent not in seen:
+                seen.add(dependent)
+                collect(dependent, seen)
+        return seen
+
+    return {name: collect(name, set()) for name in direct}
+
+
+def _write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class IncrementalSeed:
+    """
+    Remembers a fingerprint of every row each seed stage produced on the last
+    successful run, and narrows the next run down to rows that were added or
+    changed since. Source entries of ``items``, ``item_sets`` and ``paint_kits``
+    are fingerprinted as well so the changelog shows which VDF entries moved.
+
+    Rows removed from the game files are reported but never deleted.
+    """
+
+    def __init__(self, state_path: Path = STATE_PATH, full=False):
+        self.state_path = state_path
+        self.previous = {} if full else self._load_state()
+        self.sources = {}
+        self.rows = {}
+        self.changelog = {'sources': {}, 'stages': {}}
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if state.get('version') != STATE_FORMAT_VERSION:
+            return {}
+        return state
+
+    def diff_sources(self, game_data: GameData):
+        previous = self.previous.get('sources', {})
+        for section in TRACKED_SECTIONS:
+            current = {key: fingerprint(data) for key, data in getattr(game_data, section).items()}
+            self.sources[section] = current
+            self.changelog['sources'][section] = diff_fingerprints(previous.get(section, {}), current)
+
+    def __call__(self, stage, rows: list[dict]) -> list[dict]:
+        current = {row_key(stage, row): fingerprint(row) for row in rows}
+        diff = diff_fingerprints(self.previous.get('rows', {}).get(stage, {}), current)
+        self.rows[stage] = current
+        self.changelog['stages'][stage] = diff
+
+        touched = set(diff['added']) | set(diff['changed'])
+        return [row for row in rows if row_key(stage, row) in touched]
+
+    def commit(self, results: dict, stages: list[Stage] = ()) -> dict:
+        """
+        Persists the fingerprints of every stage that finished (a ``None`` result
+        means the stage failed and will be retried in full next time) and returns
+        the changelog. A stage's fingerprints are only kept once every stage of
+        ``stages`` that consumes its rows, directly or not, finished as well:
+        otherwise the next run would not hand the changed rows on again.
+        """
+        failed = {stage.name for stage in stages if results.get(stage.name) is None}
+        failed |= {stage for stage in self.rows if results.get(stage) is None}
+        downstream = dependents(stages)
+
+        state_rows = dict(self.previous.get('rows', {}))
+        for stage, fingerprints in self.rows.items():
+            if stage in failed or downstream.get(stage, set()) & failed:
+                continue
+            state_rows[stage] = fingerprints
+
+        state = {
+            'version': STATE_FORMAT_VERSION,
+            'sources': self.previous.get('sources', {}) if failed else self.sources,
+            'rows': state_rows,
+        }
+        _write_json(self.state_path, state)
+
+        self.changelog['generated_at'] = datetime.now(timezone.utc).isoformat()
+        self.changelog['failed_stages'] = sorted(failed)
+        return self.changelog
+
+    def write_changelog(self, path: Path = CHANGELOG_PATH):
+        _write_json(path, self.changelog)
@@ -0,0 +1,88 @@
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+CACHE_FORMAT_VERSION = 2
+PICKLE_PROTOCOL = 5
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path: Path, previous: dict | None = None) -> dict | None:
+    """
+    Returns ``{size, mtime_ns, sha256}`` for ``path``. The file is only re-hashed
+    when its size or mtime differ from ``previous``.
+    """
+    if not path.exists():
+        return None
+    stat = path.stat()
+    if previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+        return previous
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_hash(path)}
+
+
+def _read_header(cache_path: Path):
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _read_payload(cache_path: Path):
+    """The payload after the header, or ``None`` if the file is truncated or corrupt."""
+    try:
+        with open(cache_path, 'rb') as f:
+            pickle.load(f)
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _write(cache_path: Path, header: dict, payload):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(cache_path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(header, f, protocol=PICKLE_PROTOCOL)
+        pickle.dump(payload, f, protocol=PICKLE_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def load_cached(sources: list[Path], cache_path: Path, build, rebuild=False):
+    """
+    Returns the result of ``build()``, served from ``cache_path`` while none of the
+    ``sources`` changed. The cache file holds a small header (fingerprints of the
+    sources) followed by the payload, so validation never unpickles the payload.
+    A ``None`` payload or one containing ``None`` is returned but never cached.
+    """
+    header = None if rebuild else _read_header(cache_path)
+    if header and header.get('version') == CACHE_FORMAT_VERSION:
+        previous = header['sources']
+        current = {str(p): source_fingerprint(p, previous.get(str(p))) for p in sources}
+        hashes_match = all(
+            current[key] is not None and previous.get(key, {}).get('sha256') == current[key]['sha256']
+            for key in current
+        )
+        payload = _read_payload(cache_path) if hashes_match else None
+        if payload is not None:
+            if current != previous:
+                _write(cache_path, {'version': CACHE_FORMAT_VERSION, 'sources': current}, payload)
+            return payload
+        if hashes_match:
+            print(f"Error: cache {cache_path} is corrupt, rebuilding")
+            cache_path.unlink(missing_ok=True)
+
+    payload = build()
+    if payload is None or (isinstance(payload, tuple) and None in payload):
+        return payload
+
+    fingerprints = {str(p): source_fingerprint(p) for p in sources}
+    _write(cache_path, {'version': CACHE_FORMAT_VERSION, 'sources': fingerprints}, payload)
+    return payload
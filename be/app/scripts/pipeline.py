@@ -0,0 +1,93 @@
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from app.db.instrumentation import count_queries
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[..., Awaitable]
+    depends_on: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StageTiming:
+    name: str
+    started: float
+    finished: float
+    queries: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        return self.finished - self.started
+
+
+def validate_stages(stages: list[Stage]):
+    by_name = {stage.name: stage for stage in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Duplicate stage names")
+
+    visiting, done = set(), set()
+
+    def visit(name, path):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        visiting.add(name)
+        for dependency in by_name[name].depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+            visit(dependency, path + [name])
+        visiting.discard(name)
+        done.add(name)
+
+    for stage in stages:
+        visit(stage.name, [])
+
+
+async def run_pipeline(stages: list[Stage]) -> tuple[dict, list[StageTiming]]:
+    """
+    Runs every stage as soon as the stages it depends on have finished. A stage's
+    ``depends_on`` maps dependency names to the keyword argument that receives the
+    dependency's return value. Stages whose dependencies returned ``None`` are skipped.
+    Each stage runs in its own task, so its query count is its own even while
+    other stages run alongside; N+1 patterns are logged per stage.
+    """
+    validate_stages(stages)
+    origin = time.perf_counter()
+    tasks: dict[str, asyncio.Task] = {}
+    results: dict = {}
+    timings: list[StageTiming] = []
+
+    async def run_stage(stage: Stage):
+        kwargs = {}
+        for dependency, argument in stage.depends_on.items():
+            kwargs[argument] = await tasks[dependency]
+        if any(value is None for value in kwargs.values()):
+            print(f"Skipping {stage.name}: a dependency failed")
+            return None
+
+        started = time.perf_counter() - origin
+        with count_queries(f"stage {stage.name}", strict=False) as counter:
+            result = await stage.run(**kwargs)
+        timings.append(StageTiming(stage.name, started, time.perf_counter() - origin, counter.total))
+        results[stage.name] = result
+        return result
+
+    for stage in stages:
+        tasks[stage.name] = asyncio.create_task(run_stage(stage))
+    await asyncio.gather(*tasks.values())
+
+    return results, timings
+
+
+def print_timings(timings: list[StageTiming]):
+    for timing in sorted(timings, key=lambda t: t.started):
+        print(f"{timing.name:<12} {timing.started * 1000:8.1f} ms -> {timing.finished * 1000:8.1f} ms "
+              f"({timing.elapsed * 1000:.1f} ms, {timing.queries} queries)")
+    if timings:
+        print(f"Total wall time: {max(t.finished for t in timings) * 1000:.1f} ms")
@@ -1,350 +1,526 @@
-import vdf
 import os
+import re
 import sys
+import time
 import asyncio
-from pathlib import Path
+import argparse
 
 sys.path.append(os.getcwd())
 
-from sqlalchemy import select
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, render_metrics, use_pool_profile
+from app.db.upsert import bulk_upsert, UpsertResult, DEFAULT_CHUNK_SIZE
+from app.scripts.game_data import GameData, get_game_data
+from app.scripts.pipeline import Stage, run_pipeline, print_timings
+from app.scripts.incremental import IncrementalSeed, CHANGELOG_PATH
+from app.services.catalog_cache import bump_catalog_version, catalog_cache
+from app.services.market_names import STAR_RARITY, rebuild_market_names
+from app.services.search_service import rebuild_search_documents
 import app.models as models
 
-BASE_DIR = Path(os.getcwd())
-DATA_DIR = BASE_DIR / "data"
 
+def cache_timing_report(game_data: GameData):
+    start = time.perf_counter()
+    game_data.load(rebuild=True)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    game_data.load()
+    warm = time.perf_counter() - start
+
+    print(f"Cold load (vdf parse + cache write): {cold * 1000:.1f} ms")
+    print(f"Warm load (cache hit): {warm * 1000:.1f} ms")
+    if warm > 0:
+        print(f"Speedup: {cold / warm:.1f}x")
+
+
+async def commit_seed(db, *results: UpsertResult):
+    if any(result.inserted or result.updated for result in results):
+        await bump_catalog_version(db)
+    await db.commit()
 
-def load_vdf(path):
-    if not path.exists():
-        return None
-    try:
-        with open(path, 'r', encoding='utf-16') as f:
-            return vdf.load(f)
-    except UnicodeError:
-        with open(path, 'r', encoding='utf-8') as f:
-            return vdf.load(f)
-    except Exception as e:
-        print(f"Error: {e}")
-        return None
+
+def name_map(result: UpsertResult) -> dict:
+    return {key[0]: row_id for key, row_id in result.ids.items()}
 
 
-items_dict = load_vdf(DATA_DIR / "items_game.txt")
-tokens_dict = load_vdf(DATA_DIR / "csgo_english.txt")
+async def resolve_name_map(db, provided, table, names) -> dict:
+    """
+    Returns ``provided`` if it already covers ``names``, otherwise merges it over
+    the cached name -> id map of ``table`` (incremental runs only hand over the
+    rows they touched). Rows that predate this run are all in the cache, however
+    early in the run it was loaded; the rows this run wrote are in ``provided``.
+    """
+    if provided is not None and all(name in provided for name in names):
+        return provided
+    await catalog_cache.ensure_fresh(db)
+    return catalog_cache.name_map(table) | (provided or {})
 
 
-def clean_dictionaries(raw_items, raw_tokens):
-    if not raw_items or not raw_tokens:
-        print("Error: Wrong input data")
-        return None, None
+def is_seeded_collection(name):
+    return name is not None and 'Collection' in name and 'X-Ray' not in name
 
-    items_root = raw_items.get('items_game')
-    lang_section = raw_tokens.get('lang', {})
-    tokens_root = lang_section.get('Tokens', {})
-    tokens_clean = {k.lower(): v for k, v in tokens_root.items()}
 
-    return items_root, tokens_clean
+WEAR_TYPES = [
+    "Factory New",
+    "Minimal Wear",
+    "Field-Tested",
+    "Well-Worn",
+    "Battle-Scarred",
+    "Not Painted"
+]
 
+PHASE_KEYWORDS = {
+    'ruby': 'Ruby',
+    'sapphire': 'Sapphire',
+    'blackpearl': 'Black Pearl',
+    'emerald': 'Emerald',
+}
 
-async def seed_rarities():
-    items, tokens = clean_dictionaries(items_dict, tokens_dict)
-    if items is None or tokens is None:
+SKIP_WEAPON_KEYWORDS = [
+    'flashbang',
+    'grenade',
+    'molotov',
+    'decoy',
+    'healthshot',
+    'case'
+]
+
+# Knives and gloves are "★" whatever their paint kit's rarity is.
+STAR_PREFABS = {
+    'melee_unusual',
+    'hands_paintable',
+}
+
+
+def paint_kit_phase(paint_kit: str) -> str | None:
+    """``am_doppler_phase2`` -> ``Phase 2``, ``am_ruby_marbleized`` -> ``Ruby``."""
+    match = re.search(r'phase(\d+)', paint_kit)
+    if match:
+        return f"Phase {match.group(1)}"
+    for keyword, phase in PHASE_KEYWORDS.items():
+        if keyword in paint_kit:
+            return phase
+    return None
+
+
+def build_rarity_rows(game_data: GameData) -> list[dict]:
+    tokens = game_data.token_index
+    rarities_section = game_data.rarities
+    colors_section = game_data.colors
+
+    rows = []
+    for key, data in rarities_section.items():
+        if key == 'unusual':
+            continue
+
+        color_key = data.get('color')
+        real_name = tokens.resolve(data.get('loc_key_weapon'))
+        color_data = colors_section.get(color_key)
+        hex_value = color_data.get('hex_color')
+        tier = data.get('value')
+        rows.append({'name': real_name, 'color_hex': hex_value, 'tier': int(tier) if tier is not None else None})
+
+    gold_color = "#ffd700"
+    rows.append({'name': STAR_RARITY, 'color_hex': gold_color, 'tier': None})
+    return rows
+
+
+def build_wear_type_rows() -> list[dict]:
+    return [{'name': wear} for wear in WEAR_TYPES]
+
+
+def build_weapon_rows(game_data: GameData) -> list[dict]:
+    tokens = game_data.token_index
+    items_section = game_data.items
+    prefabs_section = game_data.prefabs
+
+    raw_tokens = []
+    for _, data in items_section.items():
+        prefab = data.get('prefab')
+
+        if not prefab:
+            continue
+        if 'melee_unusual' not in prefab and 'weapon' not in prefab:
+            continue
+
+        if any(bad in prefab for bad in SKIP_WEAPON_KEYWORDS):
+            continue
+
+        if prefab == 'melee_unusual':
+            raw_tokens.append(data.get('item_name'))
+        else:
+            raw_tokens.append(prefabs_section.get(prefab, {}).get('item_name'))
+
+    return [{'name': weapon} for weapon in tokens.resolve_many(raw_tokens)]
+
+
+def build_collection_rows(game_data: GameData) -> list[dict]:
+    names = game_data.token_index.resolve_many(data.get('name') for data in game_data.item_sets.values())
+    return [{'name': name} for name in names if is_seeded_collection(name)]
+
+
+def build_case_rows(game_data: GameData) -> list[dict]:
+    tokens = game_data.token_index
+
+    rows = []
+    for _, data in game_data.items.items():
+        prefab = data.get('prefab')
+
+        if not prefab:
+            continue
+
+        if prefab == 'weapon_case' or prefab == 'weapon_case_base':
+            case = tokens.resolve(data.get('item_name'))
+
+            if 'case' in case.lower():
+                collection = tokens.resolve(data.get('tags').get('ItemSet').get('tag_text'))
+                rows.append({'name': case, 'collection': collection})
+    return rows
+
+
+def build_skin_rows(game_data: GameData) -> list[dict]:
+    tokens = game_data.token_index
+    item_sets_section = game_data.item_sets
+    paint_kits = game_data.paint_kits
+    items_def = game_data.items
+    prefabs_section = game_data.prefabs
+    paint_kit_rarities = game_data.paint_kits_rarity
+    rarities_section = game_data.rarities
+
+    # Every name is resolved in one batch per section rather than token by token.
+    kits = [(tag, data) for tag, data in paint_kits.items() if data.get('name')]
+    kit_names = tokens.resolve_many(data.get('description_tag') for _, data in kits)
+    pk_map = {
+        data['name'].lower(): (real_name, data.get('wear_remap_min'), data.get('wear_remap_max'), int(tag))
+        for (tag, data), real_name in zip(kits, kit_names)
+        if real_name
+    }
+
+    weapons = []
+    star_weapons = set()
+    for _, data in items_def.items():
+        technical_name = data.get('name')
+        if not technical_name:
+            continue
+        weapon_token_raw = data.get('item_name')
+        if not weapon_token_raw:
+            prefab_tag = data.get('prefab')
+            if prefab_tag:
+                weapon_token_raw = prefabs_section.get(prefab_tag, {}).get('item_name')
+        weapons.append((technical_name.lower(), weapon_token_raw))
+        if data.get('prefab') in STAR_PREFABS:
+            star_weapons.add(technical_name.lower())
+    weapon_tag_map = {
+        technical_name: real_name
+        for (technical_name, _), real_name in zip(weapons, tokens.resolve_many(raw for _, raw in weapons))
+        if real_name
+    }
+
+    rarity_names = tokens.resolve_many(
+        rarities_section.get(data).get('loc_key_weapon') for data in paint_kit_rarities.values()
+    )
+    rarities_map = {key.lower(): rarity for key, rarity in zip(paint_kit_rarities, rarity_names)}
+
+    collection_names = dict(zip(
+        item_sets_section, tokens.resolve_many(data.get('name') for data in item_sets_section.values())
+    ))
+
+    # Some skins (e.g., Doppler, Gamma Doppler) have multiple internal paint kits in
+    # items_game.txt for different "Phases" (Phase 1-4, Emerald, Sapphire, etc.) that
+    # all share one display name. They become one skin row with a variant per paint kit;
+    # the skin's float range covers all of its variants.
+    skins = {}
+    for key, data in item_sets_section.items():
+        collection_name = collection_names[key]
+        if not is_seeded_collection(collection_name):
+            continue
+        items = data.get('items', {})
+        for item_str in items:
+            parts = item_str.split(']')
+            weapon_name_tag = parts[1]
+            paint_kit_tag = parts[0].replace('[','').lower()
+            weapon = weapon_tag_map[weapon_name_tag]
+            skin_name, raw_min, raw_max, paint_index = pk_map[paint_kit_tag]
+            rarity = STAR_RARITY if weapon_name_tag.lower() in star_weapons else rarities_map[paint_kit_tag]
+
+            float_min = float(raw_min) if raw_min is not None else 0.0
+            float_max = float(raw_max) if raw_max is not None else 1.0
+
+            row = skins.setdefault((weapon, skin_name), {
+                'name': skin_name,
+                'weapon': weapon,
+                'collection': collection_name,
+                'rarity': rarity,
+                'float_min': float_min,
+                'float_max': float_max,
+                'variants': {},
+            })
+            row['float_min'] = min(row['float_min'], float_min)
+            row['float_max'] = max(row['float_max'], float_max)
+            row['variants'][paint_index] = {
+                'paint_index': paint_index,
+                'paint_kit': paint_kit_tag,
+                'float_min': float_min,
+                'float_max': float_max,
+            }
+
+    rows = []
+    for row in skins.values():
+        variants = sorted(row['variants'].values(), key=lambda variant: variant['paint_index'])
+        for variant in variants:
+            variant['phase'] = paint_kit_phase(variant['paint_kit']) if len(variants) > 1 else None
+        rows.append(row | {'variants': variants})
+    return rows
+
+
+async def seed_rarities(game_data: GameData, chunk_size=DEFAULT_CHUNK_SIZE, row_filter=None):
+    if not game_data.available:
         print("Wrong input data")
         return
 
-    rarities_section = items.get('rarities', {})
-    colors_section = items.get('colors', {})
-
     async with SessionLocal() as db:
         try:
-            for key, data in rarities_section.items():
-                if key == 'unusual':
-                    continue
-
-                loc_key = data.get('loc_key_weapon').lower()
-                color_key = data.get('color')
-                real_name = tokens.get(loc_key)
-                color_data = colors_section.get(color_key)
-                hex_value = color_data.get('hex_color')
-
-                stmt = select(models.Rarity).filter_by(name=real_name)
-                result = await db.execute(stmt)
-                exists = result.scalar_one_or_none()
-                if not exists:
-                    db.add(models.Rarity(name=real_name, color_hex=hex_value))
-                    print(f"Added: {real_name}")
-
-            gold_name = "★"
-            gold_color = "#ffd700"
-
-            gold_stmt = select(models.Rarity).filter_by(name=gold_name)
-            gold_result = await db.execute(gold_stmt)
-
-            if not gold_result.scalar_one_or_none():
-                db.add(models.Rarity(name=gold_name, color_hex=gold_color))
-                print(f"Added: {gold_name}")
-
-            await db.commit()
-
+            rows = build_rarity_rows(game_data)
+            if row_filter:
+                rows = row_filter('rarities', rows)
+            result = await bulk_upsert(db, models.Rarity, rows, ['name'], ['color_hex', 'tier'], chunk_size)
+            await commit_seed(db, result)
+            print(f"Rarities: {result}")
+            return name_map(result)
         except Exception as e:
             print(f"Error: {e}")
             await db.rollback()
 
-async def seed_wear_types():
+async def seed_wear_types(chunk_size=DEFAULT_CHUNK_SIZE, row_filter=None):
     async with SessionLocal() as db:
         try:
-            wears = [
-                "Factory New",
-                "Minimal Wear",
-                "Field-Tested",
-                "Well-Worn",
-                "Battle-Scarred",
-                "Not Painted"
-            ]
-            for wear in wears:
-                stmt = select(models.WearType).filter_by(name=wear)
-                result = await db.execute(stmt)
-                exists = result.scalar_one_or_none()
-                if not exists:
-                    db.add(models.WearType(name=wear))
-                    print(f"Added: {wear}")
-            await db.commit()
+            rows = build_wear_type_rows()
+            if row_filter:
+                rows = row_filter('wear_types', rows)
+            result = await bulk_upsert(db, models.WearType, rows, ['name'], chunk_size=chunk_size)
+            await commit_seed(db, result)
+            print(f"Wear types: {result}")
+            return name_map(result)
         except Exception as e:
             print(f"Error: {e}")
             await db.rollback()
 
-async def seed_weapons():
+async def seed_weapons(game_data: GameData, chunk_size=DEFAULT_CHUNK_SIZE, row_filter=None):
+    if not game_data.available:
+        print("Wrong input data")
+        return
+
     async with SessionLocal() as db:
-        items, tokens = clean_dictionaries(items_dict, tokens_dict)
-        if items is None or tokens is None:
-            print("Wrong input data")
-            return
-        items_section = items.get('items', {})
-        prefabs_section = items.get('prefabs', {})
-
-        SKIP_KEYWORDS = [
-            'flashbang',
-            'grenade',
-            'molotov',
-            'decoy',
-            'healthshot',
-            'case'
-        ]
         try:
-            for key, data in items_section.items():
-                prefab = data.get('prefab')
-
-                if not prefab:
-                    continue
-                if 'melee_unusual' not in prefab and 'weapon' not in prefab:
-                    continue
-
-                if any(bad in prefab for bad in SKIP_KEYWORDS):
-                    continue
-
-                if prefab == 'melee_unusual':
-                    raw_token = data.get('item_name')
-                else:
-                    raw_token = prefabs_section.get(prefab, {}).get('item_name')
-
-                clean_tag = raw_token.replace("#", "").lower()
-                weapon = tokens.get(clean_tag)
-                stmt = select(models.Weapon).filter_by(name=weapon)
-                result = await db.execute(stmt)
-                exists = result.scalar_one_or_none()
-                if not exists:
-                    db.add(models.Weapon(name=weapon))
-                    print(f"Added: {weapon}")
-
-            await db.commit()
+            rows = build_weapon_rows(game_data)
+            if row_filter:
+                rows = row_filter('weapons', rows)
+            result = await bulk_upsert(db, models.Weapon, rows, ['name'], chunk_size=chunk_size)
+            await commit_seed(db, result)
+            print(f"Weapons: {result}")
+            return name_map(result)
         except Exception as e:
             print(f"Error: {e}")
             await db.rollback()
 
-async def seed_collections():
+async def seed_collections(game_data: GameData, chunk_size=DEFAULT_CHUNK_SIZE, row_filter=None):
+    if not game_data.available:
+        print("Wrong input data")
+        return
+
     async with SessionLocal() as db:
-        items, tokens = clean_dictionaries(items_dict, tokens_dict)
-        if items is None or tokens is None:
-            print("Wrong input data")
-            return
-        collections_section = items.get('item_sets',{})
         try:
-            for key, data in collections_section.items():
-                name_token_raw = data.get('name')
-                name_token = name_token_raw.replace("#", "").lower()
-                name = tokens.get(name_token)
-                if 'Collection' not in name or 'X-Ray' in name:
-                    continue
-                stmt = select(models.Collection).filter_by(name=name)
-                result = await db.execute(stmt)
-                exists = result.scalar_one_or_none()
-                if not exists:
-                    db.add(models.Collection(name=name))
-                    print(f"Added: {name}")
-            await db.commit()
+            rows = build_collection_rows(game_data)
+            if row_filter:
+                rows = row_filter('collections', rows)
+            result = await bulk_upsert(db, models.Collection, rows, ['name'], chunk_size=chunk_size)
+            await commit_seed(db, result)
+            print(f"Collections: {result}")
+            return name_map(result)
         except Exception as e:
             print(f"Error: {e}")
             await db.rollback()
 
 
-async def seed_cases():
-    async with SessionLocal() as db:
-        items, tokens = clean_dictionaries(items_dict, tokens_dict)
-        if items is None or tokens is None:
-            print("Wrong input data")
-            return
-        items_section = items.get('items', {})
+async def seed_cases(game_data: GameData, chunk_size=DEFAULT_CHUNK_SIZE, row_filter=None, collections_map=None):
+    if not game_data.available:
+        print("Wrong input data")
+        return
 
+    async with SessionLocal() as db:
         try:
-            for key, data in items_section.items():
-                prefab = data.get('prefab')
-
-                if not prefab:
+            case_rows = build_case_rows(game_data)
+            if row_filter:
+                case_rows = row_filter('cases', case_rows)
+            db_collections_map = await resolve_name_map(
+                db, collections_map, 'collections', {row['collection'] for row in case_rows},
+            )
+
+            rows = []
+            for row in case_rows:
+                collection_id = db_collections_map.get(row['collection'])
+                if not collection_id:
+                    print(f"Warning: Collection '{row['collection']}' not found for case '{row['name']}'")
                     continue
+                rows.append({'name': row['name'], 'collection_id': collection_id})
 
-                if prefab == 'weapon_case' or prefab == 'weapon_case_base':
-                    raw_token = data.get('item_name')
-                    clean_tag = raw_token.replace("#", "").lower()
-                    case = tokens.get(clean_tag)
-
-                    if 'case' in case.lower():
-                        raw_collection_token = data.get('tags').get('ItemSet').get('tag_text')
-                        clean_collection_tag = raw_collection_token.replace("#", "").lower()
-                        collection = tokens.get(clean_collection_tag)
-                        stmt = select(models.Case).filter_by(name=case)
-                        result = await db.execute(stmt)
-                        exists = result.scalar_one_or_none()
-                        if not exists:
-                            coll_stmt = select(models.Collection).filter_by(name=collection)
-                            result = await db.execute(coll_stmt)
-                            collection_obj = result.scalar_one_or_none()
-                            if not collection_obj:
-                                print(f"Warning: Collection '{collection}' not found for case '{case}'")
-                            db.add(models.Case(name=case, collection=collection_obj))
-                            print(f"Added: {case}")
-
-            await db.commit()
+            result = await bulk_upsert(db, models.Case, rows, ['name'], ['collection_id'], chunk_size)
+            await commit_seed(db, result)
+            print(f"Cases: {result}")
+            return name_map(result)
         except Exception as e:
             print(f"Error: {e}")
             await db.rollback()
 
-async def seed_skins():
-    count=0
-    items, tokens = clean_dictionaries(items_dict, tokens_dict)
-    if items is None or tokens is None:
+async def seed_skins(game_data: GameData, chunk_size=DEFAULT_CHUNK_SIZE, row_filter=None,
+                     collections_map=None, weapons_map=None, rarities_map=None):
+    if not game_data.available:
         return
-    item_sets_section = items.get('item_sets', {})
-    paint_kits = items.get('paint_kits', {})
-    items_def = items.get('items', {})
-    prefabs_section = items.get('prefabs', {})
-    paint_kit_rarities = items.get('paint_kits_rarity', {})
-    rarities_section = items.get('rarities', {})
 
     async with SessionLocal() as db:
         try:
-            result_coll = await db.execute(select(models.Collection))
-            db_collections_map = {c.name: c.collection_id for c in result_coll.scalars().all()}
+            skin_rows = build_skin_rows(game_data)
+            if row_filter:
+                skin_rows = row_filter('skins', skin_rows)
+
+            db_collections_map = await resolve_name_map(
+                db, collections_map, 'collections', {row['collection'] for row in skin_rows},
+            )
+            db_weapons_map = await resolve_name_map(
+                db, weapons_map, 'weapons', {row['weapon'] for row in skin_rows},
+            )
+            db_rarities_map = await resolve_name_map(
+                db, rarities_map, 'rarities', {row['rarity'] for row in skin_rows},
+            )
+
+            rows = [
+                {
+                    'name': row['name'],
+                    'float_min': row['float_min'],
+                    'float_max': row['float_max'],
+                    'collection_id': db_collections_map[row['collection']],
+                    'weapon_id': db_weapons_map[row['weapon']],
+                    'rarity_id': db_rarities_map[row['rarity']],
+                }
+                for row in skin_rows
+            ]
 
-            result_weap = await db.execute(select(models.Weapon))
-            db_weapons_map = {w.name: w.weapon_id for w in result_weap.scalars().all()}
+            result = await bulk_upsert(
+                db, models.Skin, rows, ['name', 'weapon_id'],
+                ['float_min', 'float_max', 'collection_id', 'rarity_id'], chunk_size,
+            )
 
-            result_rar = await db.execute(select(models.Rarity))
-            db_rarities_map = {r.name: r.rarity_id for r in result_rar.scalars().all()}
+            variant_rows = [
+                variant | {'skin_id': result.ids[(row['name'], db_weapons_map[row['weapon']])]}
+                for row in skin_rows
+                for variant in row['variants']
+            ]
+            variants = await bulk_upsert(
+                db, models.PaintKitVariant, variant_rows, ['skin_id', 'paint_index'],
+                ['paint_kit', 'phase', 'float_min', 'float_max'], chunk_size,
+            )
+            await commit_seed(db, result, variants)
+            print(f"Skins: {result}")
+            print(f"Paint kit variants: {variants}")
+            return result.ids
+        except Exception as e:
+            print(f"Error: {e}")
+            await db.rollback()
 
-            pk_map = {}
-            for tag, data in paint_kits.items():
-                internal_name = data.get('name')
-                float_min = data.get('wear_remap_min')
-                float_max = data.get('wear_remap_max')
-                if not internal_name:
-                    continue
-                desc_tag = data.get('description_tag')
-                if desc_tag:
-                    clean = desc_tag.replace('#', '').lower()
-                    real_name = tokens.get(clean)
-                    if real_name:
-                        pk_map[internal_name.lower()] = real_name, float_min, float_max
-
-            weapon_tag_map = {}
-            for key, data in items_def.items():
-                technical_name = data.get('name')
-                if not technical_name:
-                    continue
-                weapon_token_raw = data.get('item_name')
-                if not weapon_token_raw:
-                    prefab_tag = data.get('prefab')
-                    if prefab_tag:
-                        weapon_token_raw = prefabs_section.get(prefab_tag, {}).get('item_name')
-                if weapon_token_raw:
-                    clean_token = weapon_token_raw.replace("#", "").lower()
-                    real_name = tokens.get(clean_token)
-                    if real_name:
-                        weapon_tag_map[technical_name.lower()] = real_name
-
-            rarities_map = {}
-            for key, data in paint_kit_rarities.items():
-                paint_kit = key.lower()
-                rarity_raw = rarities_section.get(data).get('loc_key_weapon').lower()
-                rarity = tokens.get(rarity_raw)
-                rarities_map[paint_kit] = rarity
-
-            # Some skins (e.g., Doppler, Gamma Doppler, Tiger Tooth) have multiple internal entries
-            # in items_game.txt for different "Phases" (Phase 1-4, Emerald, Sapphire, etc.).
-            # However, they all map to the SAME display name (e.g., "Gamma Doppler").
-            # This set acts as a runtime cache to track (weapon_id, skin_name) pairs we have already processed.
-            # It prevents the script from trying to insert the same skin name for the same weapon multiple times,
-            # which would cause a database unique constraint violation crash.
-
-            processed_skins = set()
-            count = 0
-            for key, data in item_sets_section.items():
-                item_set_token_raw = data.get('name')
-                item_set_token = item_set_token_raw.replace("#", "").lower()
-                collection_name = tokens.get(item_set_token)
-                if collection_name not in db_collections_map:
-                    continue
-                items = data.get('items', {})
-                for item_str in items:
-                    parts = item_str.split(']')
-                    weapon_name_tag = parts[1]
-                    paint_kit_tag = parts[0].replace('[','').lower()
-                    weapon = weapon_tag_map[weapon_name_tag]
-                    skin_name = pk_map[paint_kit_tag][0]
-                    rarity = rarities_map[paint_kit_tag]
-
-                    raw_min = pk_map[paint_kit_tag][1]
-                    raw_max = pk_map[paint_kit_tag][2]
-                    float_min = float(raw_min) if raw_min is not None else 0.0
-                    float_max = float(raw_max) if raw_max is not None else 1.0
-
-                    collection_id = db_collections_map[collection_name]
-                    weapon_id = db_weapons_map[weapon]
-                    rarity_id = db_rarities_map[rarity]
-
-                    if (weapon_id, skin_name) in processed_skins:
-                        continue
-                    processed_skins.add((weapon_id, skin_name))
-                    stmt = select(models.Skin).filter_by(name=skin_name, weapon_id=weapon_id)
-                    result = await db.execute(stmt)
-                    exists = result.scalar_one_or_none()
-                    if not exists:
-                        new_skin = models.Skin(name=skin_name, float_min=float_min, float_max=float_max, collection_id=collection_id, weapon_id = weapon_id, rarity_id = rarity_id)
-                        db.add(new_skin)
-                        print(f"Added: {weapon} | {skin_name}")
-                        count+=1
+
+async def rebuild_derived(label, rebuild, skin_ids, full):
+    """
+    Regenerates a table derived from the skins. Incremental runs only redo the
+    skins they touched unless ``full`` says something all skins depend on changed.
+    """
+    ids = None if full else list(skin_ids.values())
+    if ids == []:
+        print(f"{label}: up to date")
+        return 0
+
+    async with SessionLocal() as db:
+        try:
+            count = await rebuild(db, ids)
+            if count:
+                await bump_catalog_version(db)
             await db.commit()
-            print(f"Added: {count} Skins")
+            print(f"{label}: {count} rebuilt")
+            return count
         except Exception as e:
             print(f"Error: {e}")
             await db.rollback()
 
 
-async def main():
-    await seed_rarities()
-    await seed_wear_types()
-    await seed_weapons()
-    await seed_collections()
-    await seed_cases()
-    await seed_skins()
+async def seed_search_documents(row_filter=None, skin_ids=None, wear_types_map=None):
+    full = not row_filter or bool(wear_types_map)
+    return await rebuild_derived("Search documents", rebuild_search_documents, skin_ids, full)
+
+
+async def seed_market_names(row_filter=None, skin_ids=None, wear_types_map=None, cases_map=None):
+    # A new case makes its whole collection StatTrak-eligible.
+    full = not row_filter or bool(wear_types_map) or bool(cases_map)
+    return await rebuild_derived("Market hash names", rebuild_market_names, skin_ids, full)
+
+
+def build_stages(game_data: GameData, chunk_size=DEFAULT_CHUNK_SIZE, row_filter=None) -> list[Stage]:
+    return [
+        Stage('rarities', lambda: seed_rarities(game_data, chunk_size, row_filter)),
+        Stage('wear_types', lambda: seed_wear_types(chunk_size, row_filter)),
+        Stage('weapons', lambda: seed_weapons(game_data, chunk_size, row_filter)),
+        Stage('collections', lambda: seed_collections(game_data, chunk_size, row_filter)),
+        Stage('cases', lambda **maps: seed_cases(game_data, chunk_size, row_filter, **maps),
+              {'collections': 'collections_map'}),
+        Stage('skins', lambda **maps: seed_skins(game_data, chunk_size, row_filter, **maps),
+              {'collections': 'collections_map', 'weapons': 'weapons_map', 'rarities': 'rarities_map'}),
+        Stage('search', lambda **maps: seed_search_documents(row_filter, **maps),
+              {'skins': 'skin_ids', 'wear_types': 'wear_types_map'}),
+        Stage('market_names', lambda **maps: seed_market_names(row_filter, **maps),
+              {'skins': 'skin_ids', 'wear_types': 'wear_types_map', 'cases': 'cases_map'}),
+    ]
+
+
+async def main(game_data: GameData, chunk_size=DEFAULT_CHUNK_SIZE, incremental: IncrementalSeed | None = None,
+               db_metrics=False):
+    # Load once up front so the concurrent stages don't all race to parse the VDF files.
+    if not game_data.available:
+        print("Wrong input data")
+        return
+    await use_pool_profile('seed')
+    if incremental:
+        incremental.diff_sources(game_data)
+
+    stages = build_stages(game_data, chunk_size, incremental)
+    results, timings = await run_pipeline(stages)
+    print_timings(timings)
+
+    if incremental:
+        incremental.commit(results, stages)
+        incremental.write_changelog(CHANGELOG_PATH)
+        print(f"Changelog written to {CHANGELOG_PATH}")
+    if db_metrics:
+        print(render_metrics(), end="")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed reference tables from items_game.txt")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per INSERT ... ON CONFLICT statement")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="re-parse the VDF files even if the parse cache is up to date")
+    parser.add_argument("--cache-report", action="store_true",
+                        help="compare cold and warm game data loads and exit")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only write rows that were added or changed since the last incremental run")
+    parser.add_argument("--full", action="store_true",
+                        help="with --incremental: ignore the stored fingerprints and reseed everything")
+    parser.add_argument("--db-metrics", action="store_true",
+                        help="print connection pool and query timings in Prometheus text format at the end")
+    args = parser.parse_args()
+
+    game_data = get_game_data()
+    if args.cache_report:
+        cache_timing_report(game_data)
+        sys.exit(0)
+    if args.rebuild_cache:
+        game_data.load(rebuild=True)
+    incremental = IncrementalSeed(full=args.full) if args.incremental else None
+    asyncio.run(main(game_data, args.chunk_size, incremental, args.db_metrics))
@@ -0,0 +1,115 @@
+import random
+from pathlib import Path
+
+import vdf
+
+from app.scripts.game_data import GameData
+
+RARITIES = ['common', 'uncommon', 'rare', 'mythical', 'legendary', 'ancient']
+WEAPONS = {
+    '1': ('weapon_deagle', 'Desert Eagle'),
+    '4': ('weapon_glock', 'Glock-18'),
+    '7': ('weapon_ak47', 'AK-47'),
+    '9': ('weapon_awp', 'AWP'),
+    '16': ('weapon_m4a1', 'M4A4'),
+    '60': ('weapon_m4a1_silencer', 'M4A1-S'),
+    '61': ('weapon_usp_silencer', 'USP-S'),
+    '19': ('weapon_p90', 'P90'),
+}
+KNIFE = ('507', 'weapon_knife_karambit', 'Karambit')
+DOPPLER_PHASES = ['phase1', 'phase2', 'phase3', 'phase4', 'ruby', 'sapphire', 'blackpearl']
+SYLLABLES = ['ka', 'ro', 'mi', 'ze', 'lu', 'dra', 'fen', 'tor', 'vyx', 'quo', 'bel', 'sha', 'nim', 'pax',
+             'gri', 'hol', 'ute', 'cer', 'dun', 'wal']
+FIRST_CASE_ITEM = 10_000
+FIRST_PAINT_KIT = 100
+
+
+def _word(rng: random.Random) -> str:
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+
+
+def generate_game_data(paint_kits: int, item_sets: int, seed: int = 0, doppler_every: int = 25) -> tuple[dict, dict]:
+    """
+    ``items_game.txt`` and ``csgo_english.txt`` trees with the structure the
+    seeders read: ``paint_kits`` finishes spread over ``item_sets`` collections,
+    each collection with every rarity tier and a case, and every
+    ``doppler_every``-th collection with a phased Doppler knife finish.
+    """
+    rng = random.Random(seed)
+    tokens = {f'Rarity_{rarity}_Weapon': f'{rarity.title()} Grade' for rarity in RARITIES}
+    tokens['Rarity_Unusual'] = '★'
+    items = {}
+    prefabs = {'weapon_case': {'item_name': '#CSGO_Crate'}}
+    for def_index, (name, display) in WEAPONS.items():
+        items[def_index] = {'name': name, 'prefab': f'{name}_prefab'}
+        prefabs[f'{name}_prefab'] = {'item_name': f'#SFUI_WPNHUD_{name}'}
+        tokens[f'SFUI_WPNHUD_{name}'] = display
+    knife_index, knife_name, knife_display = KNIFE
+    items[knife_index] = {'name': knife_name, 'prefab': 'melee_unusual', 'item_name': f'#SFUI_WPNHUD_{knife_name}'}
+    tokens[f'SFUI_WPNHUD_{knife_name}'] = knife_display
+
+    kits, kit_rarities, sets = {}, {}, {}
+    weapon_names = [name for name, _ in WEAPONS.values()]
+    paint_index = FIRST_PAINT_KIT
+
+    def add_kit(name: str, token: str, rarity: str, float_min: float, float_max: float):
+        nonlocal paint_index
+        kits[str(paint_index)] = {
+            'name': name, 'description_tag': f'#PaintKit_{token}',
+            'wear_remap_min': f'{float_min:.2f}', 'wear_remap_max': f'{float_max:.2f}',
+        }
+        kit_rarities[name] = rarity
+        paint_index += 1
+
+    per_set, extra = divmod(paint_kits, item_sets)
+    for s in range(item_sets):
+        set_items = {}
+        for j in range(per_set + (s < extra)):
+            name = f'cu_synthetic_{s}_{j}'
+            tokens[f'PaintKit_{name}'] = f'{_word(rng)} {_word(rng)} {s}-{j}'
+            float_min = rng.choice([0.0, 0.0, 0.02, 0.06])
+            add_kit(name, name, RARITIES[j % len(RARITIES)], float_min, rng.choice([0.5, 0.7, 0.8, 1.0]))
+            set_items[f'[{name}]{weapon_names[(s + j) % len(weapon_names)]}'] = '1'
+        if doppler_every and s % doppler_every == 0:
+            token = f'am_doppler_{s}'
+            tokens[f'PaintKit_{token}'] = f'Doppler {s}'
+            for phase in DOPPLER_PHASES:
+                name = f'{token}_{phase}'
+                add_kit(name, token, RARITIES[-1], 0.0, 0.08)
+                set_items[f'[{name}]{knife_name}'] = '1'
+        set_name = f'set_synthetic_{s}'
+        tokens[f'CSGO_{set_name}'] = f'The {_word(rng)} {s} Collection'
+        sets[set_name] = {'name': f'#CSGO_{set_name}', 'items': set_items}
+        items[str(FIRST_CASE_ITEM + s)] = {
+            'name': f'crate_synthetic_{s}', 'prefab': 'weapon_case', 'item_name': f'#CSGO_crate_synthetic_{s}',
+            'tags': {'ItemSet': {'tag_value': set_name, 'tag_text': f'#CSGO_{set_name}'}},
+        }
+        tokens[f'CSGO_crate_synthetic_{s}'] = f'Synthetic {s} Case'
+
+    items_game = {'items_game': {
+        'rarities': {
+            rarity: {'value': str(i + 1), 'loc_key_weapon': f'Rarity_{rarity}_Weapon', 'color': f'desc_{rarity}'}
+            for i, rarity in enumerate(RARITIES)
+        } | {'unusual': {'value': '99', 'loc_key_weapon': 'Rarity_Unusual', 'color': 'desc_unusual'}},
+        'colors': {
+            f'desc_{rarity}': {'hex_color': f'#{rng.randrange(0x1000000):06x}'} for rarity in RARITIES + ['unusual']
+        },
+        'prefabs': prefabs,
+        'items': items,
+        'item_sets': sets,
+        'paint_kits': kits,
+        'paint_kits_rarity': kit_rarities,
+    }}
+    return items_game, {'lang': {'Language': 'English', 'Tokens': tokens}}
+
+
+def write_game_data(directory: Path, paint_kits: int, item_sets: int, seed: int = 0) -> GameData:
+    """Writes both files into ``directory`` (UTF-16 tokens, like the game ships them) and returns their ``GameData``."""
+    directory.mkdir(parents=True, exist_ok=True)
+    items_game, tokens = generate_game_data(paint_kits, item_sets, seed)
+    items_path, tokens_path = directory / "items_game.txt", directory / "csgo_english.txt"
+    with open(items_path, 'w', encoding='utf-8') as f:
+        vdf.dump(items_game, f, pretty=True)
+    with open(tokens_path, 'w', encoding='utf-16') as f:
+        vdf.dump(tokens, f, pretty=True)
+    return GameData(items_path, tokens_path, directory / ".cache" / "game_data.pickle")
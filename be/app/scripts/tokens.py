@@ -0,0 +1,122 @@
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+from app.scripts.parse_cache import load_cached
+from app.scripts.vdf_stream import load_file
+
+DEFAULT_LOCALE = "english"
+LOCALE_FILE_PREFIX = "csgo_"
+
+
+def normalize_token(token: str) -> str:
+    """``#SFUI_WPNHUD_AK47`` -> ``sfui_wpnhud_ak47``, the form every token is indexed under."""
+    return token.replace('#', '').lower()
+
+
+def normalize_tokens(raw_tokens: dict | None) -> dict[str, str] | None:
+    """The ``lang/Tokens`` section of a parsed language file, keyed by normalized token."""
+    if not raw_tokens:
+        return None
+    return {normalize_token(key): value for key, value in raw_tokens.get('lang', {}).get('Tokens', {}).items()}
+
+
+def locale_of(path: Path) -> str:
+    """``csgo_schinese.txt`` -> ``schinese``."""
+    return path.stem.removeprefix(LOCALE_FILE_PREFIX)
+
+
+def discover_locale_paths(directory: Path) -> list[Path]:
+    return sorted(
+        path for path in directory.glob(f"{LOCALE_FILE_PREFIX}*.txt") if locale_of(path) != DEFAULT_LOCALE
+    )
+
+
+def parse_locale(path: Path, cache_path: Path, rebuild: bool = False) -> dict[str, str] | None:
+    def parse():
+        try:
+            return normalize_tokens(load_file(path))
+        except Exception as e:
+            print(f"Error: {path}: {e}")
+            return None
+
+    if not path.exists():
+        return None
+    return load_cached([path], cache_path, parse, rebuild)
+
+
+def load_locales(paths: list[Path], cache_dir: Path, processes: int | None = None,
+                 rebuild: bool = False) -> dict[str, dict[str, str]]:
+    """
+    Normalized tokens of every language file, each served from its own parse
+    cache. Several files are parsed side by side in a process pool unless
+    ``processes`` is 1.
+    """
+    jobs = [(path, cache_dir / f"tokens_{locale_of(path)}.pickle", rebuild) for path in paths]
+    if len(jobs) > 1 and processes != 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            tables = list(pool.map(parse_locale, *zip(*jobs)))
+    else:
+        tables = [parse_locale(*job) for job in jobs]
+    return {locale_of(path): table for path, table in zip(paths, tables) if table is not None}
+
+
+class TokenIndex:
+    """
+    Localized strings by normalized token, per locale. Other locales are chained
+    over the default one rather than copied into it, so a token a translation
+    lacks still resolves (to the default string) without a copy of the default
+    table per locale.
+    """
+
+    def __init__(self, locales: dict[str, dict[str, str]], default_locale: str = DEFAULT_LOCALE):
+        self.default_locale = default_locale
+        default = locales.get(default_locale, {})
+        self.tables: dict[str, Mapping[str, str]] = {
+            locale: table if locale == default_locale else ChainMap(table, default)
+            for locale, table in locales.items()
+        }
+        self.tables.setdefault(default_locale, default)
+
+    @property
+    def locales(self) -> list[str]:
+        return list(self.tables)
+
+    def _table(self, locale: str | None) -> Mapping[str, str]:
+        table = self.tables.get(locale or self.default_locale)
+        if table is None:
+            raise KeyError(f"locale '{locale}' is not loaded")
+        return table
+
+    def _getter(self, locale: str | None) -> Callable[[str], str | None]:
+        """``get`` of the locale's table; for a chained one, two dict lookups instead of ``ChainMap.get``."""
+        table = self._table(locale)
+        if not isinstance(table, ChainMap):
+            return table.get
+        get, fallback = table.maps[0].get, table.maps[1].get
+
+        def lookup(key: str) -> str | None:
+            value = get(key)
+            return fallback(key) if value is None else value
+        return lookup
+
+    def resolve(self, token: str | None, locale: str | None = None) -> str | None:
+        if not token:
+            return None
+        return self._getter(locale)(normalize_token(token))
+
+    def resolve_many(self, tokens: Iterable[str | None], locale: str | None = None) -> list[str | None]:
+        get = self._getter(locale)
+        # normalize_token inlined: this runs once per paint kit.
+        return [get(token.replace('#', '').lower()) if token else None for token in tokens]
+
+    def resolve_localized(self, tokens: Iterable[str | None],
+                          locales: list[str] | None = None) -> dict[str, list[str | None]]:
+        """Every token in every locale (all loaded ones by default), normalizing each token once."""
+        keys = [normalize_token(token) if token else None for token in tokens]
+        result = {}
+        for locale in locales or self.locales:
+            get = self._getter(locale)
+            result[locale] = [get(key) if key is not None else None for key in keys]
+        return result
@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import select
+
+import app.models as models
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.tradeup_service import InvalidTradeUp, TradeUpCatalog, TradeUpInput
+
+
+async def skin_names(db) -> dict[uuid.UUID, str]:
+    stmt = select(models.Skin.skin_id, models.Weapon.name, models.Skin.name).join(models.Weapon)
+    return {skin_id: f"{weapon} | {skin}" for skin_id, weapon, skin in await db.execute(stmt)}
+
+
+async def main(args):
+    async with SessionLocal() as db:
+        start = time.perf_counter()
+        catalog = await TradeUpCatalog.load(db, args.currency)
+        names = await skin_names(db)
+    print(f"Loaded {len(catalog.skins)} skins and {len(catalog.prices)} prices in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if args.evaluate:
+        with open(args.evaluate, encoding='utf-8') as f:
+            inputs = [TradeUpInput(uuid.UUID(item['skin_id']), float(item['float_value']),
+                                   bool(item.get('stattrack', False))) for item in json.load(f)]
+        try:
+            result = catalog.evaluate(inputs)
+        except InvalidTradeUp as e:
+            raise SystemExit(f"Invalid trade-up: {e}") from e
+        for outcome in sorted(result.outcomes, key=lambda o: -o.probability):
+            price = f"{outcome.price:10.2f}" if outcome.price is not None else "         -"
+            print(f"  {outcome.probability:6.1%}  {names[outcome.skin_id]:<40} "
+                  f"{outcome.float_value:.4f} {outcome.wear:<15}{price}")
+        print(f"Cost {result.inputs_cost:.2f}, EV {result.expected_value:.2f}, profit {result.profit:.2f} "
+              f"{args.currency} ({result.unpriced} unpriced)")
+        return
+
+    start = time.perf_counter()
+    candidates = catalog.search(args.min_profit, args.limit, args.tier, (False,) if args.no_stattrack else (False, True))
+    print(f"Search took {(time.perf_counter() - start) * 1000:.0f} ms")
+    for candidate in candidates:
+        inputs = ", ".join(f"{count}x {names[skin_id]} ({wear})" for skin_id, wear, count in candidate.inputs)
+        print(f"{candidate.profit:10.2f} {args.currency}  EV {candidate.expected_value:.2f} / cost "
+              f"{candidate.inputs_cost:.2f}  {'StatTrak™ ' if candidate.stattrack else ''}tier {candidate.tier}: {inputs}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate a trade-up contract or search the catalog for profitable ones")
+    parser.add_argument("--evaluate", metavar="FILE",
+                        help="JSON list of ten {skin_id, float_value, stattrack} inputs to evaluate")
+    parser.add_argument("--currency", default=settings.CANONICAL_CURRENCY)
+    parser.add_argument("--min-profit", type=float, default=0.0)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--tier", type=int, action="append", help="input rarity tier(s) to search")
+    parser.add_argument("--no-stattrack", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,151 @@
+import re
+import mmap
+import codecs
+from pathlib import Path
+from typing import Callable, Iterator
+
+# One alternative per token kind; whitespace between tokens is skipped by search().
+# A key and a quoted value on the same line come back as a single match.
+_QUOTED = r'"((?:\\.|[^\\"])*+)"'
+_TOKEN = _QUOTED + r'(?:[ \t]++' + _QUOTED + r')?|(\{)|(\})|(//[^\n]*+)|(\[[^\]\n]*+\])|([^\s{}"]++)'
+# Everything up to and including the next brace that is not inside a string or comment.
+_SKIP = r'(?:[^{}"/]++|"(?:\\.|[^\\"])*+"|//[^\n]*+|/)*+([{}])'
+_TOKEN_BYTES, _TOKEN_TEXT = re.compile(_TOKEN.encode()), re.compile(_TOKEN)
+_SKIP_BYTES, _SKIP_TEXT = re.compile(_SKIP.encode()), re.compile(_SKIP)
+_FIRST, _SECOND, _OPEN, _CLOSE, _COMMENT, _CONDITION, _BARE = range(1, 8)
+
+_UNESCAPE = {'n': '\n', 't': '\t', 'v': '\v', 'b': '\b', 'r': '\r', 'f': '\f', 'a': '\a',
+             '\\': '\\', '?': '?', '"': '"', "'": "'"}
+_ESCAPE_PATTERN = re.compile(r'\\([ntvbrfa\\?"\'])')
+
+# Selector: receives the key path of a block ("items_game", "paint_kits") and says whether to descend into it.
+Selector = Callable[[tuple[str, ...]], bool]
+
+
+def detect_encoding(head: bytes) -> tuple[str, int]:
+    """Encoding and BOM length of a VDF file, from its first bytes."""
+    if head.startswith(codecs.BOM_UTF16_LE):
+        return 'utf-16-le', 2
+    if head.startswith(codecs.BOM_UTF16_BE):
+        return 'utf-16-be', 2
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8', 3
+    if len(head) >= 2 and head[1] == 0:
+        return 'utf-16-le', 0
+    if len(head) >= 2 and head[0] == 0:
+        return 'utf-16-be', 0
+    return 'utf-8', 0
+
+
+def _unescape(text: str) -> str:
+    return _ESCAPE_PATTERN.sub(lambda m: _UNESCAPE[m.group(1)], text) if '\\' in text else text
+
+
+def iter_events(buffer, selector: Selector | None = None, encoding: str = 'utf-8', start: int = 0) -> Iterator[tuple]:
+    """
+    Tokenizes a KeyValues buffer and yields ``('start', key)``, ``('value', key, value)``
+    and ``('end',)`` events. ``buffer`` is ``bytes``/``mmap`` (decoded per token with
+    ``encoding``) or ``str``. Blocks rejected by ``selector`` are skipped brace to
+    brace without tokenizing or decoding anything inside them.
+    """
+    text = isinstance(buffer, str)
+    search = (_TOKEN_TEXT if text else _TOKEN_BYTES).search
+    skip = (_SKIP_TEXT if text else _SKIP_BYTES).match
+    open_brace = '{' if text else b'{'
+    path: list[str] = []
+    key = None
+    pos = start
+
+    def string(raw) -> str:
+        return _unescape(raw if text else raw.decode(encoding))
+
+    while (match := search(buffer, pos)) is not None:
+        pos = match.end()
+        kind = match.lastindex
+
+        if kind == _FIRST or kind == _SECOND or kind == _BARE:
+            first = string(match.group(kind if kind == _BARE else _FIRST))
+            if kind != _SECOND:
+                if key is None:
+                    key = first
+                else:
+                    yield ('value', key, first)
+                    key = None
+            elif key is None:
+                yield ('value', first, string(match.group(_SECOND)))
+            else:
+                # A dangling key from the previous line took the first string as its value.
+                yield ('value', key, first)
+                key = string(match.group(_SECOND))
+        elif kind == _OPEN:
+            if key is None:
+                raise SyntaxError(f"vdf: block without a key at offset {match.start()}")
+            if selector is not None and not selector((*path, key)):
+                depth = 1
+                while depth:
+                    brace = skip(buffer, pos)
+                    if brace is None:
+                        raise SyntaxError(f"vdf: unclosed block '{key}'")
+                    pos = brace.end()
+                    depth += 1 if brace.group(1) == open_brace else -1
+            else:
+                path.append(key)
+                yield ('start', key)
+            key = None
+        elif kind == _CLOSE:
+            if key is not None:
+                raise SyntaxError(f"vdf: key '{key}' without a value at offset {match.start()}")
+            if not path:
+                raise SyntaxError(f"vdf: one too many closing brackets at offset {match.start()}")
+            path.pop()
+            yield ('end',)
+
+    if path or key is not None:
+        raise SyntaxError("vdf: unclosed block or dangling key at end of file")
+
+
+def build_tree(events: Iterator[tuple]) -> dict:
+    """
+    Builds nested dicts from ``iter_events`` with ``vdf.load``'s default
+    semantics: repeated blocks merge into one dict, a repeated value overwrites.
+    """
+    stack = [{}]
+    for event in events:
+        kind = event[0]
+        if kind == 'start':
+            parent = stack[-1]
+            child = parent.get(event[1])
+            if not isinstance(child, dict):
+                child = parent[event[1]] = {}
+            stack.append(child)
+        elif kind == 'value':
+            stack[-1][event[1]] = event[2]
+        else:
+            stack.pop()
+    return stack[0]
+
+
+def section_selector(sections: set[str] | None) -> Selector | None:
+    """Keeps the root block and, under it, only the named sections (everything if ``None``)."""
+    if sections is None:
+        return None
+    return lambda path: len(path) != 2 or path[1] in sections
+
+
+def load_file(path: Path, sections: set[str] | None = None) -> dict:
+    """
+    Parses a VDF file through a memory map. UTF-8 files are tokenized straight
+    from the map and only the kept strings are decoded; UTF-16 files are decoded
+    once as a whole. With ``sections`` only those top-level sections are built.
+    """
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            encoding, bom = detect_encoding(buffer[:4])
+            selector = section_selector(sections)
+            if encoding == 'utf-8':
+                return build_tree(iter_events(buffer, selector, encoding, start=bom))
+            with memoryview(buffer) as view:
+                text = str(view[bom:], encoding)
+    return build_tree(iter_events(text, selector))
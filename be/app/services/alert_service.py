@@ -0,0 +1,276 @@
+import uuid
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable, NamedTuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.core.config import settings
+from app.services.currency_service import FxTable
+
+ALERT_BELOW = "below"
+ALERT_ABOVE = "above"
+DIRECTIONS = (ALERT_BELOW, ALERT_ABOVE)
+LOAD_BATCH_SIZE = 50_000
+# Bound on ids per UPDATE; asyncpg takes at most 32767 parameters per statement.
+UPDATE_BATCH_SIZE = 10_000
+
+# (skin_id, wear_id, stattrack, currency)
+AlertKey = tuple[uuid.UUID, uuid.UUID, bool, str]
+
+
+class FiredAlert(NamedTuple):
+    alert_id: uuid.UUID
+    # The book the alert sits in, to take it out again without hashing its key.
+    book: "AlertBook"
+    direction: str
+    threshold: float
+    price: float
+
+
+class AlertBook:
+    """
+    Alerts of one key kept as ``(level, alert_id)`` pairs in ascending order, where
+    ``level`` is the threshold of a "below" alert and the negated threshold of an
+    "above" alert. Either way an alert fires once the price ``p`` gives
+    ``level >= p`` (resp. ``-p``), so the alerts a price triggers are a suffix of
+    the list, found with one bisect.
+    """
+
+    __slots__ = ('below', 'above')
+
+    def __init__(self):
+        self.below: list[tuple[float, uuid.UUID]] = []
+        self.above: list[tuple[float, uuid.UUID]] = []
+
+    def add(self, alert_id: uuid.UUID, direction: str, threshold: float):
+        if direction == ALERT_BELOW:
+            insort(self.below, (threshold, alert_id))
+        else:
+            insort(self.above, (-threshold, alert_id))
+
+    def discard(self, alert_id: uuid.UUID, direction: str, threshold: float):
+        levels, level = (self.below, threshold) if direction == ALERT_BELOW else (self.above, -threshold)
+        i = bisect_left(levels, (level, alert_id))
+        if i < len(levels) and levels[i] == (level, alert_id):
+            del levels[i]
+
+    def remove(self, fired: list["FiredAlert"]):
+        """Drops fired alerts; only the part of each list from the lowest removed level on is scanned."""
+        for direction, levels, sign in ((ALERT_BELOW, self.below, 1), (ALERT_ABOVE, self.above, -1)):
+            alerts = [alert for alert in fired if alert.direction == direction]
+            if not alerts:
+                continue
+            start = bisect_left(levels, (min(sign * alert.threshold for alert in alerts),))
+            # UUID.__hash__ is Python code; the integer value hashes natively.
+            alert_ids = {alert.alert_id.int for alert in alerts}
+            levels[start:] = [entry for entry in levels[start:] if entry[1].int not in alert_ids]
+
+    def triggered(self, price: float, ends: list[int] | None = None) -> list[tuple[uuid.UUID, str, float]]:
+        """
+        ``(alert_id, direction, threshold)`` of the alerts ``price`` fires; the book
+        is left as is. ``ends`` carries over between calls (``[len(below),
+        len(above)]`` to start with), so alerts an earlier price fired are skipped.
+        """
+        if ends is None:
+            ends = [len(self.below), len(self.above)]
+        fired = []
+        # (level,) sorts before every (level, alert_id), so equal thresholds fire too.
+        i = bisect_left(self.below, (price,))
+        if i < ends[0]:
+            fired += [(alert_id, ALERT_BELOW, level) for level, alert_id in self.below[i:ends[0]]]
+            ends[0] = i
+        i = bisect_left(self.above, (-price,))
+        if i < ends[1]:
+            fired += [(alert_id, ALERT_ABOVE, -level) for level, alert_id in self.above[i:ends[1]]]
+            ends[1] = i
+        return fired
+
+    def __len__(self):
+        return len(self.below) + len(self.above)
+
+
+class AlertIndex:
+    """Active alerts grouped into one ``AlertBook`` per (skin, wear, stattrack, currency)."""
+
+    def __init__(self):
+        self.books: dict[AlertKey, AlertBook] = {}
+
+    def add(self, alert_id: uuid.UUID, key: AlertKey, direction: str, threshold: float):
+        book = self.books.get(key)
+        if book is None:
+            book = self.books[key] = AlertBook()
+        book.add(alert_id, direction, threshold)
+
+    def discard(self, alert_id: uuid.UUID, key: AlertKey, direction: str, threshold: float):
+        book = self.books.get(key)
+        if book is not None:
+            book.discard(alert_id, direction, threshold)
+
+    def match(self, prices: Iterable[tuple[AlertKey, float]]) -> list[FiredAlert]:
+        """
+        Every alert the prices trigger, once, with the first price that triggers
+        it. The index is left as is: ``remove`` takes the alerts out once their
+        firing has been recorded.
+        """
+        fired = []
+        books = self.books
+        # Per book, where the alerts fired by earlier prices of this batch begin.
+        ends: dict[AlertKey, list[int]] = {}
+        for key, price in prices:
+            book = books.get(key)
+            if book is None:
+                continue
+            book_ends = ends.get(key)
+            if book_ends is None:
+                book_ends = ends[key] = [len(book.below), len(book.above)]
+            fired.extend(
+                FiredAlert(alert_id, book, direction, threshold, price)
+                for alert_id, direction, threshold in book.triggered(price, book_ends)
+            )
+        return fired
+
+    def remove(self, fired: Iterable[FiredAlert]):
+        by_book: dict[AlertBook, list[FiredAlert]] = defaultdict(list)
+        for alert in fired:
+            by_book[alert.book].append(alert)
+        for book, alerts in by_book.items():
+            book.remove(alerts)
+
+    def __len__(self):
+        return sum(len(book) for book in self.books.values())
+
+    @classmethod
+    def build(cls, alerts: Iterable[tuple[uuid.UUID, AlertKey, str, float]]) -> "AlertIndex":
+        """Bulk construction: appends everything, then sorts each book once instead of ``insort`` per alert."""
+        index = cls()
+        books = index.books
+        for alert_id, key, direction, threshold in alerts:
+            book = books.get(key)
+            if book is None:
+                book = books[key] = AlertBook()
+            if direction == ALERT_BELOW:
+                book.below.append((threshold, alert_id))
+            else:
+                book.above.append((-threshold, alert_id))
+        for book in books.values():
+            book.below.sort()
+            book.above.sort()
+        return index
+
+
+
+async def create_alert(
+    db: AsyncSession, fx: FxTable, user_id: uuid.UUID, key: tuple[uuid.UUID, uuid.UUID, bool],
+    direction: str, threshold: float, currency: str,
+) -> models.PriceAlert:
+    """
+    Adds an active alert on the ``(skin_id, wear_id, stattrack)`` key. Ingested
+    prices are in ``fx.canonical``, so ``threshold`` is converted into it from
+    ``currency``; raises ``UnknownCurrency`` if there is no rate for it.
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+    skin_id, wear_id, stattrack = key
+    alert = models.PriceAlert(
+        user_id=user_id, skin_id=skin_id, wear_id=wear_id, stattrack=stattrack, direction=direction,
+        threshold=fx.convert(threshold, currency), currency=fx.canonical,
+    )
+    db.add(alert)
+    await db.flush()
+    return alert
+
+class AlertEngine:
+    """
+    Matches ingested prices against the active alerts held in an ``AlertIndex``
+    and records what fired in the same transaction: the alerts are deactivated
+    and a notification per alert goes to ``alert_outbox`` for delivery. Fired
+    alerts leave the index through ``forget`` once that transaction committed.
+    """
+
+    def __init__(self, index: AlertIndex):
+        self.index = index
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "AlertEngine":
+        pa = models.PriceAlert
+        # Prices are matched in the canonical currency, which ``create_alert`` converts thresholds into.
+        stmt = (
+            select(pa.alert_id, pa.skin_id, pa.wear_id, pa.stattrack, pa.currency, pa.direction, pa.threshold)
+            .where(pa.active, pa.currency == settings.CANONICAL_CURRENCY)
+            .execution_options(yield_per=LOAD_BATCH_SIZE)
+        )
+        rows = await db.stream(stmt)
+        alerts = [
+            (alert_id, (skin_id, wear_id, stattrack, currency), direction, threshold)
+            async for alert_id, skin_id, wear_id, stattrack, currency, direction, threshold in rows
+        ]
+        return cls(AlertIndex.build(alerts))
+
+    async def process(self, db: AsyncSession, prices: Iterable[tuple[AlertKey, float]]) -> list[FiredAlert]:
+        """
+        Fires the alerts triggered by ``prices`` in ``db``'s transaction and returns
+        them. The caller commits, then passes them to ``forget``; if the transaction
+        rolls back instead they stay in the index and fire on a later price.
+        """
+        fired = {alert.alert_id: alert for alert in self.index.match(prices)}
+        if not fired:
+            return []
+        pa = models.PriceAlert
+        now = datetime.utcnow()
+        alert_ids = list(fired)
+        triggered = []
+        for i in range(0, len(alert_ids), UPDATE_BATCH_SIZE):
+            # Alerts deleted or deactivated since the index was loaded drop out here.
+            triggered += (await db.execute(
+                update(pa)
+                .where(pa.alert_id.in_(alert_ids[i:i + UPDATE_BATCH_SIZE]), pa.active)
+                .values(active=False, triggered_at=now)
+                .returning(pa.alert_id, pa.user_id, pa.currency)
+            )).all()
+        if triggered:
+            await db.execute(insert(models.AlertOutbox), [
+                {'notification_id': uuid.uuid4(), 'alert_id': alert_id, 'user_id': user_id,
+                 'price': fired[alert_id].price, 'currency': currency, 'created_at': now}
+                for alert_id, user_id, currency in triggered
+            ])
+        return list(fired.values())
+
+    def forget(self, fired: Iterable[FiredAlert]):
+        """Takes alerts returned by ``process`` out of the index; call after their transaction committed."""
+        self.index.remove(fired)
+
+
+async def deliver_notifications(
+    db: AsyncSession, send: Callable[[models.AlertOutbox], Awaitable[None]], batch_size: int = 500,
+) -> int:
+    """
+    Hands pending outbox rows to ``send`` and marks them delivered. Rows are
+    claimed with ``FOR UPDATE SKIP LOCKED``, so several workers can drain the
+    outbox side by side; a failed ``send`` leaves its row pending for the next run.
+    """
+    outbox = models.AlertOutbox
+    pending = (await db.execute(
+        select(outbox)
+        .where(outbox.delivered_at.is_(None))
+        .order_by(outbox.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )).scalars().all()
+    delivered = []
+    for notification in pending:
+        try:
+            await send(notification)
+        except Exception as e:
+            print(f"Error: delivering notification {notification.notification_id} failed: {e}")
+            continue
+        delivered.append(notification.notification_id)
+    if delivered:
+        await db.execute(
+            update(outbox).where(outbox.notification_id.in_(delivered)).values(delivered_at=datetime.utcnow())
+        )
+    await db.commit()
+    return len(delivered)
@@ -0,0 +1,151 @@
+import uuid
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from operator import mul
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.core.config import settings
+from app.services.catalog_cache import (
+    CATALOG_VERSION_NAME, PRICES_VERSION_NAME, VERSION_CHECK_INTERVAL, VersionedCache, get_catalog_version,
+)
+from app.services.market_names import STAR_RARITY, WEAR_RANGES
+from app.services.portfolio_service import PriceKey, load_latest_prices
+
+# Chance of each rarity tier per opening (Mil-Spec .. Covert), and of a ★ item.
+RARITY_ODDS = {3: 0.7992, 4: 0.1598, 5: 0.0320, 6: 0.0064}
+STAR_ODDS = 0.0026
+STATTRAK_ODDS = 0.10
+
+
+def wear_odds(float_min: float, float_max: float) -> dict[str, float]:
+    """Chance of every exterior for a float drawn uniformly from the skin's range."""
+    if float_max <= float_min:
+        return {}
+    span = float_max - float_min
+    odds = {}
+    for wear, (low, high) in WEAR_RANGES.items():
+        overlap = min(high, float_max) - max(low, float_min)
+        if overlap > 0:
+            odds[wear] = overlap / span
+    return odds
+
+
+@dataclass
+class CaseEv:
+    case_id: uuid.UUID
+    name: str
+    expected_value: float
+    # Share of the drop odds that has a price; the rest counts as zero in ``expected_value``.
+    priced_odds: float
+
+
+class DropTable:
+    """
+    Every case's drops flattened into CSR arrays: the entries of case ``i`` are
+    ``offsets[i]:offsets[i + 1]``, each an ``odds`` and a price ``slot`` - one slot
+    per distinct (skin, wear, stattrack). Repricing all cases is one pass over
+    the entries against a dense price vector.
+    """
+
+    def __init__(self, cases: list[tuple[uuid.UUID, str]], drops: dict[uuid.UUID, list[tuple[PriceKey, float]]]):
+        self.case_ids = [case_id for case_id, _ in cases]
+        self.names = [name for _, name in cases]
+        self.keys: list[PriceKey] = []
+        slot_of: dict[PriceKey, int] = {}
+        self.offsets = array('l', [0])
+        self.slots = array('l')
+        self.odds = array('d')
+        for case_id in self.case_ids:
+            for key, odds in drops.get(case_id, []):
+                slot = slot_of.get(key)
+                if slot is None:
+                    slot = slot_of[key] = len(self.keys)
+                    self.keys.append(key)
+                self.slots.append(slot)
+                self.odds.append(odds)
+            self.offsets.append(len(self.slots))
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "DropTable":
+        s, r = models.Skin, models.Rarity
+        cases = (await db.execute(
+            select(models.Case.case_id, models.Case.name, models.Case.collection_id).order_by(models.Case.name)
+        )).all()
+        skins = (await db.execute(
+            select(s.skin_id, s.collection_id, s.float_min, s.float_max, r.tier, r.name)
+            .join(r, s.rarity_id == r.rarity_id)
+            .where(s.collection_id.in_({collection_id for _, _, collection_id in cases}))
+        )).all()
+        wear_ids = dict((await db.execute(select(models.WearType.name, models.WearType.wear_id))).all())
+
+        # collection -> rarity odds key -> skins
+        groups = defaultdict(lambda: defaultdict(list))
+        for skin_id, collection_id, float_min, float_max, tier, rarity in skins:
+            odds_key = STAR_RARITY if rarity == STAR_RARITY else tier
+            if odds_key == STAR_RARITY or odds_key in RARITY_ODDS:
+                groups[collection_id][odds_key].append((skin_id, float_min, float_max))
+
+        drops = {}
+        for case_id, _, collection_id in cases:
+            entries = []
+            for odds_key, group in groups[collection_id].items():
+                per_skin = (STAR_ODDS if odds_key == STAR_RARITY else RARITY_ODDS[odds_key]) / len(group)
+                for skin_id, float_min, float_max in group:
+                    for wear, odds in wear_odds(float_min, float_max).items():
+                        if wear not in wear_ids:
+                            continue
+                        entries.append(((skin_id, wear_ids[wear], False), per_skin * odds * (1 - STATTRAK_ODDS)))
+                        entries.append(((skin_id, wear_ids[wear], True), per_skin * odds * STATTRAK_ODDS))
+            drops[case_id] = entries
+        return cls([(case_id, name) for case_id, name, _ in cases], drops)
+
+    def price_vector(self, prices: dict[PriceKey, float]) -> tuple[array, array]:
+        """Prices by slot, and 1.0/0.0 flags for which slots have one."""
+        vector = array('d', (prices.get(key, 0.0) for key in self.keys))
+        priced = array('d', (1.0 if key in prices else 0.0 for key in self.keys))
+        return vector, priced
+
+    def expected_values(self, prices: dict[PriceKey, float]) -> list[CaseEv]:
+        vector, priced = self.price_vector(prices)
+        gathered = array('d', map(vector.__getitem__, self.slots))
+        gathered_priced = array('d', map(priced.__getitem__, self.slots))
+        values = array('d', map(mul, self.odds, gathered))
+        coverage = array('d', map(mul, self.odds, gathered_priced))
+        return [
+            CaseEv(case_id, name, sum(values[start:end]), sum(coverage[start:end]))
+            for case_id, name, start, end in zip(self.case_ids, self.names, self.offsets, self.offsets[1:])
+        ]
+
+
+class CaseEvCache(VersionedCache):
+    """
+    Expected value of every case, recomputed when prices are ingested. The drop
+    table itself only changes with the catalog and is rebuilt only then.
+    """
+
+    def __init__(self, currency: str = settings.CANONICAL_CURRENCY, check_interval: float = VERSION_CHECK_INTERVAL):
+        super().__init__(check_interval)
+        self.currency = currency
+        self.table: DropTable | None = None
+        self.table_version: int | None = None
+        self.by_case: dict[uuid.UUID, CaseEv] = {}
+        self.ranked: list[CaseEv] = []
+
+    async def current_version(self, db: AsyncSession):
+        return await get_catalog_version(db, CATALOG_VERSION_NAME), await get_catalog_version(db, PRICES_VERSION_NAME)
+
+    async def load_snapshot(self, db: AsyncSession):
+        catalog_version = await get_catalog_version(db, CATALOG_VERSION_NAME)
+        if self.table is None or catalog_version != self.table_version:
+            self.table = await DropTable.load(db)
+            self.table_version = catalog_version
+        values = self.table.expected_values(await load_latest_prices(db, self.currency))
+        self.by_case = {value.case_id: value for value in values}
+        self.ranked = sorted(values, key=lambda value: value.expected_value, reverse=True)
+
+
+case_ev_cache = CaseEvCache()
@@ -0,0 +1,175 @@
+import time
+import uuid
+import asyncio
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+import app.models as models
+
+CATALOG_VERSION_NAME = "catalog"
+PRICES_VERSION_NAME = "prices"
+VERSION_CHECK_INTERVAL = 5.0
+
+
+async def bump_catalog_version(db: AsyncSession, name: str = CATALOG_VERSION_NAME) -> None:
+    """
+    Invalidates every process' caches stamped with ``name``: reference data for
+    ``CATALOG_VERSION_NAME``, prices for ``PRICES_VERSION_NAME``. Call in the
+    transaction that changed the data.
+    """
+    table = models.CatalogVersion.__table__
+    stmt = insert(table).values(name=name, version=1, updated_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['name'],
+        set_={'version': table.c.version + 1, 'updated_at': stmt.excluded.updated_at},
+    )
+    await db.execute(stmt)
+
+
+async def get_catalog_version(db: AsyncSession, name: str = CATALOG_VERSION_NAME) -> int:
+    version = await db.scalar(
+        select(models.CatalogVersion.version).where(models.CatalogVersion.name == name)
+    )
+    return version or 0
+
+
+class VersionedCache(ABC):
+    """
+    Base for in-process snapshots derived from the catalog. ``ensure_fresh`` reloads
+    the snapshot through ``load`` when ``current_version`` has moved, checking the
+    stamp at most every ``check_interval`` seconds. Concurrent callers share one
+    check and one reload.
+    """
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self.version: int | None = None
+        self.checked_at = 0.0
+        self.reloads = 0
+        self.lock = asyncio.Lock()
+
+    async def current_version(self, db: AsyncSession):
+        return await get_catalog_version(db)
+
+    @abstractmethod
+    async def load_snapshot(self, db: AsyncSession):
+        """Replaces the cached data with a fresh read through ``db``."""
+
+    async def load(self, db: AsyncSession):
+        version = await self.current_version(db)
+        await self.load_snapshot(db)
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.reloads += 1
+
+    async def ensure_fresh(self, db: AsyncSession):
+        if self.version is not None and time.monotonic() - self.checked_at < self.check_interval:
+            return self
+        async with self.lock:
+            if self.version is not None and time.monotonic() - self.checked_at < self.check_interval:
+                return self
+            if self.version is None or await self.current_version(db) != self.version:
+                await self.load(db)
+            self.checked_at = time.monotonic()
+        return self
+
+    def invalidate(self):
+        self.version = None
+
+
+@dataclass
+class TableIndex:
+    by_id: dict = field(default_factory=dict)
+    by_name: dict = field(default_factory=dict)
+
+
+# table -> (model, primary key attribute, function building the name key)
+CATALOG_TABLES = {
+    'wear_types': (models.WearType, 'wear_id', lambda row: row.name),
+    'rarities': (models.Rarity, 'rarity_id', lambda row: row.name),
+    'weapons': (models.Weapon, 'weapon_id', lambda row: row.name),
+    'collections': (models.Collection, 'collection_id', lambda row: row.name),
+    'cases': (models.Case, 'case_id', lambda row: row.name),
+    'skins': (models.Skin, 'skin_id', lambda row: (row.weapon_id, row.name)),
+}
+
+
+class CatalogCache(VersionedCache):
+    """
+    Process-wide snapshot of the reference tables with name -> id and id -> object
+    indexes. Skins are keyed by ``(weapon_id, name)``. Cached objects have their
+    ``weapon``/``rarity``/``collection`` relationships wired to other cached
+    objects, so serializing them never triggers a lazy load.
+
+    The snapshot is reloaded when ``catalog_versions`` moves, which seeding bumps
+    on commit.
+    """
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL):
+        super().__init__(check_interval)
+        self.tables: dict[str, TableIndex] = {name: TableIndex() for name in CATALOG_TABLES}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    async def load_snapshot(self, db: AsyncSession):
+        tables = {}
+        for name, (model, pk, name_key) in CATALOG_TABLES.items():
+            index = TableIndex()
+            for row in (await db.execute(select(model))).scalars():
+                index.by_id[getattr(row, pk)] = row
+                index.by_name[name_key(row)] = getattr(row, pk)
+            tables[name] = index
+
+        weapons, rarities, collections = tables['weapons'].by_id, tables['rarities'].by_id, tables['collections'].by_id
+        for skin in tables['skins'].by_id.values():
+            set_committed_value(skin, 'weapon', weapons.get(skin.weapon_id))
+            set_committed_value(skin, 'rarity', rarities.get(skin.rarity_id))
+            set_committed_value(skin, 'collection', collections.get(skin.collection_id))
+        for case in tables['cases'].by_id.values():
+            set_committed_value(case, 'collection', collections.get(case.collection_id))
+
+        for rows in tables.values():
+            for row in rows.by_id.values():
+                db.expunge(row)
+
+        self.tables = tables
+
+    def id_for(self, table: str, name) -> uuid.UUID | None:
+        row_id = self.tables[table].by_name.get(name)
+        if row_id is None:
+            self.misses[table] += 1
+        else:
+            self.hits[table] += 1
+        return row_id
+
+    def get(self, table: str, row_id: uuid.UUID):
+        row = self.tables[table].by_id.get(row_id)
+        if row is None:
+            self.misses[table] += 1
+        else:
+            self.hits[table] += 1
+        return row
+
+    def name_map(self, table: str) -> dict:
+        return self.tables[table].by_name
+
+    def all(self, table: str) -> list:
+        return list(self.tables[table].by_id.values())
+
+    def stats(self) -> dict:
+        return {
+            'version': self.version,
+            'reloads': self.reloads,
+            'hits': dict(self.hits),
+            'misses': dict(self.misses),
+        }
+
+
+catalog_cache = CatalogCache()
@@ -0,0 +1,121 @@
+import json
+import uuid
+import base64
+import binascii
+
+from sqlalchemy import Select, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+import app.models as models
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Sort name -> key columns, the last one unique so that every row has exactly one position.
+# Cases, collections and weapons have unique names and page on the name alone.
+SKIN_ORDERINGS = {
+    'name': (models.Skin.name, models.Skin.skin_id),
+    'id': (models.Skin.skin_id,),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([str(value) if isinstance(value, uuid.UUID) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise InvalidCursor(cursor)
+        return [column.type.python_type(value) for column, value in zip(columns, values)]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+async def keyset_page(db: AsyncSession, stmt: Select, columns, cursor: str | None, limit: int):
+    """
+    Runs ``stmt`` ordered by ``columns`` starting right after ``cursor``. The row
+    comparison ``(a, b) > (x, y)`` lets Postgres seek straight into a matching
+    index, so deep pages cost the same as the first one.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        stmt = stmt.where(tuple_(*columns) > tuple_(*(literal(v, c.type) for c, v in zip(columns, values))))
+    stmt = stmt.order_by(*columns).limit(limit + 1)
+    rows = list((await db.execute(stmt)).unique().scalars())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows, next_cursor
+
+
+def skins_query(
+    weapon_id: uuid.UUID | None = None,
+    rarity_id: uuid.UUID | None = None,
+    collection_id: uuid.UUID | None = None,
+) -> Select:
+    # Many-to-one relations ride along in the same query; SkinRead serialization never lazy-loads.
+    stmt = select(models.Skin).options(
+        joinedload(models.Skin.weapon, innerjoin=True),
+        joinedload(models.Skin.rarity, innerjoin=True),
+        joinedload(models.Skin.collection),
+    )
+    if weapon_id is not None:
+        stmt = stmt.where(models.Skin.weapon_id == weapon_id)
+    if rarity_id is not None:
+        stmt = stmt.where(models.Skin.rarity_id == rarity_id)
+    if collection_id is not None:
+        stmt = stmt.where(models.Skin.collection_id == collection_id)
+    return stmt
+
+
+async def list_skins(
+    db: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    sort: str = 'name',
+    weapon_id: uuid.UUID | None = None,
+    rarity_id: uuid.UUID | None = None,
+    collection_id: uuid.UUID | None = None,
+):
+    stmt = skins_query(weapon_id, rarity_id, collection_id)
+    return await keyset_page(db, stmt, SKIN_ORDERINGS[sort], cursor, limit)
+
+
+async def list_variants(db: AsyncSession, skin_id: uuid.UUID) -> list[models.PaintKitVariant]:
+    stmt = (
+        select(models.PaintKitVariant)
+        .where(models.PaintKitVariant.skin_id == skin_id)
+        .order_by(models.PaintKitVariant.paint_index)
+    )
+    return list((await db.execute(stmt)).scalars())
+
+
+async def list_cases(
+    db: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    collection_id: uuid.UUID | None = None,
+):
+    stmt = select(models.Case).options(joinedload(models.Case.collection, innerjoin=True))
+    if collection_id is not None:
+        stmt = stmt.where(models.Case.collection_id == collection_id)
+    return await keyset_page(db, stmt, (models.Case.name,), cursor, limit)
+
+
+async def list_collections(db: AsyncSession, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    return await keyset_page(db, select(models.Collection), (models.Collection.name,), cursor, limit)
+
+
+async def list_weapons(db: AsyncSession, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    return await keyset_page(db, select(models.Weapon), (models.Weapon.name,), cursor, limit)
@@ -0,0 +1,104 @@
+import json
+import time
+import asyncio
+from abc import ABC, abstractmethod
+from array import array
+from pathlib import Path
+
+from app.core.config import settings
+
+
+class UnknownCurrency(ValueError):
+    pass
+
+
+class RateProvider(ABC):
+    @abstractmethod
+    async def fetch(self) -> tuple[str, dict[str, float]]:
+        """``(base, rates)`` where one unit of ``base`` buys ``rates[currency]`` of each currency."""
+
+
+class FileRateProvider(RateProvider):
+    """
+    Reads ``{"base": "EUR", "rates": {"PLN": 4.31, "USD": 1.08, ...}}`` from a
+    local JSON file. A missing file yields no rates, so only the canonical
+    currency converts.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+
+    async def fetch(self) -> tuple[str, dict[str, float]]:
+        if not self.path.exists():
+            print(f"Error: FX rate file {self.path} not found")
+            return settings.CANONICAL_CURRENCY, {}
+        data = json.loads(await asyncio.to_thread(self.path.read_text))
+        return data['base'], {currency: float(rate) for currency, rate in data['rates'].items()}
+
+
+class FxTable:
+    """Multipliers from every known currency into ``canonical``."""
+
+    def __init__(self, canonical: str, base: str, rates: dict[str, float]):
+        self.canonical = canonical
+        rates = {currency.upper(): rate for currency, rate in rates.items()} | {base.upper(): 1.0}
+        self.factors = {canonical: 1.0}
+        if canonical in rates:
+            self.factors |= {currency: rates[canonical] / rate for currency, rate in rates.items() if rate > 0}
+
+    def factor(self, currency: str) -> float:
+        factor = self.factors.get(currency.upper())
+        if factor is None:
+            raise UnknownCurrency(f"no FX rate from {currency} to {self.canonical}")
+        return factor
+
+    def convert(self, amount: float, currency: str) -> float:
+        return amount * self.factor(currency)
+
+    def normalize(self, amounts: array, currencies: list[str]) -> array:
+        """
+        Converts a batch row by row, ``amounts[i]`` being in ``currencies[i]``.
+        Raises ``UnknownCurrency`` for a currency without a rate; ``known``
+        filters a batch beforehand.
+        """
+        factor = self.factor
+        return array('d', [amount * factor(currency) for amount, currency in zip(amounts, currencies)])
+
+    def known(self, currency: str) -> bool:
+        return currency.upper() in self.factors
+
+
+class FxRates:
+    """
+    The ``FxTable`` of a provider, refetched once ``ttl`` seconds old. Concurrent
+    callers share one refresh; a failed refresh keeps serving the previous table.
+    """
+
+    def __init__(self, provider: RateProvider, canonical: str | None = None, ttl: float | None = None):
+        self.provider = provider
+        self.canonical = (canonical or settings.CANONICAL_CURRENCY).upper()
+        self.ttl = settings.FX_RATES_TTL if ttl is None else ttl
+        self.table: FxTable | None = None
+        self.fetched_at = 0.0
+        self.lock = asyncio.Lock()
+
+    def expired(self) -> bool:
+        return self.table is None or time.monotonic() - self.fetched_at >= self.ttl
+
+    async def get(self) -> FxTable:
+        if not self.expired():
+            return self.table
+        async with self.lock:
+            if self.expired():
+                try:
+                    base, rates = await self.provider.fetch()
+                    self.table = FxTable(self.canonical, base, rates)
+                except Exception as e:
+                    if self.table is None:
+                        raise
+                    print(f"Error: refreshing FX rates failed, keeping the previous rates: {e}")
+                self.fetched_at = time.monotonic()
+        return self.table
+
+
+fx_rates = FxRates(FileRateProvider(settings.FX_RATES_PATH))
@@ -0,0 +1,102 @@
+import json
+import random
+import asyncio
+import hashlib
+
+
+def fake_price(name: str) -> float:
+    digest = hashlib.blake2b(name.encode(), digest_size=4).digest()
+    return round(1 + int.from_bytes(digest, "big") % 500000 / 100, 2)
+
+
+class FakeMarketServer:
+    """
+    Local HTTP/1.1 keep-alive server implementing the batch protocol of
+    ``JsonMarketSource`` with deterministic prices, for tests and offline
+    throughput benchmarks. ``latency`` delays every response and ``failure_rate``
+    answers that share of requests with a 503 to exercise the retry path.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, currency: str = "PLN",
+                 latency: float = 0.0, failure_rate: float = 0.0, missing_rate: float = 0.0):
+        self.host = host
+        self.port = port
+        self.currency = currency
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.missing_rate = missing_rate
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+        self._handlers: set[asyncio.Task] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            for handler in self._handlers:
+                handler.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+    def quote(self, names: list[str]) -> dict:
+        return {
+            name: fake_price(name)
+            for name in names
+            if not self.missing_rate or random.random() >= self.missing_rate
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    if key.strip().lower() == "content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b""
+                self.requests += 1
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, payload = self._respond(request_line.split()[1].decode(), body)
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\nConnection: keep-alive\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(handler)
+            writer.close()
+
+    def _respond(self, path: str, body: bytes) -> tuple[str, bytes]:
+        if self.failure_rate and random.random() < self.failure_rate:
+            return "503 Service Unavailable", b"{}"
+        if path != "/prices":
+            return "404 Not Found", b"{}"
+        names = json.loads(body or b"{}").get("names", [])
+        payload = {"currency": self.currency, "prices": self.quote(names)}
+        return "200 OK", json.dumps(payload).encode()
@@ -0,0 +1,218 @@
+import heapq
+import uuid
+import asyncio
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.services.inventory_service import InventoryListener, ItemKey
+
+# Histogram buckets over the 0.0 - 1.0 float range, 0.01 wide.
+HISTOGRAM_BUCKETS = 100
+LOAD_BATCH_SIZE = 50_000
+
+
+def bucket_of(value: float) -> int:
+    return min(int(value * HISTOGRAM_BUCKETS), HISTOGRAM_BUCKETS - 1)
+
+
+class FloatRank(NamedTuple):
+    # Items of the skin with a strictly lower float; 0 is the best float of the skin.
+    rank: int
+    total: int
+    # Share of the skin's items with a higher float, 0 - 100.
+    percentile: float
+
+
+class FloatItem(NamedTuple):
+    float_value: float
+    row_id: uuid.UUID
+    skin_id: uuid.UUID
+
+
+class SkinFloats:
+    """
+    Float values of one skin in ascending order, with the ``user_skins`` row of
+    each in the parallel ``ids`` list, and a histogram kept in step with them.
+    """
+
+    __slots__ = ('floats', 'ids', 'histogram')
+
+    def __init__(self):
+        self.floats = array('d')
+        self.ids: list[uuid.UUID] = []
+        self.histogram = array('q', bytes(8 * HISTOGRAM_BUCKETS))
+
+    def add(self, row_id: uuid.UUID, value: float):
+        i = bisect_right(self.floats, value)
+        self.floats.insert(i, value)
+        self.ids.insert(i, row_id)
+        self.histogram[bucket_of(value)] += 1
+
+    def remove(self, row_id: uuid.UUID, value: float) -> bool:
+        for i in range(bisect_left(self.floats, value), bisect_right(self.floats, value)):
+            if self.ids[i] == row_id:
+                del self.floats[i]
+                del self.ids[i]
+                self.histogram[bucket_of(value)] -= 1
+                return True
+        return False
+
+    def rank(self, value: float) -> FloatRank:
+        total = len(self.floats)
+        below = bisect_left(self.floats, value)
+        above = total - bisect_right(self.floats, value)
+        return FloatRank(below, total, 100.0 * above / total if total else 0.0)
+
+    def count_between(self, low: float, high: float) -> int:
+        """Items with ``low <= float < high``."""
+        return bisect_left(self.floats, high) - bisect_left(self.floats, low)
+
+    def __len__(self):
+        return len(self.floats)
+
+
+class FloatIndex(InventoryListener):
+    """
+    Every floated item in ``user_skins``, as a ``SkinFloats`` per skin, plus the
+    ``(lowest float, skin_id)`` of every skin in ascending order. Rank, range
+    counts and "lowest N" are bisections; the histograms and minima are
+    maintained as items come and go, so attached to ``InventorySync`` as a
+    listener the index follows the syncs without being reloaded.
+    """
+
+    def __init__(self):
+        self.skins: dict[uuid.UUID, SkinFloats] = {}
+        self.minima: list[tuple[float, uuid.UUID]] = []
+        self.loaded = False
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "FloatIndex":
+        index = cls()
+        await index.reload(db)
+        return index
+
+    async def reload(self, db: AsyncSession):
+        # Read in (skin_id, float_value) order off ix_user_skins_skin_float, so every array is built by appending.
+        us = models.UserSkin
+        rows = await db.stream(
+            select(us.skin_id, us.id, us.float_value)
+            .where(us.float_value.is_not(None))
+            .order_by(us.skin_id, us.float_value)
+            .execution_options(yield_per=LOAD_BATCH_SIZE)
+        )
+        skins = {}
+        current_id, current = None, None
+        async for skin_id, row_id, value in rows:
+            if skin_id != current_id:
+                current_id, current = skin_id, skins.setdefault(skin_id, SkinFloats())
+            current.floats.append(value)
+            current.ids.append(row_id)
+            current.histogram[bucket_of(value)] += 1
+        self.skins = skins
+        self.minima = sorted((skin.floats[0], skin_id) for skin_id, skin in skins.items())
+        self.loaded = True
+
+    async def ensure_loaded(self, db: AsyncSession) -> "FloatIndex":
+        """Loads the index on first use; from then on the listener keeps it current."""
+        if not self.loaded:
+            async with self.lock:
+                if not self.loaded:
+                    await self.reload(db)
+        return self
+
+    def _move_minimum(self, skin_id: uuid.UUID, old: float | None, new: float | None):
+        if old == new:
+            return
+        if old is not None:
+            i = bisect_left(self.minima, (old, skin_id))
+            del self.minima[i]
+        if new is not None:
+            insort(self.minima, (new, skin_id))
+
+    def add(self, skin_id: uuid.UUID, row_id: uuid.UUID, value: float):
+        skin = self.skins.get(skin_id)
+        if skin is None:
+            skin = self.skins[skin_id] = SkinFloats()
+        old = skin.floats[0] if skin else None
+        skin.add(row_id, value)
+        self._move_minimum(skin_id, old, skin.floats[0])
+
+    def remove(self, skin_id: uuid.UUID, row_id: uuid.UUID, value: float):
+        skin = self.skins.get(skin_id)
+        if skin is None:
+            return
+        old = skin.floats[0]
+        if skin.remove(row_id, value):
+            if not skin:
+                del self.skins[skin_id]
+            self._move_minimum(skin_id, old, skin.floats[0] if skin else None)
+
+    def inventory_changed(self, user_id: uuid.UUID, removed: list[tuple[uuid.UUID, ItemKey]],
+                          added: list[tuple[uuid.UUID, ItemKey]]):
+        # Changes before the first load are in the rows it reads.
+        if not self.loaded:
+            return
+        for row_id, (skin_id, _, _, value, _) in removed:
+            if value is not None:
+                self.remove(skin_id, row_id, value)
+        for row_id, (skin_id, _, _, value, _) in added:
+            if value is not None:
+                self.add(skin_id, row_id, value)
+
+    def rank(self, skin_id: uuid.UUID, value: float) -> FloatRank:
+        skin = self.skins.get(skin_id)
+        return skin.rank(value) if skin is not None else FloatRank(0, 0, 0.0)
+
+    def histogram(self, skin_id: uuid.UUID) -> list[int]:
+        skin = self.skins.get(skin_id)
+        return skin.histogram.tolist() if skin is not None else [0] * HISTOGRAM_BUCKETS
+
+    def count_between(self, skin_id: uuid.UUID, low: float, high: float) -> int:
+        skin = self.skins.get(skin_id)
+        return skin.count_between(low, high) if skin is not None else 0
+
+    def lowest(self, skin_id: uuid.UUID, limit: int = 10) -> list[FloatItem]:
+        skin = self.skins.get(skin_id)
+        if skin is None:
+            return []
+        return [FloatItem(value, row_id, skin_id) for value, row_id in zip(skin.floats[:limit], skin.ids[:limit])]
+
+    def lowest_overall(self, limit: int = 10, below: float = 1.0,
+                       skin_ids: list[uuid.UUID] | None = None) -> list[FloatItem]:
+        """
+        The ``limit`` lowest floats under ``below`` across ``skin_ids`` (every
+        skin by default). Skins join the merge in the order of their lowest
+        float, so only the skins holding one of the results are visited.
+        """
+        if skin_ids is None:
+            minima = self.minima
+        else:
+            minima = sorted((skin.floats[0], skin_id) for skin_id in set(skin_ids)
+                            if (skin := self.skins.get(skin_id)) is not None)
+        # (float, row_id, skin_id, position in the skin, position in minima of the skin that is next to join)
+        heap = []
+        if minima:
+            value, skin_id = minima[0]
+            heap.append((value, self.skins[skin_id].ids[0], skin_id, 0, 1))
+        result = []
+        while heap and len(result) < limit:
+            value, row_id, skin_id, i, joining = heapq.heappop(heap)
+            if value >= below:
+                break
+            result.append(FloatItem(value, row_id, skin_id))
+            skin = self.skins[skin_id]
+            if i + 1 < len(skin):
+                heapq.heappush(heap, (skin.floats[i + 1], skin.ids[i + 1], skin_id, i + 1, 0))
+            if joining and joining < len(minima):
+                value, skin_id = minima[joining]
+                heapq.heappush(heap, (value, self.skins[skin_id].ids[0], skin_id, 0, joining + 1))
+        return result
+
+
+float_index = FloatIndex()
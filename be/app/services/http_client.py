@@ -0,0 +1,180 @@
+import ssl
+import json
+import asyncio
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, body: bytes = b""):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.body = body
+
+
+class HttpProtocolError(ConnectionError):
+    """A response that does not parse as HTTP/1.1; the connection is dropped."""
+
+
+class _StaleConnection(ConnectionError):
+    """The server closed the connection before answering; raised before any response byte was read."""
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+    def usable(self) -> bool:
+        """False once the server's close of an idle connection has been seen."""
+        return not self.reader.at_eof() and not self.writer.is_closing()
+
+
+def parse_status_line(line: bytes) -> int:
+    """The status code of ``HTTP/1.1 200 OK``."""
+    parts = line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/") or not parts[1].isdigit() or len(parts[1]) != 3:
+        raise HttpProtocolError(f"Malformed status line: {line[:100]!r}")
+    return int(parts[1])
+
+
+def parse_chunk_size(line: bytes) -> int:
+    if not line:
+        raise asyncio.IncompleteReadError(b"", None)
+    try:
+        return int(line.split(b";")[0], 16)
+    except ValueError as e:
+        raise HttpProtocolError(f"Malformed chunk size: {line[:100]!r}") from e
+
+
+class HttpClient:
+    """
+    Minimal keep-alive HTTP/1.1 client shared by every caller in the process.
+    Idle connections are pooled per (scheme, host, port) and at most
+    ``max_connections_per_host`` are open to one origin at a time.
+    """
+
+    def __init__(self, max_connections_per_host: int = 10, timeout: float = 10.0):
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self._idle: dict[tuple, deque[_Connection]] = defaultdict(deque)
+        self._slots: dict[tuple, asyncio.Semaphore] = {}
+        self._ssl = ssl.create_default_context()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for connections in self._idle.values():
+            while connections:
+                connections.popleft().close()
+
+    async def _open(self, origin) -> _Connection:
+        scheme, host, port = origin
+        reader, writer = await asyncio.open_connection(host, port, ssl=self._ssl if scheme == "https" else None)
+        return _Connection(reader, writer)
+
+    async def request(self, method: str, url: str, json_body=None, headers: dict | None = None) -> tuple[int, bytes]:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        origin = (parts.scheme, parts.hostname, port)
+        slot = self._slots.setdefault(origin, asyncio.Semaphore(self.max_connections_per_host))
+
+        body = b"" if json_body is None else json.dumps(json_body).encode()
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}", "Connection: keep-alive",
+                 f"Content-Length: {len(body)}"]
+        if json_body is not None:
+            lines.append("Content-Type: application/json")
+        lines += [f"{key}: {value}" for key, value in (headers or {}).items()]
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+        async with slot:
+            idle = self._idle[origin]
+            while idle and not idle[0].usable():
+                idle.popleft().close()
+            connection = idle.popleft() if idle else None
+            try:
+                if connection is not None:
+                    try:
+                        result = await asyncio.wait_for(self._exchange(connection, payload), self.timeout)
+                    except _StaleConnection:
+                        # Closed by the server while idle, before it saw the request: safe to resend on a new one.
+                        connection.close()
+                        connection = None
+                if connection is None:
+                    connection = await asyncio.wait_for(self._open(origin), self.timeout)
+                    result = await asyncio.wait_for(self._exchange(connection, payload), self.timeout)
+            except BaseException:
+                if connection is not None:
+                    connection.close()
+                raise
+            status, response_headers, data, reusable = result
+            if not reusable or response_headers.get("connection", "").lower() == "close":
+                connection.close()
+            else:
+                idle.append(connection)
+        return status, data
+
+    async def _exchange(self, connection: _Connection, payload: bytes):
+        """
+        Sends ``payload`` and reads the response. The last element says whether the
+        connection can carry another request: a body delimited by neither
+        ``Content-Length`` nor chunked encoding runs until the server closes it.
+        """
+        reader = connection.reader
+        try:
+            connection.writer.write(payload)
+            await connection.writer.drain()
+            status_line = await reader.readline()
+        except (ConnectionResetError, BrokenPipeError) as e:
+            raise _StaleConnection("Connection closed by server") from e
+        if not status_line:
+            raise _StaleConnection("Connection closed by server")
+        status = parse_status_line(status_line)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while (size := parse_chunk_size(await reader.readline())) > 0:
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            # Trailer fields, then the blank line that ends the message.
+            while (line := await reader.readline()) not in (b"\r\n", b"\n"):
+                if not line:
+                    raise asyncio.IncompleteReadError(b"", None)
+            data = b"".join(chunks)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        elif status < 200 or status in (204, 304):
+            data = b""
+        else:
+            return status, headers, await reader.read(), False
+        return status, headers, data, True
+
+    async def get_json(self, url: str, headers: dict | None = None):
+        return await self._json("GET", url, None, headers)
+
+    async def post_json(self, url: str, body, headers: dict | None = None):
+        return await self._json("POST", url, body, headers)
+
+    async def _json(self, method, url, body, headers):
+        status, data = await self.request(method, url, body, headers)
+        if status >= 400:
+            raise HttpError(status, data)
+        return json.loads(data) if data else None
@@ -0,0 +1,46 @@
+import time
+import random
+import asyncio
+
+from app.services.http_client import HttpError
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` acquisitions per second with bursts up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, HttpError):
+        return error.status in RETRYABLE_STATUSES
+    return isinstance(error, (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError, OSError))
+
+
+async def retry_with_backoff(call, attempts: int = 4, base_delay: float = 0.2, max_delay: float = 5.0):
+    """Awaits ``call()`` and retries retryable failures with full-jitter exponential backoff."""
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == attempts - 1 or not is_retryable(e):
+                raise
+            await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
@@ -0,0 +1,245 @@
+import json
+import uuid
+import asyncio
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.db.instrumentation import count_queries
+from app.db.session import SessionLocal
+from app.services.http_client import HttpClient
+from app.services.http_retry import retry_with_backoff
+from app.services.market_names import CatalogKey, market_name_index
+from app.services.paint_kits import PaintKitIndex, paint_kit_index
+
+CS2_APP_ID = 730
+CS2_CONTEXT_ID = 2
+STEAM_INVENTORY_URL = "https://steamcommunity.com/inventory"
+STEAM_PAGE_SIZE = 2000
+UNKNOWN_USER = "unknown user"
+
+# (skin_id, wear_id, stattrack, float_value, variant_id) - what a user_skins row is compared on.
+ItemKey = tuple[uuid.UUID, uuid.UUID | None, bool, float | None, uuid.UUID | None]
+
+
+@dataclass
+class InventoryAsset:
+    asset_id: str
+    market_hash_name: str
+    float_value: float | None = None
+    paint_index: int | None = None
+
+
+@dataclass
+class SyncResult:
+    steam_id: str
+    inserted: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    unmatched: list[str] = field(default_factory=list)
+    queries: int = 0
+    error: str | None = None
+
+    def __str__(self):
+        if self.error:
+            return f"{self.steam_id}: failed ({self.error})"
+        return (f"{self.steam_id}: {self.inserted} inserted, {self.deleted} deleted, "
+                f"{self.unchanged} unchanged, {len(self.unmatched)} unmatched, {self.queries} queries")
+
+
+def parse_steam_inventory(payload: dict) -> list[InventoryAsset]:
+    """
+    Turns one page of Steam's ``/inventory`` JSON into assets. Descriptions are
+    joined on ``(classid, instanceid)``; non-standard ``float_value`` and
+    ``paint_index`` fields on the asset (used by fixtures and inspect-enriched
+    payloads) are carried over.
+    """
+    descriptions = {
+        (d.get('classid'), d.get('instanceid')): d
+        for d in payload.get('descriptions') or []
+    }
+    assets = []
+    for asset in payload.get('assets') or []:
+        description = descriptions.get((asset.get('classid'), asset.get('instanceid')))
+        if not description or not description.get('market_hash_name'):
+            continue
+        float_value = asset.get('float_value')
+        paint_index = asset.get('paint_index')
+        assets.append(InventoryAsset(
+            asset_id=str(asset.get('assetid')),
+            market_hash_name=description['market_hash_name'],
+            float_value=float(float_value) if float_value is not None else None,
+            paint_index=int(paint_index) if paint_index is not None else None,
+        ))
+    return assets
+
+
+class InventorySource(ABC):
+    @abstractmethod
+    async def fetch(self, steam_id: str) -> list[InventoryAsset]:
+        ...
+
+
+class SteamInventorySource(InventorySource):
+    def __init__(self, client: HttpClient, base_url: str = STEAM_INVENTORY_URL):
+        self.client = client
+        self.base_url = base_url.rstrip("/")
+
+    async def fetch(self, steam_id: str) -> list[InventoryAsset]:
+        assets = []
+        start_assetid = None
+        while True:
+            url = f"{self.base_url}/{steam_id}/{CS2_APP_ID}/{CS2_CONTEXT_ID}?l=english&count={STEAM_PAGE_SIZE}"
+            if start_assetid:
+                url += f"&start_assetid={start_assetid}"
+            payload = await retry_with_backoff(lambda: self.client.get_json(url))
+            assets.extend(parse_steam_inventory(payload or {}))
+            if not payload or not payload.get('more_items'):
+                return assets
+            start_assetid = payload.get('last_assetid')
+
+
+class FixtureInventorySource(InventorySource):
+    """Reads ``{steam_id}.json`` files in Steam's inventory format from a local directory."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    async def fetch(self, steam_id: str) -> list[InventoryAsset]:
+        path = self.directory / f"{steam_id}.json"
+        if not path.exists():
+            return []
+        with open(path, encoding='utf-8') as f:
+            return parse_steam_inventory(json.load(f))
+
+
+class InventoryListener(ABC):
+    @abstractmethod
+    def inventory_changed(self, user_id: uuid.UUID, removed: list[tuple[uuid.UUID, ItemKey]],
+                          added: list[tuple[uuid.UUID, ItemKey]]):
+        """Called with the ``(row id, key)`` pairs a sync deleted and inserted, after they are committed."""
+
+
+def diff_inventory(existing: list[tuple[uuid.UUID, ItemKey]], desired: list[ItemKey]):
+    """
+    Multiset difference between the stored rows and the fetched items. Returns the
+    ids of rows to delete, the keys to insert and the number of untouched rows.
+    """
+    wanted = Counter(desired)
+    to_delete = []
+    for row_id, key in existing:
+        if wanted[key] > 0:
+            wanted[key] -= 1
+        else:
+            to_delete.append(row_id)
+    to_insert = list(wanted.elements())
+    return to_delete, to_insert, len(existing) - len(to_delete)
+
+
+async def apply_inventory_diff(db: AsyncSession, user_id: uuid.UUID, desired: list[ItemKey]):
+    """
+    Brings the user's rows in line with ``desired``. Returns the ``(row id, key)``
+    pairs deleted and inserted, and the number of untouched rows; the caller commits.
+    """
+    us = models.UserSkin
+    existing = [
+        (row_id, (skin_id, wear_id, stattrack, float_value, variant_id))
+        for row_id, skin_id, wear_id, stattrack, float_value, variant_id in await db.execute(
+            select(us.id, us.skin_id, us.wear_id, us.stattrack, us.float_value, us.variant_id)
+            .where(us.user_id == user_id)
+        )
+    ]
+    to_delete, to_insert, unchanged = diff_inventory(existing, desired)
+    deleted_ids = set(to_delete)
+    removed = [(row_id, key) for row_id, key in existing if row_id in deleted_ids]
+    added = [(uuid.uuid4(), key) for key in to_insert]
+
+    if to_delete:
+        await db.execute(delete(us).where(us.id.in_(to_delete)))
+    if added:
+        now = datetime.utcnow()
+        # render_nulls keeps rows with and without a variant in one statement; the ORM otherwise
+        # splits a bulk insert wherever the set of NULL columns changes.
+        await db.execute(insert(us).execution_options(render_nulls=True), [
+            {'id': row_id, 'user_id': user_id, 'skin_id': skin_id, 'wear_id': wear_id,
+             'stattrack': stattrack, 'float_value': float_value, 'variant_id': variant_id, 'fetched_at': now}
+            for row_id, (skin_id, wear_id, stattrack, float_value, variant_id) in added
+        ])
+    return removed, added, unchanged
+
+
+class InventorySync:
+    """
+    Syncs many users concurrently over the shared connection pool. Assets are
+    resolved through the in-memory market hash name and paint kit indexes,
+    fetched once per run. ``listeners`` hear about every committed change.
+    """
+
+    def __init__(self, source: InventorySource, concurrency: int = 8,
+                 listeners: list[InventoryListener] | None = None):
+        self.source = source
+        self.concurrency = concurrency
+        self.listeners = listeners or []
+        self.index: dict[str, CatalogKey] | None = None
+        self.variants: PaintKitIndex | None = None
+
+    async def load_index(self):
+        async with SessionLocal() as db:
+            await market_name_index.ensure_fresh(db)
+            self.variants = await paint_kit_index.ensure_fresh(db)
+        self.index = market_name_index.index
+
+    def resolve(self, assets: list[InventoryAsset]) -> tuple[list[ItemKey], list[str]]:
+        desired, unmatched = [], []
+        for asset in assets:
+            key = self.index.get(asset.market_hash_name)
+            if key is None:
+                unmatched.append(asset.market_hash_name)
+                continue
+            variant = self.variants.variant_for(key[0], asset.paint_index)
+            desired.append((*key, asset.float_value, variant.variant_id if variant else None))
+        return desired, unmatched
+
+    async def sync_user(self, user_id: uuid.UUID, steam_id: str) -> SyncResult:
+        result = SyncResult(steam_id)
+        try:
+            assets = await self.source.fetch(steam_id)
+            desired, result.unmatched = self.resolve(assets)
+            with count_queries(f"inventory sync {steam_id}", strict=False) as counter:
+                async with SessionLocal() as db:
+                    removed, added, result.unchanged = await apply_inventory_diff(db, user_id, desired)
+                    await db.commit()
+            result.deleted, result.inserted = len(removed), len(added)
+            result.queries = counter.total
+            if removed or added:
+                for listener in self.listeners:
+                    listener.inventory_changed(user_id, removed, added)
+        except Exception as e:
+            result.error = str(e)
+        return result
+
+    async def run(self, steam_ids: list[str]) -> list[SyncResult]:
+        if self.index is None:
+            await self.load_index()
+
+        async with SessionLocal() as db:
+            users = dict((await db.execute(
+                select(models.User.steam_id, models.User.user_id).where(models.User.steam_id.in_(steam_ids))
+            )).all())
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def sync(steam_id):
+            if steam_id not in users:
+                return SyncResult(steam_id, error=UNKNOWN_USER)
+            async with semaphore:
+                return await self.sync_user(users[steam_id], steam_id)
+
+        return await asyncio.gather(*(sync(steam_id) for steam_id in steam_ids))
+
@@ -0,0 +1,123 @@
+import uuid
+from typing import NamedTuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.services.catalog_cache import VERSION_CHECK_INTERVAL, VersionedCache
+
+STATTRAK_PREFIX = "StatTrak™ "
+STAR_PREFIX = "★ "
+STAR_RARITY = "★"
+
+# Float interval of every exterior, lower bound inclusive.
+WEAR_RANGES = {
+    "Factory New": (0.0, 0.07),
+    "Minimal Wear": (0.07, 0.15),
+    "Field-Tested": (0.15, 0.38),
+    "Well-Worn": (0.38, 0.45),
+    "Battle-Scarred": (0.45, 1.0),
+}
+
+CatalogKey = tuple[uuid.UUID, uuid.UUID, bool]
+
+
+class Variant(NamedTuple):
+    skin_id: uuid.UUID
+    wear_id: uuid.UUID
+    stattrack: bool
+    market_hash_name: str
+    weapon: str
+    skin: str
+    wear: str
+
+
+def market_hash_name(weapon: str, skin: str, wear: str, stattrack: bool = False, star: bool = False) -> str:
+    """Steam's ``market_hash_name``, e.g. ``★ StatTrak™ Karambit | Doppler (Factory New)``."""
+    prefix = (STAR_PREFIX if star else "") + (STATTRAK_PREFIX if stattrack else "")
+    return f"{prefix}{weapon} | {skin} ({wear})"
+
+
+def wears_for_range(float_min: float, float_max: float) -> list[str]:
+    """Exteriors a skin can actually drop in, e.g. ``0.0 - 0.08`` gives Factory New and Minimal Wear."""
+    return [
+        wear for wear, (low, high) in WEAR_RANGES.items()
+        if float_min < high and float_max > low
+    ]
+
+
+async def catalog_variants(db: AsyncSession, skin_ids: list[uuid.UUID] | None = None) -> list[Variant]:
+    """
+    Every (skin, wear, stattrack) variant that exists on the market. Wears come
+    from the skin's float range; StatTrak™ versions only exist for skins that drop
+    from a case and for ★ items.
+    """
+    stmt = (
+        select(models.Skin.skin_id, models.Skin.name, models.Skin.float_min, models.Skin.float_max,
+               models.Skin.collection_id, models.Weapon.name, models.Rarity.name)
+        .join(models.Weapon, models.Skin.weapon_id == models.Weapon.weapon_id)
+        .join(models.Rarity, models.Skin.rarity_id == models.Rarity.rarity_id)
+    )
+    if skin_ids is not None:
+        stmt = stmt.where(models.Skin.skin_id.in_(skin_ids))
+    skins = (await db.execute(stmt)).all()
+    wear_ids = dict((await db.execute(select(models.WearType.name, models.WearType.wear_id))).all())
+    case_collections = set((await db.execute(select(models.Case.collection_id))).scalars())
+
+    variants = []
+    for skin_id, skin_name, float_min, float_max, collection_id, weapon_name, rarity_name in skins:
+        star = rarity_name == STAR_RARITY
+        stattrack_options = (False, True) if star or collection_id in case_collections else (False,)
+        for wear in wears_for_range(float_min, float_max):
+            if wear not in wear_ids:
+                continue
+            for stattrack in stattrack_options:
+                name = market_hash_name(weapon_name, skin_name, wear, stattrack, star)
+                variants.append(Variant(skin_id, wear_ids[wear], stattrack, name, weapon_name, skin_name, wear))
+    return variants
+
+
+async def rebuild_market_names(db: AsyncSession, skin_ids: list[uuid.UUID] | None = None) -> int:
+    """Regenerates the ``market_hash_names`` rows of ``skin_ids`` (all skins if ``None``)."""
+    rows = {
+        v.market_hash_name: {'market_hash_name': v.market_hash_name, 'skin_id': v.skin_id,
+                             'wear_id': v.wear_id, 'stattrack': v.stattrack}
+        for v in await catalog_variants(db, skin_ids)
+    }
+    table = models.MarketHashName
+    if skin_ids is None:
+        await db.execute(delete(table))
+    else:
+        await db.execute(delete(table).where(table.skin_id.in_(skin_ids)))
+    if rows:
+        await db.execute(insert(table), list(rows.values()))
+    return len(rows)
+
+
+async def build_market_name_index(db: AsyncSession) -> dict[str, CatalogKey]:
+    """Maps every market hash name to ``(skin_id, wear_id, stattrack)`` with one query."""
+    table = models.MarketHashName
+    return {
+        name: (skin_id, wear_id, stattrack)
+        for name, skin_id, wear_id, stattrack in await db.execute(
+            select(table.market_hash_name, table.skin_id, table.wear_id, table.stattrack)
+        )
+    }
+
+
+class MarketNameIndex(VersionedCache):
+    """In-memory copy of ``market_hash_names``, reloaded when the catalog version moves."""
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL):
+        super().__init__(check_interval)
+        self.index: dict[str, CatalogKey] = {}
+
+    async def load_snapshot(self, db: AsyncSession):
+        self.index = await build_market_name_index(db)
+
+    def get(self, name: str) -> CatalogKey | None:
+        return self.index.get(name)
+
+
+market_name_index = MarketNameIndex()
@@ -0,0 +1,58 @@
+import uuid
+from collections import defaultdict
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.services.catalog_cache import VERSION_CHECK_INTERVAL, VersionedCache
+
+
+class VariantInfo(NamedTuple):
+    variant_id: uuid.UUID
+    skin_id: uuid.UUID
+    paint_index: int
+    phase: str | None
+    float_min: float
+    float_max: float
+
+
+class PaintKitIndex(VersionedCache):
+    """
+    In-memory lookups over ``paint_kit_variants``: ``(skin_id, paint_index)`` and
+    ``(skin_id, phase)`` to the variant, so resolving the phase of an inspected
+    item or a phase-level quote is a dict lookup.
+    """
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL):
+        super().__init__(check_interval)
+        self.by_paint_index: dict[tuple[uuid.UUID, int], VariantInfo] = {}
+        self.by_phase: dict[tuple[uuid.UUID, str], VariantInfo] = {}
+        self.by_skin: dict[uuid.UUID, list[VariantInfo]] = {}
+
+    async def load_snapshot(self, db: AsyncSession):
+        v = models.PaintKitVariant
+        by_paint_index, by_phase, by_skin = {}, {}, defaultdict(list)
+        for row in await db.execute(
+            select(v.variant_id, v.skin_id, v.paint_index, v.phase, v.float_min, v.float_max)
+        ):
+            info = VariantInfo(*row)
+            by_paint_index[(info.skin_id, info.paint_index)] = info
+            if info.phase:
+                by_phase[(info.skin_id, info.phase)] = info
+            by_skin[info.skin_id].append(info)
+        self.by_paint_index, self.by_phase, self.by_skin = by_paint_index, by_phase, dict(by_skin)
+
+    def variant_for(self, skin_id: uuid.UUID, paint_index: int | None) -> VariantInfo | None:
+        """The variant of ``skin_id`` painted with ``paint_index``; a skin with a single variant needs no index."""
+        if paint_index is not None:
+            return self.by_paint_index.get((skin_id, paint_index))
+        variants = self.by_skin.get(skin_id)
+        return variants[0] if variants and len(variants) == 1 else None
+
+    def phase(self, skin_id: uuid.UUID, phase: str) -> VariantInfo | None:
+        return self.by_phase.get((skin_id, phase))
+
+
+paint_kit_index = PaintKitIndex()
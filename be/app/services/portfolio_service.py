@@ -0,0 +1,128 @@
+import uuid
+from array import array
+from collections import defaultdict
+from operator import itemgetter
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.core.config import settings
+from app.schemas.schemas import InventoryItemValueRead, PortfolioValueRead
+
+PriceKey = tuple[uuid.UUID, uuid.UUID | None, bool]
+
+
+def latest_prices_query(user_ids: list[uuid.UUID], currency: str):
+    """
+    Newest price for every (skin, wear, stattrack) that appears in the given
+    users' inventories: primary key lookups into ``skin_prices_latest``.
+    """
+    us = models.UserSkin
+    sp = models.SkinPriceLatest
+    keys = (
+        select(us.skin_id, us.wear_id, us.stattrack)
+        .where(us.user_id.in_(user_ids))
+        .distinct()
+        .cte("inventory_keys")
+    )
+    return (
+        select(sp.skin_id, sp.wear_id, sp.stattrack, sp.price)
+        .join(keys, (sp.skin_id == keys.c.skin_id) & (sp.wear_id == keys.c.wear_id)
+              & (sp.stattrack == keys.c.stattrack))
+        .where(sp.currency == currency)
+        .subquery("latest_prices")
+    )
+
+
+async def value_portfolios(
+    db: AsyncSession, user_ids: list[uuid.UUID], currency: str = settings.CANONICAL_CURRENCY, include_items: bool = True
+) -> dict[uuid.UUID, PortfolioValueRead]:
+    """Values the inventories of ``user_ids`` with one query, whatever their size."""
+    us = models.UserSkin
+    latest = latest_prices_query(user_ids, currency)
+    stmt = (
+        select(us.user_id, us.id, us.skin_id, us.wear_id, us.stattrack, latest.c.price)
+        .outerjoin(latest, (latest.c.skin_id == us.skin_id) & (latest.c.wear_id == us.wear_id)
+                   & (latest.c.stattrack == us.stattrack))
+        .where(us.user_id.in_(user_ids))
+    )
+
+    portfolios = {
+        user_id: PortfolioValueRead(user_id=user_id, currency=currency, total=0.0, priced_items=0, unpriced_items=0)
+        for user_id in user_ids
+    }
+    for user_id, user_skin_id, skin_id, wear_id, stattrack, price in await db.execute(stmt):
+        portfolio = portfolios[user_id]
+        if price is None:
+            portfolio.unpriced_items += 1
+        else:
+            portfolio.priced_items += 1
+            portfolio.total += price
+        if include_items:
+            portfolio.items.append(InventoryItemValueRead(
+                user_skin_id=user_skin_id, skin_id=skin_id, wear_id=wear_id, stattrack=stattrack, price=price,
+            ))
+    return portfolios
+
+
+async def value_portfolio(
+    db: AsyncSession, user_id: uuid.UUID, currency: str = settings.CANONICAL_CURRENCY
+) -> PortfolioValueRead:
+    return (await value_portfolios(db, [user_id], currency))[user_id]
+
+
+class PortfolioMatrix:
+    """
+    Inventories flattened into per-user arrays of price slots, one slot per
+    distinct (skin, wear, stattrack). Revaluing every inventory after a price
+    refresh is then a gather over a dense price vector instead of a query or
+    per-item dictionary lookups.
+    """
+
+    def __init__(self, inventories: dict[uuid.UUID, list[PriceKey]]):
+        self.slots: dict[PriceKey, int] = {}
+        self.user_ids: list[uuid.UUID] = []
+        self.user_slots: list[array] = []
+        for user_id, keys in inventories.items():
+            indexes = array('l', (self.slots.setdefault(key, len(self.slots)) for key in keys))
+            self.user_ids.append(user_id)
+            self.user_slots.append(indexes)
+
+    @classmethod
+    async def load(cls, db: AsyncSession, user_ids: list[uuid.UUID] | None = None) -> "PortfolioMatrix":
+        us = models.UserSkin
+        stmt = select(us.user_id, us.skin_id, us.wear_id, us.stattrack)
+        if user_ids is not None:
+            stmt = stmt.where(us.user_id.in_(user_ids))
+        inventories = defaultdict(list)
+        for user_id, skin_id, wear_id, stattrack in await db.execute(stmt):
+            inventories[user_id].append((skin_id, wear_id, stattrack))
+        return cls(inventories)
+
+    def price_vector(self, prices: dict[PriceKey, float]) -> array:
+        vector = array('d', bytes(8 * len(self.slots)))
+        for key, slot in self.slots.items():
+            price = prices.get(key)
+            if price is not None:
+                vector[slot] = price
+        return vector
+
+    def revalue(self, prices: dict[PriceKey, float]) -> dict[uuid.UUID, float]:
+        """Total value per user; unpriced items count as zero."""
+        vector = self.price_vector(prices)
+        totals = {}
+        for user_id, indexes in zip(self.user_ids, self.user_slots):
+            if len(indexes) == 0:
+                totals[user_id] = 0.0
+            elif len(indexes) == 1:
+                totals[user_id] = vector[indexes[0]]
+            else:
+                totals[user_id] = sum(itemgetter(*indexes)(vector))
+        return totals
+
+
+async def load_latest_prices(db: AsyncSession, currency: str = settings.CANONICAL_CURRENCY) -> dict[PriceKey, float]:
+    sp = models.SkinPriceLatest
+    stmt = select(sp.skin_id, sp.wear_id, sp.stattrack, sp.price).where(sp.currency == currency)
+    return {(skin_id, wear_id, stattrack): price for skin_id, wear_id, stattrack, price in await db.execute(stmt)}
@@ -0,0 +1,280 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.core.config import settings
+from app.schemas.schemas import PriceCandleRead, PriceStatsRead, PriceSummaryRead
+
+ROLLUPS = {
+    'hourly': (models.SkinPriceHourly, 'hour'),
+    'daily': (models.SkinPriceDaily, 'day'),
+}
+ROLLUP_EPOCH = datetime(1970, 1, 1)
+# Rows are rolled up only once they were ingested this long ago, so transactions that
+# were still in flight when a refresh ran are not skipped by the watermark.
+ROLLUP_LAG = timedelta(minutes=2)
+HOURLY_CHART_MAX_SPAN = timedelta(days=14)
+# Rolling statistics: period -> (length, rollup the statistics are computed from).
+STATS_PERIODS = {
+    '24h': (timedelta(hours=24), 'hourly'),
+    '7d': (timedelta(days=7), 'hourly'),
+    '30d': (timedelta(days=30), 'daily'),
+}
+PRICE_KEY_COLUMNS = ['skin_id', 'wear_id', 'stattrack', 'currency']
+DEFAULT_PARTITION = 'skin_prices_default'
+
+
+def partition_name(month_start: datetime) -> str:
+    return f"skin_prices_y{month_start.year}m{month_start.month:02d}"
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+async def _relation_exists(db: AsyncSession, name: str) -> bool:
+    return (await db.execute(text("SELECT to_regclass(:name)"), {'name': name})).scalar() is not None
+
+
+async def _create_partition(db: AsyncSession, month: datetime, following: datetime, has_default: bool):
+    bounds = {'start': month, 'end': following}
+    in_range = "updated_at >= :start AND updated_at < :end"
+    stranded = has_default and (await db.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"), bounds,
+    )).scalar()
+    if stranded:
+        await db.execute(text(f"ALTER TABLE skin_prices DETACH PARTITION {DEFAULT_PARTITION}"))
+    await db.execute(text(
+        f"CREATE TABLE {partition_name(month)} PARTITION OF skin_prices "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+    ))
+    if stranded:
+        columns = ', '.join(column.name for column in models.SkinPrice.__table__.columns)
+        await db.execute(text(f"""
+            WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} RETURNING {columns})
+            INSERT INTO skin_prices ({columns}) SELECT {columns} FROM moved
+        """), bounds)
+        await db.execute(text(f"ALTER TABLE skin_prices ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+
+async def ensure_partitions(db: AsyncSession, start: datetime | None = None, months_ahead: int = 3):
+    """
+    Creates the monthly ``skin_prices`` partitions from ``start`` up to
+    ``months_ahead`` months later. Rows of a month that arrived before its
+    partition sit in the default partition, and Postgres refuses to create a
+    partition over them: the default partition is then detached, the month's
+    rows moved into the new partition and the default reattached. The caller
+    commits; until then the detach holds ``skin_prices`` exclusively.
+    """
+    month = _month_start(start or datetime.utcnow())
+    has_default = await _relation_exists(db, DEFAULT_PARTITION)
+    for _ in range(months_ahead + 1):
+        following = _next_month(month)
+        if not await _relation_exists(db, partition_name(month)):
+            await _create_partition(db, month, following, has_default)
+        month = following
+
+
+def _rollup_sql(table: str, unit: str) -> str:
+    return f"""
+        INSERT INTO {table} AS t (
+            skin_id, wear_id, stattrack, currency, bucket_start,
+            open, high, low, close, samples, first_at, last_at
+        )
+        SELECT
+            skin_id, wear_id, stattrack, currency, date_trunc('{unit}', updated_at),
+            (array_agg(price ORDER BY updated_at))[1],
+            max(price),
+            min(price),
+            (array_agg(price ORDER BY updated_at DESC))[1],
+            count(*),
+            min(updated_at),
+            max(updated_at)
+        FROM skin_prices
+        WHERE ingested_at > :start AND ingested_at <= :end
+        GROUP BY skin_id, wear_id, stattrack, currency, date_trunc('{unit}', updated_at)
+        ON CONFLICT (skin_id, wear_id, stattrack, currency, bucket_start) DO UPDATE SET
+            open = CASE WHEN excluded.first_at < t.first_at THEN excluded.open ELSE t.open END,
+            close = CASE WHEN excluded.last_at >= t.last_at THEN excluded.close ELSE t.close END,
+            high = GREATEST(t.high, excluded.high),
+            low = LEAST(t.low, excluded.low),
+            samples = t.samples + excluded.samples,
+            first_at = LEAST(t.first_at, excluded.first_at),
+            last_at = GREATEST(t.last_at, excluded.last_at)
+    """
+
+
+async def refresh_rollups(db: AsyncSession, until: datetime | None = None) -> dict[str, int]:
+    """
+    Folds every price row ingested since each rollup's watermark into the hourly
+    and daily OHLC tables and advances the watermarks. The watermark is on
+    ``ingested_at`` rather than the quote time, so a late or backdated quote is
+    merged into its (older) bucket instead of being skipped. Returns the number
+    of buckets written per rollup. The caller commits.
+    """
+    until = until or datetime.utcnow() - ROLLUP_LAG
+    written = {}
+    for name, (model, unit) in ROLLUPS.items():
+        state = await db.get(models.PriceRollupState, name, with_for_update=True)
+        if state is None:
+            state = models.PriceRollupState(name=name, processed_until=ROLLUP_EPOCH)
+            db.add(state)
+        if state.processed_until >= until:
+            written[name] = 0
+            continue
+
+        result = await db.execute(
+            text(_rollup_sql(model.__tablename__, unit)),
+            {'start': state.processed_until, 'end': until},
+        )
+        written[name] = result.rowcount
+        state.processed_until = until
+    await db.flush()
+    return written
+
+
+async def upsert_latest_prices(db: AsyncSession, rows: list[dict]) -> int:
+    """
+    Moves ``skin_prices_latest`` forward to the newest of ``rows`` (dicts with the
+    price key, ``price`` and ``updated_at``). A row older than the stored price is
+    ignored, so out-of-order batches cannot move a price back. The caller commits.
+    """
+    newest = {}
+    for row in rows:
+        key = (row['skin_id'], row['wear_id'], row['stattrack'], row['currency'])
+        if key not in newest or row['updated_at'] >= newest[key]['updated_at']:
+            newest[key] = row
+    if not newest:
+        return 0
+    table = models.SkinPriceLatest.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=PRICE_KEY_COLUMNS,
+        set_={'price': stmt.excluded.price, 'updated_at': stmt.excluded.updated_at},
+        where=table.c.updated_at <= stmt.excluded.updated_at,
+    )
+    await db.execute(stmt, list(newest.values()))
+    return len(newest)
+
+
+def _stats_sql(table: str) -> str:
+    return f"""
+        INSERT INTO skin_price_stats AS s (
+            skin_id, wear_id, stattrack, currency, period,
+            min_price, max_price, median_price, volatility, samples, computed_at
+        )
+        SELECT
+            skin_id, wear_id, stattrack, currency, :period,
+            min(low),
+            max(high),
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY close),
+            coalesce(stddev_samp(log_return), 0),
+            sum(samples),
+            :now
+        FROM (
+            SELECT
+                skin_id, wear_id, stattrack, currency, low, high, close, samples,
+                ln(close / lag(close) OVER (
+                    PARTITION BY skin_id, wear_id, stattrack, currency ORDER BY bucket_start
+                )) AS log_return
+            FROM {table}
+            WHERE bucket_start >= :start AND close > 0
+        ) buckets
+        GROUP BY skin_id, wear_id, stattrack, currency
+        ON CONFLICT (skin_id, wear_id, stattrack, currency, period) DO UPDATE SET
+            min_price = excluded.min_price,
+            max_price = excluded.max_price,
+            median_price = excluded.median_price,
+            volatility = excluded.volatility,
+            samples = excluded.samples,
+            computed_at = excluded.computed_at
+    """
+
+
+async def refresh_price_stats(db: AsyncSession, now: datetime | None = None) -> dict[str, int]:
+    """
+    Recomputes the 24h/7d/30d min, max, median and volatility of every key from
+    the rollup tables, one statement per period, and drops statistics of keys
+    without prices in the period any more. The median is taken over bucket closes
+    and the volatility is the standard deviation of bucket-to-bucket log returns.
+    The caller commits.
+    """
+    now = now or datetime.utcnow()
+    written = {}
+    for period, (length, rollup) in STATS_PERIODS.items():
+        model, _ = ROLLUPS[rollup]
+        result = await db.execute(
+            text(_stats_sql(model.__tablename__)), {'period': period, 'now': now, 'start': now - length},
+        )
+        written[period] = result.rowcount
+        await db.execute(
+            text("DELETE FROM skin_price_stats WHERE period = :period AND computed_at < :now"),
+            {'period': period, 'now': now},
+        )
+    return written
+
+
+async def get_price_summaries(
+    db: AsyncSession, skin_id: uuid.UUID, currency: str = settings.CANONICAL_CURRENCY,
+) -> list[PriceSummaryRead]:
+    """Latest price and rolling statistics of every wear/StatTrak™ variant of a skin: two primary key lookups."""
+    latest, stats = models.SkinPriceLatest, models.SkinPriceStats
+    summaries = {
+        (row.wear_id, row.stattrack): PriceSummaryRead(
+            wear_id=row.wear_id, stattrack=row.stattrack, currency=currency,
+            price=row.price, updated_at=row.updated_at,
+        )
+        for row in (await db.execute(
+            select(latest).where(latest.skin_id == skin_id, latest.currency == currency)
+        )).scalars()
+    }
+    for row in (await db.execute(
+        select(stats).where(stats.skin_id == skin_id, stats.currency == currency)
+    )).scalars():
+        summary = summaries.get((row.wear_id, row.stattrack))
+        if summary is not None:
+            summary.stats[row.period] = PriceStatsRead.model_validate(row)
+    return list(summaries.values())
+
+
+async def get_price_chart(
+    db: AsyncSession,
+    skin_id: uuid.UUID,
+    wear_id: uuid.UUID,
+    stattrack: bool,
+    start: datetime,
+    end: datetime | None = None,
+    currency: str = settings.CANONICAL_CURRENCY,
+    resolution: str = "auto",
+) -> list[PriceCandleRead]:
+    """
+    Serves a price chart from the rollup tables. ``resolution`` is ``hourly``,
+    ``daily`` or ``auto`` (hourly for spans up to two weeks).
+    """
+    end = end or datetime.utcnow()
+    if resolution == "auto":
+        resolution = "hourly" if end - start <= HOURLY_CHART_MAX_SPAN else "daily"
+    model, _ = ROLLUPS[resolution]
+
+    stmt = (
+        select(model)
+        .where(
+            model.skin_id == skin_id,
+            model.wear_id == wear_id,
+            model.stattrack == stattrack,
+            model.currency == currency,
+            model.bucket_start >= start,
+            model.bucket_start <= end,
+        )
+        .order_by(model.bucket_start)
+    )
+    result = await db.execute(stmt)
+    return [PriceCandleRead.model_validate(row) for row in result.scalars().all()]
@@ -0,0 +1,203 @@
+import re
+import sys
+import heapq
+import uuid
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.services.catalog_cache import VERSION_CHECK_INTERVAL, VersionedCache
+from app.services.market_names import catalog_variants
+
+WEAR_ABBREVIATIONS = {
+    "Factory New": "fn",
+    "Minimal Wear": "mw",
+    "Field-Tested": "ft",
+    "Well-Worn": "ww",
+    "Battle-Scarred": "bs",
+}
+
+TOKEN_PATTERN = re.compile(r"\w+")
+DEFAULT_LIMIT = 20
+# Sorts after every other character: prefix + MAX_CHAR bounds the words starting with prefix.
+MAX_CHAR = chr(0x10FFFF)
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def search_document(weapon: str, skin: str, wear: str) -> str:
+    """
+    Lowercased words a user might type for one skin in one wear, including the
+    usual wear abbreviation ("ak redline ft"). Hyphenated weapon names also get
+    their joined form, so "ak" and "ak47" both find the AK-47.
+    """
+    words = tokenize(f"{weapon} {skin} {wear}")
+    words += [word.replace("-", "") for word in re.findall(r"\w+(?:-\w+)+", weapon.lower())]
+    if wear in WEAR_ABBREVIATIONS:
+        words.append(WEAR_ABBREVIATIONS[wear])
+    return " ".join(words)
+
+
+def prefix_tsquery(query: str) -> str | None:
+    tokens = tokenize(query)
+    return " & ".join(f"{token}:*" for token in tokens) if tokens else None
+
+
+async def rebuild_search_documents(db: AsyncSession, skin_ids: list[uuid.UUID] | None = None) -> int:
+    """
+    Replaces the search documents of ``skin_ids`` (all skins if ``None``): one per
+    skin and wear it can drop in. Returns the number of documents written.
+    """
+    rows = [
+        {
+            'skin_id': variant.skin_id,
+            'wear_id': variant.wear_id,
+            'market_hash_name': variant.market_hash_name,
+            'document': search_document(variant.weapon, variant.skin, variant.wear),
+        }
+        for variant in await catalog_variants(db, skin_ids)
+        if not variant.stattrack
+    ]
+
+    table = models.SkinSearchDocument
+    if skin_ids is None:
+        await db.execute(delete(table))
+    else:
+        await db.execute(delete(table).where(table.skin_id.in_(skin_ids)))
+    if rows:
+        await db.execute(insert(table), rows)
+    return len(rows)
+
+
+@dataclass
+class SearchHit:
+    skin_id: uuid.UUID
+    wear_id: uuid.UUID
+    market_hash_name: str
+    rank: float
+
+
+async def search_skins(db: AsyncSession, query: str, limit: int = DEFAULT_LIMIT) -> list[SearchHit]:
+    """
+    Ranked search over the search documents. Every word of the query must prefix a
+    word of the document (GIN on the tsvector). Only when that finds nothing, e.g.
+    for a misspelled query, trigram word similarity is tried (GIN on the document).
+    """
+    tsquery_text = prefix_tsquery(query)
+    if tsquery_text is None:
+        return []
+
+    doc = models.SkinSearchDocument
+    tsquery = func.to_tsquery('simple', tsquery_text)
+    rank = func.ts_rank_cd(doc.search_vector, tsquery)
+    stmt = (
+        select(doc.skin_id, doc.wear_id, doc.market_hash_name, rank.label('rank'))
+        .where(doc.search_vector.op('@@')(tsquery))
+        .order_by(rank.desc(), doc.market_hash_name)
+        .limit(limit)
+    )
+    hits = [SearchHit(*row) for row in await db.execute(stmt)]
+    if hits:
+        return hits
+
+    normalized = " ".join(tokenize(query))
+    similarity = func.word_similarity(normalized, doc.document)
+    stmt = (
+        select(doc.skin_id, doc.wear_id, doc.market_hash_name, similarity.label('rank'))
+        .where(literal(normalized).op('<%')(doc.document))
+        .order_by(similarity.desc(), doc.market_hash_name)
+        .limit(limit)
+    )
+    return [SearchHit(*row) for row in await db.execute(stmt)]
+
+
+class PrefixIndex:
+    """
+    The distinct document words in one sorted array, each with the ids of the
+    documents containing it. The words under a prefix are the contiguous slice
+    found by bisection, so memory grows with the distinct words rather than with
+    every prefix of every word.
+
+    Documents are numbered in result order (shortest name first), so a query
+    merges the id lists of its most selective word in ascending order, keeps the
+    documents whose words cover its other prefixes, and stops at ``limit``.
+    """
+
+    def __init__(self):
+        self.names: list[str] = []
+        self.keys: list[tuple[uuid.UUID, uuid.UUID]] = []
+        self.documents: list[tuple[str, ...]] = []
+        self._words: list[str] | None = None
+        self._doc_ids: list[list[int]] = []
+
+    def add(self, key: tuple[uuid.UUID, uuid.UUID], name: str, document: str):
+        self.names.append(name)
+        self.keys.append(key)
+        self.documents.append(tuple(sys.intern(word) for word in set(document.split())))
+        self._words = None
+
+    def _build(self):
+        order = sorted(range(len(self.names)), key=lambda doc_id: (len(self.names[doc_id]), self.names[doc_id]))
+        self.names = [self.names[doc_id] for doc_id in order]
+        self.keys = [self.keys[doc_id] for doc_id in order]
+        self.documents = [self.documents[doc_id] for doc_id in order]
+
+        postings: dict[str, list[int]] = {}
+        for doc_id, words in enumerate(self.documents):
+            for word in words:
+                postings.setdefault(word, []).append(doc_id)
+        self._words = sorted(postings)
+        self._doc_ids = [postings[word] for word in self._words]
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        if self._words is None:
+            self._build()
+        return bisect_left(self._words, prefix), bisect_left(self._words, prefix + MAX_CHAR)
+
+    def lookup(self, prefix: str) -> set[int]:
+        start, end = self._range(prefix)
+        return set().union(*self._doc_ids[start:end])
+
+    def complete(self, query: str, limit: int = DEFAULT_LIMIT) -> list[tuple[uuid.UUID, uuid.UUID, str]]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        ranges = {token: self._range(token) for token in tokens}
+        first, *rest = sorted(ranges, key=lambda token: sum(map(len, self._doc_ids[slice(*ranges[token])])))
+
+        found, previous = [], None
+        for doc_id in heapq.merge(*self._doc_ids[slice(*ranges[first])]):
+            if doc_id == previous:
+                continue
+            previous = doc_id
+            words = self.documents[doc_id]
+            if all(any(word.startswith(token) for word in words) for token in rest):
+                found.append(doc_id)
+                if len(found) == limit:
+                    break
+        return [(*self.keys[doc_id], self.names[doc_id]) for doc_id in found]
+
+
+class AutocompleteIndex(VersionedCache):
+    """In-memory prefix index over the search documents, rebuilt when the catalog version moves."""
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL):
+        super().__init__(check_interval)
+        self.index = PrefixIndex()
+
+    async def load_snapshot(self, db: AsyncSession):
+        doc = models.SkinSearchDocument
+        index = PrefixIndex()
+        for skin_id, wear_id, name, document in await db.execute(
+            select(doc.skin_id, doc.wear_id, doc.market_hash_name, doc.document)
+        ):
+            index.add((skin_id, wear_id), name, document)
+        self.index = index
+
+
+autocomplete_index = AutocompleteIndex()
@@ -1 +1,254 @@
+import time
+import uuid
+import asyncio
+from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
+from datetime import datetime
+from typing import Awaitable, Callable
 
+from app.db.session import SessionLocal
+from app.services.alert_service import AlertEngine
+from app.services.http_client import HttpClient
+from app.services.http_retry import RateLimiter, retry_with_backoff
+from app.services.catalog_cache import PRICES_VERSION_NAME, bump_catalog_version
+from app.services.currency_service import FxTable, fx_rates
+from app.services.market_names import build_market_name_index
+from app.services.price_history_service import (
+    ensure_partitions, refresh_price_stats, refresh_rollups, upsert_latest_prices,
+)
+
+PRICE_COLUMNS = ['price_id', 'skin_id', 'wear_id', 'stattrack', 'price', 'currency', 'original_price',
+                 'original_currency', 'updated_at']
+
+
+@dataclass(frozen=True)
+class PriceTarget:
+    skin_id: uuid.UUID
+    wear_id: uuid.UUID
+    stattrack: bool
+    market_hash_name: str
+
+
+@dataclass
+class Quote:
+    target: PriceTarget
+    price: float
+    currency: str
+    quoted_at: datetime
+    # Set once the quote is converted into the canonical currency.
+    original_price: float | None = None
+    original_currency: str | None = None
+
+
+@dataclass
+class IngestStats:
+    requested: int = 0
+    quotes: int = 0
+    written: int = 0
+    failed_batches: int = 0
+    failed_writes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def quotes_per_second(self) -> float:
+        return self.quotes / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"{self.quotes}/{self.requested} quotes, {self.written} written, "
+                f"{self.failed_batches} failed batches, {self.failed_writes} failed writes "
+                f"in {self.elapsed:.2f}s ({self.quotes_per_second:.0f} quotes/s)")
+
+
+class MarketSource(ABC):
+    name: str = "market"
+    requests_per_second: float = 5.0
+    batch_size: int = 50
+
+    def __init__(self):
+        self.limiter = RateLimiter(self.requests_per_second)
+
+    @abstractmethod
+    async def fetch(self, client: HttpClient, targets: list[PriceTarget]) -> list[Quote]:
+        ...
+
+
+class JsonMarketSource(MarketSource):
+    """
+    Source speaking the simple batch protocol of the fake market:
+    ``POST {base_url}/prices {"names": [...]}`` answered with
+    ``{"currency": "PLN", "prices": {name: price}}``. Unknown names are omitted.
+    """
+
+    def __init__(self, base_url: str, name: str = "json", requests_per_second: float = 5.0, batch_size: int = 50):
+        self.base_url = base_url.rstrip("/")
+        self.name = name
+        self.requests_per_second = requests_per_second
+        self.batch_size = batch_size
+        super().__init__()
+
+    async def fetch(self, client: HttpClient, targets: list[PriceTarget]) -> list[Quote]:
+        body = {"names": [target.market_hash_name for target in targets]}
+        data = await client.post_json(f"{self.base_url}/prices", body)
+        prices = data.get("prices", {})
+        currency = data.get("currency", "PLN")
+        now = datetime.utcnow()
+        return [
+            Quote(target, float(prices[target.market_hash_name]), currency, now)
+            for target in targets
+            if prices.get(target.market_hash_name) is not None
+        ]
+
+
+def normalize_quotes(quotes: list[Quote], fx: FxTable) -> list[Quote]:
+    """
+    The quotes converted into ``fx.canonical`` as one batch, each keeping the
+    price and currency it was quoted in. Quotes in a currency without a rate
+    are dropped.
+    """
+    unknown = Counter(q.currency for q in quotes if not fx.known(q.currency))
+    if unknown:
+        print(f"Error: dropping quotes without an FX rate: {dict(unknown)}")
+        quotes = [q for q in quotes if q.currency not in unknown]
+    prices = fx.normalize(array('d', (q.price for q in quotes)), [q.currency for q in quotes])
+    return [
+        Quote(q.target, price, fx.canonical, q.quoted_at, q.price, q.currency)
+        for q, price in zip(quotes, prices)
+    ]
+
+
+async def copy_quotes(quotes: list[Quote], alerts: AlertEngine | None = None, fx: FxTable | None = None) -> int:
+    """
+    Writes quotes to ``skin_prices`` with a single COPY on one pooled connection
+    and moves ``skin_prices_latest`` forward in the same transaction. With
+    ``alerts`` the alerts the quotes trigger fire in that transaction too. With
+    ``fx`` the quotes are normalized to the canonical currency first.
+    """
+    if fx is not None:
+        quotes = normalize_quotes(quotes, fx)
+    records = [
+        (uuid.uuid4(), q.target.skin_id, q.target.wear_id, q.target.stattrack, q.price, q.currency,
+         q.original_price, q.original_currency, q.quoted_at)
+        for q in quotes
+    ]
+    async with SessionLocal() as db:
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table('skin_prices', records=records, columns=PRICE_COLUMNS)
+        await upsert_latest_prices(db, [
+            {'skin_id': q.target.skin_id, 'wear_id': q.target.wear_id, 'stattrack': q.target.stattrack,
+             'currency': q.currency, 'price': q.price, 'updated_at': q.quoted_at}
+            for q in quotes
+        ])
+        fired = []
+        if alerts is not None:
+            fired = await alerts.process(db, (
+                ((q.target.skin_id, q.target.wear_id, q.target.stattrack, q.currency), q.price) for q in quotes
+            ))
+        await db.commit()
+    if fired:
+        # Only once committed: had the batch rolled back, its alerts must stay armed.
+        alerts.forget(fired)
+    return len(records)
+
+
+@dataclass
+class PriceIngestor:
+    """
+    Fetches quotes for ``targets`` from every source concurrently (bounded by
+    ``concurrency`` in-flight requests overall and each source's rate limit) and
+    streams them to ``sink`` in batches of ``flush_size``. Without a ``client``
+    each ``run`` opens its own and closes it when done.
+    """
+    sources: list[MarketSource]
+    concurrency: int = 16
+    flush_size: int = 5000
+    sink: Callable[[list[Quote]], Awaitable[int]] = copy_quotes
+    client: HttpClient | None = None
+
+    async def _fetch_batch(self, client: HttpClient, source: MarketSource, batch: list[PriceTarget],
+                           queue: asyncio.Queue, semaphore: asyncio.Semaphore, stats: IngestStats):
+        async with semaphore:
+            async def call():
+                await source.limiter.acquire()
+                return await source.fetch(client, batch)
+            try:
+                quotes = await retry_with_backoff(call)
+            except Exception as e:
+                print(f"Error: {source.name} batch of {len(batch)} failed: {e}")
+                stats.failed_batches += 1
+                return
+        stats.quotes += len(quotes)
+        await queue.put(quotes)
+
+    async def _flush(self, quotes: list[Quote], stats: IngestStats):
+        try:
+            stats.written += await self.sink(quotes)
+        except Exception as e:
+            print(f"Error: writing {len(quotes)} quotes failed: {e}")
+            stats.failed_writes += 1
+
+    async def _write(self, queue: asyncio.Queue, stats: IngestStats):
+        pending: list[Quote] = []
+        while True:
+            quotes = await queue.get()
+            if quotes is None:
+                break
+            pending.extend(quotes)
+            if len(pending) >= self.flush_size:
+                await self._flush(pending, stats)
+                pending = []
+        if pending:
+            await self._flush(pending, stats)
+
+    async def run(self, targets: list[PriceTarget]) -> IngestStats:
+        stats = IngestStats(requested=len(targets) * len(self.sources))
+        start = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        client = self.client or HttpClient()
+
+        writer = asyncio.create_task(self._write(queue, stats))
+        fetches = [
+            self._fetch_batch(client, source, targets[i:i + source.batch_size], queue, semaphore, stats)
+            for source in self.sources
+            for i in range(0, len(targets), source.batch_size)
+        ]
+        try:
+            await asyncio.gather(*fetches)
+        finally:
+            await queue.put(None)
+            await writer
+            if client is not self.client:
+                await client.close()
+
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+
+async def load_price_targets(db) -> list[PriceTarget]:
+    index = await build_market_name_index(db)
+    return [PriceTarget(skin_id, wear_id, stattrack, name) for name, (skin_id, wear_id, stattrack) in index.items()]
+
+
+async def ingest_prices(sources: list[MarketSource], concurrency: int = 16) -> IngestStats:
+    async with SessionLocal() as db:
+        targets = await load_price_targets(db)
+        alerts = await AlertEngine.load(db)
+        await ensure_partitions(db)
+        await db.commit()
+    fx = await fx_rates.get()
+
+    async with HttpClient() as client:
+        sink = partial(copy_quotes, alerts=alerts, fx=fx)
+        stats = await PriceIngestor(sources, concurrency, sink=sink, client=client).run(targets)
+
+    async with SessionLocal() as db:
+        await refresh_rollups(db)
+        await refresh_price_stats(db)
+        if stats.written:
+            await bump_catalog_version(db, PRICES_VERSION_NAME)
+        await db.commit()
+    return stats
@@ -0,0 +1,297 @@
+import heapq
+import uuid
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.models as models
+from app.core.config import settings
+from app.services.market_names import WEAR_RANGES
+from app.services.portfolio_service import PriceKey, load_latest_prices
+
+CONTRACT_SIZE = 10
+# Covert is the last tier a contract of ten can produce; Contraband never comes out of one.
+MAX_OUTPUT_TIER = 6
+
+
+class InvalidTradeUp(ValueError):
+    pass
+
+
+class SkinInfo(NamedTuple):
+    skin_id: uuid.UUID
+    collection_id: uuid.UUID
+    tier: int
+    float_min: float
+    float_max: float
+
+
+@dataclass
+class TradeUpInput:
+    skin_id: uuid.UUID
+    float_value: float
+    stattrack: bool = False
+
+
+@dataclass
+class TradeUpOutcome:
+    skin_id: uuid.UUID
+    collection_id: uuid.UUID
+    probability: float
+    float_value: float
+    wear: str
+    price: float | None
+
+
+@dataclass
+class TradeUpResult:
+    stattrack: bool
+    average_float: float
+    inputs_cost: float
+    expected_value: float
+    unpriced: int
+    outcomes: list[TradeUpOutcome] = field(default_factory=list)
+
+    @property
+    def profit(self) -> float:
+        return self.expected_value - self.inputs_cost
+
+
+@dataclass(order=True)
+class TradeUpCandidate:
+    """``count`` copies of each ``(skin_id, wear)`` in ``inputs``; any float of that wear is good enough."""
+    profit: float
+    expected_value: float = field(compare=False)
+    inputs_cost: float = field(compare=False)
+    tier: int = field(compare=False)
+    stattrack: bool = field(compare=False)
+    inputs: list[tuple[uuid.UUID, str, int]] = field(compare=False, default_factory=list)
+
+
+def wear_for_float(value: float) -> str:
+    for wear, (low, high) in WEAR_RANGES.items():
+        if value < high:
+            return wear
+    return wear
+
+
+def normalize_float(value: float, float_min: float, float_max: float) -> float:
+    """Position of ``value`` inside the skin's float range, 0.0 to 1.0."""
+    if float_max <= float_min:
+        return 0.0
+    return (value - float_min) / (float_max - float_min)
+
+
+def output_float(average_normalized: float, float_min: float, float_max: float) -> float:
+    """The CS2 rule: the average normalized input float, mapped into the output's float range."""
+    return float_min + average_normalized * (float_max - float_min)
+
+
+class EvCurve:
+    """
+    Mean price of a collection's outputs as a function of the average normalized
+    input float. Every output changes wear at a few fixed points, so the curve is
+    a step function: ``values[i]`` holds between ``breaks[i]`` and ``breaks[i + 1]``.
+    ``size`` is the number of outputs the mean is taken over.
+    """
+
+    def __init__(self, outputs: list[SkinInfo], price):
+        self.size = len(outputs)
+        points = {0.0}
+        for skin in outputs:
+            for low, _ in WEAR_RANGES.values():
+                point = normalize_float(low, skin.float_min, skin.float_max)
+                if 0.0 < point < 1.0:
+                    points.add(point)
+        self.breaks = array('d', sorted(points))
+        ends = list(self.breaks[1:]) + [1.0]
+        self.values = array('d')
+        for start, end in zip(self.breaks, ends):
+            middle = (start + end) / 2
+            total = 0.0
+            for skin in outputs:
+                total += price(skin.skin_id, wear_for_float(output_float(middle, skin.float_min, skin.float_max))) or 0.0
+            self.values.append(total / len(outputs))
+
+    def __call__(self, average_normalized: float) -> float:
+        return self.values[bisect_right(self.breaks, average_normalized) - 1]
+
+
+class InputOption(NamedTuple):
+    skin_id: uuid.UUID
+    wear: str
+    normalized: float
+    price: float
+
+
+class TradeUpCatalog:
+    """
+    Skins grouped by collection and rarity tier, with the latest price of every
+    (skin, wear, stattrack). ``evaluate`` prices one contract; ``search`` ranks
+    contracts across the whole catalog from per-collection step curves.
+    """
+
+    def __init__(self, skins: list[SkinInfo], wear_ids: dict[str, uuid.UUID], prices: dict[PriceKey, float]):
+        self.skins = {skin.skin_id: skin for skin in skins}
+        self.wear_ids = wear_ids
+        self.prices = prices
+        self.by_group: dict[tuple[uuid.UUID, int], list[SkinInfo]] = defaultdict(list)
+        for skin in skins:
+            self.by_group[(skin.collection_id, skin.tier)].append(skin)
+
+    @classmethod
+    async def load(cls, db: AsyncSession, currency: str = settings.CANONICAL_CURRENCY) -> "TradeUpCatalog":
+        s, r = models.Skin, models.Rarity
+        rows = await db.execute(
+            select(s.skin_id, s.collection_id, r.tier, s.float_min, s.float_max)
+            .join(r, s.rarity_id == r.rarity_id)
+            .where(s.collection_id.is_not(None), r.tier.is_not(None))
+        )
+        wear_ids = dict((await db.execute(select(models.WearType.name, models.WearType.wear_id))).all())
+        return cls([SkinInfo(*row) for row in rows], wear_ids, await load_latest_prices(db, currency))
+
+    def price(self, skin_id: uuid.UUID, wear: str, stattrack: bool = False) -> float | None:
+        return self.prices.get((skin_id, self.wear_ids.get(wear), stattrack))
+
+    def outputs(self, collection_id: uuid.UUID, tier: int) -> list[SkinInfo]:
+        return self.by_group.get((collection_id, tier + 1), []) if tier < MAX_OUTPUT_TIER else []
+
+    def evaluate(self, inputs: list[TradeUpInput]) -> TradeUpResult:
+        if len(inputs) != CONTRACT_SIZE:
+            raise InvalidTradeUp(f"a trade-up takes exactly {CONTRACT_SIZE} inputs")
+        skins = []
+        for item in inputs:
+            skin = self.skins.get(item.skin_id)
+            if skin is None:
+                raise InvalidTradeUp(f"skin {item.skin_id} cannot be traded up")
+            if not skin.float_min <= item.float_value <= skin.float_max:
+                raise InvalidTradeUp(f"float {item.float_value} is outside the range of skin {item.skin_id}")
+            if not self.outputs(skin.collection_id, skin.tier):
+                raise InvalidTradeUp(f"skin {item.skin_id} has no higher rarity in its collection")
+            skins.append(skin)
+        if len({skin.tier for skin in skins}) != 1:
+            raise InvalidTradeUp("all inputs must share a rarity")
+        if len({item.stattrack for item in inputs}) != 1:
+            raise InvalidTradeUp("StatTrak™ and normal inputs cannot be mixed")
+
+        stattrack = inputs[0].stattrack
+        average = sum(
+            normalize_float(item.float_value, skin.float_min, skin.float_max) for item, skin in zip(inputs, skins)
+        ) / CONTRACT_SIZE
+        result = TradeUpResult(stattrack=stattrack, average_float=average, inputs_cost=0.0,
+                               expected_value=0.0, unpriced=0)
+        for item in inputs:
+            price = self.price(item.skin_id, wear_for_float(item.float_value), stattrack)
+            if price is None:
+                result.unpriced += 1
+            else:
+                result.inputs_cost += price
+
+        # Each input adds every output of its collection to one pool and the result is
+        # drawn from the pool, so an output's odds are its collection's input count
+        # over the pool size: collections with fewer outputs give each one better odds.
+        counts = Counter(skin.collection_id for skin in skins)
+        outputs = {collection_id: self.outputs(collection_id, skins[0].tier) for collection_id in counts}
+        pool = sum(count * len(outputs[collection_id]) for collection_id, count in counts.items())
+        for collection_id, count in counts.items():
+            probability = count / pool
+            for skin in outputs[collection_id]:
+                value = output_float(average, skin.float_min, skin.float_max)
+                wear = wear_for_float(value)
+                price = self.price(skin.skin_id, wear, stattrack)
+                if price is None:
+                    result.unpriced += 1
+                else:
+                    result.expected_value += probability * price
+                result.outcomes.append(TradeUpOutcome(skin.skin_id, collection_id, probability, value, wear, price))
+        return result
+
+    def input_options(self, collection_id: uuid.UUID, tier: int, stattrack: bool) -> list[InputOption]:
+        """
+        The cheapest priced input of the collection per wear, assuming the worst
+        float of that wear. Options that are both pricier and higher than another
+        are dropped, so what remains is sorted by float and falling in price.
+        """
+        cheapest = {}
+        for skin in self.by_group.get((collection_id, tier), []):
+            for wear, (low, high) in WEAR_RANGES.items():
+                if low >= skin.float_max or high <= skin.float_min:
+                    continue
+                price = self.price(skin.skin_id, wear, stattrack)
+                if price is None:
+                    continue
+                normalized = normalize_float(min(high, skin.float_max), skin.float_min, skin.float_max)
+                option = InputOption(skin.skin_id, wear, normalized, price)
+                if wear not in cheapest or option.price < cheapest[wear].price:
+                    cheapest[wear] = option
+        options = []
+        for option in sorted(cheapest.values(), key=lambda o: (o.normalized, o.price)):
+            if not options or option.price < options[-1].price:
+                options.append(option)
+        return options
+
+    def search(
+        self, min_profit: float = 0.0, limit: int = 50, tiers: list[int] | None = None,
+        stattrack_options: tuple[bool, ...] = (False, True),
+    ) -> list[TradeUpCandidate]:
+        """
+        Ranks contracts made of one or two collections, ``k`` inputs from the first
+        and ``10 - k`` from the second, over every non-dominated input wear of each;
+        each pair of inputs is reported with its most profitable ``k``. The expected
+        value of a mix is read off the two collections' ``EvCurve`` at the mixed
+        average float, weighted by each collection's share of the outcome pool.
+        """
+        best: list[TradeUpCandidate] = []
+        tiers = tiers or sorted({tier for _, tier in self.by_group if tier < MAX_OUTPUT_TIER})
+        for stattrack in stattrack_options:
+            def price(skin_id, wear):
+                return self.price(skin_id, wear, stattrack)
+
+            for tier in tiers:
+                groups = []
+                for collection_id, group_tier in self.by_group:
+                    outputs = self.outputs(collection_id, group_tier) if group_tier == tier else None
+                    if not outputs:
+                        continue
+                    options = self.input_options(collection_id, tier, stattrack)
+                    if options:
+                        groups.append((EvCurve(outputs, price), options))
+
+                def offer(profit, ev, cost, inputs):
+                    candidate = TradeUpCandidate(profit, ev, cost, tier, stattrack, inputs)
+                    if len(best) < limit:
+                        heapq.heappush(best, candidate)
+                    else:
+                        heapq.heappushpop(best, candidate)
+
+                for curve, options in groups:
+                    for option in options:
+                        cost = CONTRACT_SIZE * option.price
+                        ev = curve(option.normalized)
+                        if ev - cost >= min_profit:
+                            offer(ev - cost, ev, cost, [(option.skin_id, option.wear, CONTRACT_SIZE)])
+
+                for (curve_a, options_a), (curve_b, options_b) in combinations(groups, 2):
+                    for a in options_a:
+                        for b in options_b:
+                            # Only the best split of each pair of inputs is kept.
+                            top = None
+                            for k in range(1, CONTRACT_SIZE):
+                                rest = CONTRACT_SIZE - k
+                                average = (k * a.normalized + rest * b.normalized) / CONTRACT_SIZE
+                                pool = k * curve_a.size + rest * curve_b.size
+                                ev = (k * curve_a.size * curve_a(average)
+                                      + rest * curve_b.size * curve_b(average)) / pool
+                                cost = k * a.price + rest * b.price
+                                if top is None or ev - cost > top[0]:
+                                    top = (ev - cost, ev, cost, k)
+                            profit, ev, cost, k = top
+                            if profit >= min_profit and (len(best) < limit or profit > best[0].profit):
+                                offer(profit, ev, cost, [(a.skin_id, a.wear, k), (b.skin_id, b.wear, CONTRACT_SIZE - k)])
+        return sorted(best, reverse=True)
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+# Importing app.core.config requires database settings; only the tests using ``db`` connect with them.
+for name, value in {
+    'POSTGRES_USER': 'postgres',
+    'POSTGRES_PASSWORD': 'postgres',
+    'POSTGRES_SERVER': 'localhost',
+    'POSTGRES_PORT': '5432',
+    'POSTGRES_DB': 'cs2',
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+async def db():
+    """A session on the seeded development database; tests using it are skipped without one."""
+    import app.db.session as session
+    import app.models as models
+    from sqlalchemy import select
+
+    try:
+        async with session.SessionLocal() as db:
+            if not (await db.execute(select(models.Skin.skin_id).limit(1))).first():
+                pytest.skip("catalog is not seeded")
+            yield db
+    except OSError as e:
+        pytest.skip(f"database not reachable: {e}")
+    finally:
+        # Pooled connections belong to this test's event loop.
+        await session.engine.dispose()
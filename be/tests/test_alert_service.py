@@ -0,0 +1,54 @@
+import uuid
+
+from app.services.alert_service import ALERT_ABOVE, ALERT_BELOW, AlertBook, AlertIndex
+
+KEY = (uuid.uuid4(), uuid.uuid4(), False, "PLN")
+
+
+def index_of(*alerts) -> tuple[AlertIndex, list[uuid.UUID]]:
+    ids = [uuid.uuid4() for _ in alerts]
+    return AlertIndex.build((alert_id, KEY, direction, threshold)
+                            for alert_id, (direction, threshold) in zip(ids, alerts)), ids
+
+
+def test_book_fires_on_crossing_and_at_the_threshold():
+    book = AlertBook()
+    low, high = uuid.uuid4(), uuid.uuid4()
+    book.add(low, ALERT_BELOW, 10.0)
+    book.add(high, ALERT_ABOVE, 20.0)
+
+    assert book.triggered(15.0) == []
+    assert book.triggered(10.0) == [(low, ALERT_BELOW, 10.0)]
+    assert book.triggered(25.0) == [(high, ALERT_ABOVE, 20.0)]
+    assert len(book) == 2
+
+
+def test_match_leaves_the_index_until_removed():
+    index, (cheap, cheaper, pricey) = index_of((ALERT_BELOW, 10.0), (ALERT_BELOW, 5.0), (ALERT_ABOVE, 50.0))
+
+    fired = index.match([(KEY, 8.0)])
+    assert [alert.alert_id for alert in fired] == [cheap]
+    # Not removed yet, as after a rolled-back write: the alert fires again.
+    assert [alert.alert_id for alert in index.match([(KEY, 8.0)])] == [cheap]
+
+    index.remove(fired)
+    assert index.match([(KEY, 8.0)]) == []
+    assert len(index) == 2
+
+
+def test_each_alert_fires_once_per_batch_with_its_first_price():
+    index, (cheap, cheaper, _) = index_of((ALERT_BELOW, 10.0), (ALERT_BELOW, 5.0), (ALERT_ABOVE, 50.0))
+
+    fired = index.match([(KEY, 9.0), (KEY, 4.0), (KEY, 3.0)])
+    assert {(alert.alert_id, alert.price) for alert in fired} == {(cheap, 9.0), (cheaper, 4.0)}
+    assert len(fired) == 2
+
+
+def test_remove_keeps_alerts_added_after_the_match():
+    index, (cheap,) = index_of((ALERT_BELOW, 10.0))
+    fired = index.match([(KEY, 1.0)])
+    late = uuid.uuid4()
+    index.add(late, KEY, ALERT_BELOW, 20.0)
+
+    index.remove(fired)
+    assert [alert.alert_id for alert in index.match([(KEY, 1.0)])] == [late]
@@ -0,0 +1,33 @@
+from array import array
+
+import pytest
+
+from app.services.currency_service import FxTable, UnknownCurrency
+
+
+@pytest.fixture
+def fx():
+    # One EUR buys 4 PLN or 1.25 USD.
+    return FxTable("PLN", "EUR", {"pln": 4.0, "USD": 1.25})
+
+
+def test_factors_convert_into_the_canonical_currency(fx):
+    assert fx.factor("PLN") == 1.0
+    assert fx.factor("eur") == 4.0
+    assert fx.convert(10.0, "USD") == pytest.approx(32.0)
+
+
+def test_normalize_converts_a_batch_row_by_row(fx):
+    prices = fx.normalize(array('d', [1.0, 2.0, 10.0]), ["PLN", "EUR", "usd"])
+    assert prices.tolist() == pytest.approx([1.0, 8.0, 32.0])
+
+
+def test_unknown_currency(fx):
+    assert not fx.known("GBP")
+    with pytest.raises(UnknownCurrency):
+        fx.normalize(array('d', [1.0]), ["GBP"])
+
+
+def test_without_a_rate_for_the_canonical_currency_only_it_converts():
+    fx = FxTable("PLN", "EUR", {"USD": 1.25})
+    assert fx.known("PLN") and not fx.known("EUR")
@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+import app.models as models
+from app.db.instrumentation import count_queries
+from app.db.upsert import bulk_upsert
+from app.services.catalog_service import (
+    SKIN_ORDERINGS, InvalidCursor, decode_cursor, encode_cursor, keyset_page, list_weapons,
+)
+
+
+def rarity(name: str, color_hex: str = "#000000", tier: int | None = None) -> dict:
+    return {'rarity_id': uuid.uuid4(), 'name': name, 'color_hex': color_hex, 'tier': tier}
+
+
+def test_cursor_round_trip():
+    columns = SKIN_ORDERINGS['name']
+    skin_id = uuid.uuid4()
+    cursor = encode_cursor(["AK-47 | Redline", skin_id])
+    assert "=" not in cursor
+    assert decode_cursor(cursor, columns) == ["AK-47 | Redline", skin_id]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor(["only one value"]), encode_cursor(["a", "nope"])])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, SKIN_ORDERINGS['name'])
+
+
+@pytest.mark.anyio
+async def test_bulk_upsert_dedupes_chunks_and_skips_unchanged_rows(db):
+    first, last = rarity("test-a", "#111111"), rarity("test-a", "#222222")
+    rows = [first, rarity("test-b"), rarity("test-c"), last, rarity("test-d"), rarity("test-e")]
+    try:
+        # Five distinct names in chunks of two: three INSERTs.
+        with count_queries("upsert", strict=False) as counter:
+            result = await bulk_upsert(db, models.Rarity, rows, ['name'], ['color_hex', 'tier'], chunk_size=2)
+        assert counter.total == 3
+        assert (result.inserted, result.updated, result.unchanged) == (5, 0, 0)
+        # The last of the duplicate rows wins.
+        assert result.ids[("test-a",)] == last['rarity_id']
+        color = (await db.execute(select(models.Rarity.color_hex).where(models.Rarity.name == "test-a"))).scalar_one()
+        assert color == "#222222"
+
+        again = [rarity("test-a", "#222222"), rarity("test-b", "#333333"), rarity("test-c")]
+        result = await bulk_upsert(db, models.Rarity, again, ['name'], ['color_hex', 'tier'])
+        assert (result.inserted, result.updated, result.unchanged) == (0, 1, 2)
+        # Unchanged rows are looked up, so every key still maps to its existing id.
+        assert result.ids[("test-a",)] == last['rarity_id']
+        assert result.ids[("test-c",)] == rows[2]['rarity_id']
+    finally:
+        await db.rollback()
+
+
+@pytest.mark.anyio
+async def test_keyset_pages_cover_every_row_once(db):
+    expected = (await db.execute(select(models.Weapon.name).order_by(models.Weapon.name))).scalars().all()
+    names, cursor = [], None
+    while True:
+        rows, cursor = await list_weapons(db, cursor, limit=7)
+        names += [row.name for row in rows]
+        if cursor is None:
+            break
+    assert names == expected
+
+    stmt = select(models.Weapon)
+    rows, _ = await keyset_page(db, stmt, (models.Weapon.name,), encode_cursor([expected[-1]]), limit=7)
+    assert rows == []
@@ -0,0 +1,52 @@
+import uuid
+
+from app.services.float_analytics import FloatIndex, FloatItem
+
+SKIN_A, SKIN_B, SKIN_C = sorted(uuid.uuid4() for _ in range(3))
+
+
+def index_of(*items) -> tuple[FloatIndex, list[uuid.UUID]]:
+    index, ids = FloatIndex(), []
+    for skin_id, value in items:
+        ids.append(uuid.uuid4())
+        index.add(skin_id, ids[-1], value)
+    return index, ids
+
+
+def test_minima_follow_adds_and_removes():
+    index, (a1, a2, b1) = index_of((SKIN_A, 0.30), (SKIN_A, 0.10), (SKIN_B, 0.20))
+    assert index.minima == [(0.10, SKIN_A), (0.20, SKIN_B)]
+
+    index.remove(SKIN_A, a2, 0.10)
+    assert index.minima == [(0.20, SKIN_B), (0.30, SKIN_A)]
+
+    index.remove(SKIN_B, b1, 0.20)
+    assert index.minima == [(0.30, SKIN_A)]
+    assert SKIN_B not in index.skins
+
+
+def test_lowest_overall_merges_skins_in_float_order():
+    index, (a1, a2, b1, b2, c1) = index_of(
+        (SKIN_A, 0.01), (SKIN_A, 0.50), (SKIN_B, 0.02), (SKIN_B, 0.03), (SKIN_C, 0.90),
+    )
+
+    assert index.lowest_overall(3) == [
+        FloatItem(0.01, a1, SKIN_A), FloatItem(0.02, b1, SKIN_B), FloatItem(0.03, b2, SKIN_B),
+    ]
+    assert [item.row_id for item in index.lowest_overall(10, below=0.5)] == [a1, b1, b2]
+    assert [item.row_id for item in index.lowest_overall(10, skin_ids=[SKIN_C, SKIN_A])] == [a1, a2, c1]
+    assert index.lowest_overall(10, below=0.01) == []
+
+
+def test_rank_and_count_between():
+    index, _ = index_of((SKIN_A, 0.05), (SKIN_A, 0.10), (SKIN_A, 0.10), (SKIN_A, 0.30), (SKIN_B, 0.01))
+
+    # One item is strictly lower, one of the four is higher.
+    assert index.rank(SKIN_A, 0.10) == (1, 4, 25.0)
+    assert index.rank(SKIN_A, 0.01) == (0, 4, 100.0)
+    assert index.rank(SKIN_C, 0.5) == (0, 0, 0.0)
+
+    assert index.count_between(SKIN_A, 0.0, 0.07) == 1
+    assert index.count_between(SKIN_A, 0.10, 0.30) == 2
+    assert index.count_between(SKIN_A, 0.0, 1.0) == 4
+    assert sum(index.histogram(SKIN_A)) == 4
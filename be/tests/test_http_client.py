@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from app.services.http_client import HttpClient, HttpProtocolError
+
+pytestmark = pytest.mark.anyio
+
+
+async def read_request(reader: asyncio.StreamReader) -> bytes:
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = next((int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                   if line.lower().startswith(b"content-length:")), 0)
+    return head + await reader.readexactly(length)
+
+
+class Server:
+    """Answers every request on a connection with the next of ``responses``; ``close_after`` ends the connection."""
+
+    def __init__(self, responses: list[bytes], close_after: int | None = None):
+        self.responses = responses
+        self.close_after = close_after
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        served = 0
+        try:
+            while self.responses:
+                await read_request(reader)
+                writer.write(self.responses.pop(0))
+                await writer.drain()
+                served += 1
+                if served == self.close_after:
+                    break
+        except asyncio.IncompleteReadError:
+            pass
+        writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+
+def response(body: bytes = b"{}", extra: bytes = b"") -> bytes:
+    return b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n%s\r\n%s" % (len(body), extra, body)
+
+
+async def test_chunked_trailers_are_consumed_before_reuse():
+    chunked = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\n[1,\r\n2\r\n2]\r\n0\r\nX-Checksum: abc\r\n\r\n"
+    async with Server([chunked, response(b'"next"')]) as server, HttpClient() as client:
+        assert await client.get_json(server.url) == [1, 2]
+        assert await client.get_json(server.url) == "next"
+    assert server.connections == 1
+
+
+async def test_body_without_length_runs_to_eof():
+    async with Server([b"HTTP/1.1 200 OK\r\n\r\n[3]", response(b"[4]")], close_after=1) as server, \
+            HttpClient() as client:
+        assert await client.get_json(server.url) == [3]
+        assert await client.get_json(server.url) == [4]
+    assert server.connections == 2
+
+
+async def test_malformed_status_line():
+    async with Server([b"garbage\r\n\r\n"]) as server, HttpClient() as client:
+        with pytest.raises(HttpProtocolError):
+            await client.get_json(server.url)
+
+
+async def test_connection_closed_while_idle_is_replaced():
+    async with Server([response(b"1"), response(b"2")], close_after=1) as server, HttpClient() as client:
+        assert await client.get_json(server.url) == 1
+        # Let the server's close land on the pooled connection.
+        await asyncio.sleep(0.05)
+        assert await client.post_json(server.url, {"names": []}) == 2
+    assert server.connections == 2
+
+
+async def test_connect_is_bounded_by_the_timeout():
+    class SlowConnect(HttpClient):
+        async def _open(self, origin):
+            await asyncio.sleep(10)
+
+    async with SlowConnect(max_connections_per_host=1, timeout=0.05) as client:
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get_json("http://127.0.0.1:9/")
+        # The per-host slot was released.
+        assert client._slots[("http", "127.0.0.1", 9)]._value == 1
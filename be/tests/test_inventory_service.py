@@ -0,0 +1,26 @@
+import uuid
+
+from app.services.inventory_service import diff_inventory
+
+SKIN, WEAR = uuid.uuid4(), uuid.uuid4()
+
+
+def key(float_value: float | None = None, stattrack: bool = False):
+    return SKIN, WEAR, stattrack, float_value, None
+
+
+def test_diff_keeps_matching_rows_and_counts_duplicates():
+    rows = [(uuid.uuid4(), key()), (uuid.uuid4(), key()), (uuid.uuid4(), key(0.1))]
+
+    to_delete, to_insert, unchanged = diff_inventory(rows, [key(), key(0.1), key(0.1)])
+
+    # One of the two identical rows goes, the second 0.1 item is new.
+    assert to_delete == [rows[1][0]]
+    assert to_insert == [key(0.1)]
+    assert unchanged == 2
+
+
+def test_diff_against_nothing():
+    rows = [(uuid.uuid4(), key(stattrack=True))]
+    assert diff_inventory(rows, []) == ([rows[0][0]], [], 0)
+    assert diff_inventory([], [key(), key()]) == ([], [key(), key()], 0)
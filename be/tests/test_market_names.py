@@ -0,0 +1,15 @@
+from app.services.market_names import market_hash_name, wears_for_range
+
+
+def test_market_hash_name_prefixes():
+    assert market_hash_name("AK-47", "Redline", "Field-Tested") == "AK-47 | Redline (Field-Tested)"
+    assert (market_hash_name("Karambit", "Doppler", "Factory New", stattrack=True, star=True)
+            == "★ StatTrak™ Karambit | Doppler (Factory New)")
+
+
+def test_wears_for_range():
+    assert wears_for_range(0.0, 1.0) == ["Factory New", "Minimal Wear", "Field-Tested", "Well-Worn", "Battle-Scarred"]
+    assert wears_for_range(0.0, 0.08) == ["Factory New", "Minimal Wear"]
+    # Bounds are lower-inclusive: a range ending at 0.07 never reaches Minimal Wear.
+    assert wears_for_range(0.0, 0.07) == ["Factory New"]
+    assert wears_for_range(0.38, 0.45) == ["Well-Worn"]
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text
+
+import app.models as models
+from app.core.config import settings
+from app.services.price_history_service import DEFAULT_PARTITION, ensure_partitions, partition_name, refresh_rollups
+
+pytestmark = pytest.mark.anyio
+
+FUTURE_MONTH = datetime(2040, 1, 1)
+
+
+async def test_partition_takes_over_rows_stranded_in_the_default(db):
+    skin_id = (await db.execute(select(models.Skin.skin_id).limit(1))).scalar_one()
+    wear_id = (await db.execute(select(models.WearType.wear_id).limit(1))).scalar_one()
+    try:
+        await db.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF skin_prices DEFAULT"))
+        db.add(models.SkinPrice(skin_id=skin_id, wear_id=wear_id, price=1.0, updated_at=FUTURE_MONTH.replace(day=9)))
+        await db.flush()
+
+        await ensure_partitions(db, start=FUTURE_MONTH, months_ahead=0)
+        placed = await db.execute(text(
+            "SELECT tableoid::regclass::text FROM skin_prices WHERE updated_at = :at"
+        ), {'at': FUTURE_MONTH.replace(day=9)})
+        assert placed.scalars().all() == [partition_name(FUTURE_MONTH)]
+        # The default partition is attached again.
+        default = await db.execute(text(
+            "SELECT 1 FROM pg_inherits WHERE inhrelid = CAST(:name AS regclass) AND inhparent = 'skin_prices'::regclass"
+        ), {'name': DEFAULT_PARTITION})
+        assert default.scalar() == 1
+    finally:
+        # Partitions are transactional DDL: rolling back leaves the schema as it was.
+        await db.rollback()
+
+
+async def test_backdated_quote_reaches_its_rollup_bucket(db):
+    skin_id = (await db.execute(select(models.Skin.skin_id).limit(1))).scalar_one()
+    wear_id = (await db.execute(select(models.WearType.wear_id).limit(1))).scalar_one()
+    try:
+        await refresh_rollups(db, until=datetime.utcnow())
+        state = await db.get(models.PriceRollupState, 'hourly')
+        # Quoted well before the watermark, but only now ingested.
+        quoted_at = state.processed_until - timedelta(days=3)
+        await ensure_partitions(db, start=quoted_at, months_ahead=0)
+        db.add(models.SkinPrice(skin_id=skin_id, wear_id=wear_id, price=1e9, updated_at=quoted_at))
+        await db.flush()
+
+        written = await refresh_rollups(db, until=datetime.utcnow())
+        assert written == {'hourly': 1, 'daily': 1}
+        hourly = await db.get(models.SkinPriceHourly, (
+            skin_id, wear_id, False, settings.CANONICAL_CURRENCY, quoted_at.replace(minute=0, second=0, microsecond=0),
+        ))
+        assert hourly.high == 1e9
+    finally:
+        await db.rollback()
@@ -0,0 +1,131 @@
+import json
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, delete, select, text
+
+import app.models as models
+from app.core.config import settings
+from app.db.instrumentation import QueryBudgetExceeded, count_queries
+from app.services.inventory_service import FixtureInventorySource, InventorySync
+from app.services.portfolio_service import value_portfolios
+
+STEAM_ID = "query-budget-test"
+
+
+@pytest.fixture
+def sqlite():
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+def run_selects(connection, n: int):
+    for i in range(n):
+        connection.execute(text("SELECT :i"), {"i": i})
+
+
+def test_exceeding_the_budget_raises(sqlite):
+    with pytest.raises(QueryBudgetExceeded, match="3 queries over a budget of 2"):
+        with count_queries("over budget", budget=2):
+            run_selects(sqlite, 3)
+
+
+def test_within_budget_or_lenient_does_not_raise(sqlite):
+    with count_queries("within budget", budget=3) as counter:
+        run_selects(sqlite, 3)
+    assert counter.total == 3
+
+    with count_queries("lenient", budget=1, strict=False) as counter:
+        run_selects(sqlite, 3)
+    assert counter.problems() == ["3 queries over a budget of 1"]
+
+
+def test_repeated_select_is_reported_as_n_plus_one(sqlite):
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1: 4x SELECT"):
+        with count_queries("n+1", threshold=4):
+            run_selects(sqlite, 4)
+
+
+def test_threshold_defaults_to_the_setting(sqlite, monkeypatch):
+    monkeypatch.setattr(settings, 'DB_N_PLUS_ONE_THRESHOLD', 3)
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1: 3x SELECT"):
+        with count_queries("n+1 from settings"):
+            run_selects(sqlite, 3)
+
+
+def test_counters_nest(sqlite):
+    with count_queries("outer") as outer:
+        run_selects(sqlite, 1)
+        with count_queries("inner") as inner:
+            run_selects(sqlite, 2)
+    assert (outer.total, inner.total) == (3, 2)
+
+
+# The budgets below are pinned against the seeded development database.
+
+@pytest.fixture
+async def client(db):
+    from app.main import app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/skins?limit=100", "/cases?limit=100", "/collections", "/weapons"])
+async def test_catalog_pages_take_two_queries(client, path):
+    # The catalog version for the ETag, then the page itself with its relations joined.
+    assert (await client.get(path)).status_code == 200
+    with count_queries(path, budget=2):
+        assert (await client.get(path)).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_skin_detail_queries_only_variants(client, db):
+    skin_id = (await db.execute(select(models.Skin.skin_id).limit(1))).scalar_one()
+    await client.get(f"/skins/{skin_id}")
+    with count_queries("skin detail", budget=1):
+        assert (await client.get(f"/skins/{skin_id}")).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_portfolio_valuation_is_one_query(db):
+    user_ids = (await db.execute(select(models.User.user_id).limit(50))).scalars().all()
+    with count_queries("portfolios", budget=1):
+        await value_portfolios(db, user_ids)
+
+
+@pytest.mark.anyio
+async def test_inventory_sync_is_constant_in_items(db, tmp_path):
+    names = (await db.execute(select(models.MarketHashName.market_hash_name).limit(200))).scalars().all()
+    user = models.User(steam_id=STEAM_ID, name=STEAM_ID)
+    db.add(user)
+    await db.flush()
+    user_id = user.user_id
+    await db.commit()
+
+    def write_inventory(count: int):
+        payload = {
+            'assets': [{'assetid': i, 'classid': i, 'instanceid': 0, 'float_value': i / count} for i in range(count)],
+            'descriptions': [{'classid': i, 'instanceid': 0, 'market_hash_name': names[i % len(names)]}
+                             for i in range(count)],
+        }
+        (tmp_path / f"{STEAM_ID}.json").write_text(json.dumps(payload))
+
+    sync = InventorySync(FixtureInventorySource(tmp_path))
+    await sync.load_index()
+    try:
+        for count in (200, 150):
+            write_inventory(count)
+            # The user lookup, then the user's sync.
+            with count_queries("inventory sync", budget=4):
+                result, = await sync.run([STEAM_ID])
+            assert result.error is None
+            # Existing rows, then one batched DELETE and one INSERT.
+            assert result.queries <= 3
+    finally:
+        await db.execute(delete(models.UserSkin).where(models.UserSkin.user_id == user_id))
+        await db.execute(delete(models.User).where(models.User.user_id == user_id))
+        await db.commit()
+
@@ -0,0 +1,10 @@
+from app.scripts.scripts import build_skin_rows
+from app.scripts.synthetic_game_data import write_game_data
+from app.services.market_names import STAR_RARITY
+
+
+def test_knife_finishes_are_star_rarity(tmp_path):
+    rows = build_skin_rows(write_game_data(tmp_path, paint_kits=12, item_sets=2))
+    rarities = {row['weapon']: row['rarity'] for row in rows}
+    assert rarities.pop('Karambit') == STAR_RARITY
+    assert STAR_RARITY not in rarities.values()
@@ -0,0 +1,34 @@
+import pytest
+
+from app.scripts.tokens import TokenIndex
+
+
+@pytest.fixture
+def index():
+    return TokenIndex({
+        'english': {'paintkit_a': 'Redline', 'paintkit_b': 'Asiimov'},
+        'polish': {'paintkit_a': 'Czerwona linia', 'paintkit_c': ''},
+    })
+
+
+def test_missing_translations_fall_back_to_the_default_locale(index):
+    assert index.resolve('#PaintKit_A', 'polish') == 'Czerwona linia'
+    assert index.resolve('#PaintKit_B', 'polish') == 'Asiimov'
+    assert index.resolve('#PaintKit_B') == 'Asiimov'
+    # An empty translation is still a translation.
+    assert index.resolve('#PaintKit_C', 'polish') == ''
+    assert index.resolve('#PaintKit_C') is None
+
+
+def test_batch_lookups_match_single_ones(index):
+    tokens = ['#PaintKit_A', None, '#PaintKit_B', '#missing']
+    assert index.resolve_many(tokens, 'polish') == [index.resolve(token, 'polish') for token in tokens]
+    assert index.resolve_localized(tokens) == {
+        'english': ['Redline', None, 'Asiimov', None],
+        'polish': ['Czerwona linia', None, 'Asiimov', None],
+    }
+
+
+def test_unknown_locale(index):
+    with pytest.raises(KeyError):
+        index.resolve('#PaintKit_A', 'klingon')
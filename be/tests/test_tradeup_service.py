@@ -0,0 +1,97 @@
+import uuid
+
+import pytest
+
+from app.services.tradeup_service import (
+    EvCurve, InvalidTradeUp, SkinInfo, TradeUpCatalog, TradeUpInput, output_float,
+)
+
+WEARS = ["Factory New", "Minimal Wear", "Field-Tested", "Well-Worn", "Battle-Scarred"]
+
+
+def skin(collection_id, tier, float_min=0.0, float_max=1.0) -> SkinInfo:
+    return SkinInfo(uuid.uuid4(), collection_id, tier, float_min, float_max)
+
+
+def catalog(skins, prices=None) -> TradeUpCatalog:
+    wear_ids = {wear: uuid.uuid4() for wear in WEARS}
+    return TradeUpCatalog(skins, wear_ids, {
+        (skin_id, wear_ids[wear], False): price for (skin_id, wear), price in (prices or {}).items()
+    })
+
+
+@pytest.fixture
+def asymmetric():
+    """Collection A has one output, collection B has five."""
+    a, b = uuid.uuid4(), uuid.uuid4()
+    inputs_a, inputs_b = skin(a, 3), skin(b, 3)
+    outputs_a = [skin(a, 4)]
+    outputs_b = [skin(b, 4) for _ in range(5)]
+    return inputs_a, inputs_b, outputs_a, outputs_b
+
+
+def test_outcomes_are_drawn_from_one_pool(asymmetric):
+    inputs_a, inputs_b, outputs_a, outputs_b = asymmetric
+    prices = {(output.skin_id, "Field-Tested"): 14.0 for output in outputs_a + outputs_b}
+    trade_up = catalog([inputs_a, inputs_b, *outputs_a, *outputs_b], prices)
+
+    result = trade_up.evaluate(
+        [TradeUpInput(inputs_a.skin_id, 0.2)] * 9 + [TradeUpInput(inputs_b.skin_id, 0.2)]
+    )
+
+    odds = {outcome.skin_id: outcome.probability for outcome in result.outcomes}
+    assert odds[outputs_a[0].skin_id] == pytest.approx(9 / 14)
+    for output in outputs_b:
+        assert odds[output.skin_id] == pytest.approx(1 / 14)
+    assert sum(odds.values()) == pytest.approx(1.0)
+    assert result.expected_value == pytest.approx(14.0)
+
+
+def test_output_float_follows_the_average_normalized_input():
+    collection_id = uuid.uuid4()
+    source = skin(collection_id, 3, 0.0, 0.5)
+    target = skin(collection_id, 4, 0.1, 0.3)
+    result = catalog([source, target]).evaluate([TradeUpInput(source.skin_id, 0.25)] * 10)
+
+    assert result.average_float == pytest.approx(0.5)
+    [outcome] = result.outcomes
+    assert outcome.float_value == pytest.approx(output_float(0.5, 0.1, 0.3))
+    assert outcome.wear == "Field-Tested"
+    # Ten unpriced inputs plus the unpriced outcome.
+    assert outcome.price is None and result.unpriced == 11
+
+
+def test_mixed_rarities_are_rejected():
+    collection_id = uuid.uuid4()
+    low, high, top = skin(collection_id, 3), skin(collection_id, 4), skin(collection_id, 5)
+    trade_up = catalog([low, high, top])
+    with pytest.raises(InvalidTradeUp):
+        trade_up.evaluate([TradeUpInput(low.skin_id, 0.5)] * 9 + [TradeUpInput(high.skin_id, 0.5)])
+    with pytest.raises(InvalidTradeUp):
+        trade_up.evaluate([TradeUpInput(low.skin_id, 0.5)] * 9)
+
+
+def test_ev_curve_steps_at_wear_boundaries():
+    output = skin(uuid.uuid4(), 4)
+    curve = EvCurve([output], lambda skin_id, wear: {"Factory New": 100.0, "Battle-Scarred": 1.0}.get(wear))
+
+    assert curve.size == 1
+    assert curve(0.0) == 100.0
+    assert curve(0.069) == 100.0
+    assert curve(0.07) == 0.0
+    assert curve(0.99) == 1.0
+
+
+def test_search_weights_a_mix_by_pool_share(asymmetric):
+    inputs_a, inputs_b, outputs_a, outputs_b = asymmetric
+    prices = {(inputs_a.skin_id, wear): 1.0 for wear in WEARS}
+    prices |= {(inputs_b.skin_id, wear): 1.0 for wear in WEARS}
+    prices |= {(outputs_a[0].skin_id, wear): 100.0 for wear in WEARS}
+    prices |= {(output.skin_id, wear): 10.0 for output in outputs_b for wear in WEARS}
+    trade_up = catalog([inputs_a, inputs_b, *outputs_a, *outputs_b], prices)
+
+    mixes = [candidate for candidate in trade_up.search(min_profit=-1000, limit=1000, stattrack_options=(False,))
+             if len(candidate.inputs) == 2]
+    nine_a = next(candidate for candidate in mixes if candidate.inputs[0][0] == inputs_a.skin_id
+                  and candidate.inputs[0][2] == 9)
+    assert nine_a.expected_value == pytest.approx((9 * 100.0 + 5 * 10.0) / 14)
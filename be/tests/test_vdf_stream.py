@@ -0,0 +1,74 @@
+import vdf
+import pytest
+
+from app.scripts.vdf_stream import load_file
+
+ITEMS_GAME = r'''// comment before the root
+"items_game"
+{
+	"rarities"
+	{
+		"common"
+		{
+			"value"		"1"
+			"color"		"desc_common"
+		}
+	}
+	"paint_kits"
+	{
+		"12"
+		{
+			"name"		"hy_redline"
+			"description_tag"		"#PaintKit_hy_redline_Tag"
+			"wear_remap_min"		"0.10"	// trailing comment
+		}
+	}
+	"paint_kits"
+	{
+		"13"
+		{
+			"name"		"quoted \"name\" with {braces}"
+		}
+	}
+	"items"
+	{
+		"7"
+		{
+			"name"		"weapon_ak47"
+			"prefab"		"weapon_rifle"
+		}
+	}
+	"items"
+	{
+		"7"
+		{
+			"prefab"		"weapon_rifle_override"
+		}
+	}
+}
+'''
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16"])
+def test_matches_vdf_load(tmp_path, encoding):
+    path = tmp_path / "items_game.txt"
+    path.write_text(ITEMS_GAME, encoding=encoding)
+    with open(path, encoding=encoding) as f:
+        expected = vdf.load(f)
+
+    assert load_file(path) == expected
+
+
+def test_sections_keep_only_the_named_blocks(tmp_path):
+    path = tmp_path / "items_game.txt"
+    path.write_text(ITEMS_GAME)
+
+    tree = load_file(path, {'paint_kits'})
+    assert list(tree['items_game']) == ['paint_kits']
+    assert tree['items_game']['paint_kits'] == vdf.loads(ITEMS_GAME)['items_game']['paint_kits']
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.touch()
+    assert load_file(path) == {}